@@ -1,1566 +1,84 @@
-from eth_utils import encode_hex, decode_hex
-from ape_tokens import tokens
+import importlib
+import sys
+from pathlib import Path
 
-FEEVAULT_ABI = [
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "previousGovernor",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "newGovernor",
-                "type": "address",
-            },
-        ],
-        "name": "GovernorshipTransferred",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "controllerAddress",
-                "type": "address",
-            }
-        ],
-        "name": "NewController",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "account",
-                "type": "address",
-            }
-        ],
-        "name": "Paused",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "previousGovernor",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "newGovernor",
-                "type": "address",
-            },
-        ],
-        "name": "PendingGovernorshipTransfer",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "asset",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "toAddress",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "amount",
-                "type": "uint256",
-            },
-        ],
-        "name": "RewardsSent",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "account",
-                "type": "address",
-            }
-        ],
-        "name": "Unpaused",
-        "type": "event",
-    },
-    {
-        "inputs": [],
-        "name": "claimGovernance",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "controller",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "governor",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "controllerAddress", "type": "address"}
-        ],
-        "name": "initialize",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "isGovernor",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "pause",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "paused",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenAddress", "type": "address"},
-            {"internalType": "uint256", "name": "tokenAmount", "type": "uint256"},
-            {"internalType": "address", "name": "toAddress", "type": "address"},
-        ],
-        "name": "recoverERC20",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "sendETHRewards",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "tokenAddress", "type": "address"},
-            {"internalType": "address", "name": "userAddress", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "sendTokenRewards",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "controllerAddress", "type": "address"}
-        ],
-        "name": "setController",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "_newGovernor", "type": "address"}
-        ],
-        "name": "transferGovernance",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "unpause",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {"stateMutability": "payable", "type": "receive"},
-]
-SERIES_ABI = [
-    {
-      "inputs": [],
-      "name": "implementation",
-      "outputs": [
-        {
-          "internalType": "address",
-          "name": "",
-          "type": "address"
-        }
-      ],
-      "stateMutability": "view",
-      "type": "function"
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "previousGovernor",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "newGovernor",
-                "type": "address",
-            },
-        ],
-        "name": "GovernorshipTransferred",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "number",
-                "type": "uint256",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "season",
-                "type": "address",
-            },
-        ],
-        "name": "NewSeason",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "previousGovernor",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "newGovernor",
-                "type": "address",
-            },
-        ],
-        "name": "PendingGovernorshipTransfer",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "season",
-                "type": "address",
-            }
-        ],
-        "name": "SeasonCancelled",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "number",
-                "type": "uint256",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "season",
-                "type": "address",
-            },
-        ],
-        "name": "SeasonStart",
-        "type": "event",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "balanceOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "claim",
-        "outputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "claimGovernance",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "currentClaimingIndex",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "currentStakingIndex",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "expectedClaimingSeason",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "expectedStakingSeason",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "governor",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "ogn_", "type": "address"},
-            {"internalType": "address", "name": "vault_", "type": "address"},
-        ],
-        "name": "initialize",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "isGovernor",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "latestStakeTime",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "liveSeason",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "ogn",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "popSeason",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "season", "type": "address"}],
-        "name": "pushSeason",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "name": "seasons",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "ogn_", "type": "address"}],
-        "name": "setOGN",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "vault_", "type": "address"}],
-        "name": "setVault",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "amount", "type": "uint256"}],
-        "name": "stake",
-        "outputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalSupply",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "_newGovernor", "type": "address"}
-        ],
-        "name": "transferGovernance",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "unstake",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "vault",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
-SEASON_ABI = [
-    {
-        "inputs": [
-            {"internalType": "address", "name": "series_", "type": "address"},
-            {"internalType": "uint256", "name": "startTime_", "type": "uint256"},
-            {"internalType": "uint256", "name": "lockStartTime_", "type": "uint256"},
-            {"internalType": "uint256", "name": "endTime_", "type": "uint256"},
-            {"internalType": "uint256", "name": "claimEndTime_", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "constructor",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "totalRewardETH",
-                "type": "uint256",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "totalRewardOGN",
-                "type": "uint256",
-            },
-        ],
-        "name": "Finale",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "userAddress",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "amount",
-                "type": "uint256",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "points",
-                "type": "uint256",
-            },
-        ],
-        "name": "Stake",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "userAddress",
-                "type": "address",
-            }
-        ],
-        "name": "Unstake",
-        "type": "event",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "initialSupply", "type": "uint256"}
-        ],
-        "name": "bootstrap",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "claim",
-        "outputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "claimEndTime",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "endTime",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "expectedRewards",
-        "outputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "getPoints",
-        "outputs": [{"internalType": "uint128", "name": "", "type": "uint128"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "getTotalPoints",
-        "outputs": [{"internalType": "uint128", "name": "", "type": "uint128"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "lockStartTime",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-            {"internalType": "uint256", "name": "blockStamp", "type": "uint256"},
-        ],
-        "name": "pointsInTime",
-        "outputs": [{"internalType": "uint128", "name": "", "type": "uint128"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "season",
-        "outputs": [
-            {"internalType": "bool", "name": "bootstrapped", "type": "bool"},
-            {"internalType": "bool", "name": "snapshotTaken", "type": "bool"},
-            {"internalType": "uint128", "name": "totalPoints", "type": "uint128"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "series",
-        "outputs": [
-            {"internalType": "contract ISeries", "name": "", "type": "address"}
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "snapshot",
-        "outputs": [
-            {"internalType": "uint128", "name": "rewardETH", "type": "uint128"},
-            {"internalType": "uint128", "name": "rewardOGN", "type": "uint128"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "stake",
-        "outputs": [{"internalType": "uint128", "name": "", "type": "uint128"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "startTime",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "userAddress", "type": "address"}
-        ],
-        "name": "unstake",
-        "outputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "name": "users",
-        "outputs": [
-            {"internalType": "bool", "name": "exists", "type": "bool"},
-            {"internalType": "uint128", "name": "points", "type": "uint128"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
-MOCKOGN_ABI = [
-    {"inputs": [], "stateMutability": "nonpayable", "type": "constructor"},
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "owner",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "spender",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "value",
-                "type": "uint256",
-            },
-        ],
-        "name": "Approval",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "from",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "to",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "value",
-                "type": "uint256",
-            },
-        ],
-        "name": "Transfer",
-        "type": "event",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "owner", "type": "address"},
-            {"internalType": "address", "name": "spender", "type": "address"},
-        ],
-        "name": "allowance",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "approve",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-        "name": "burn",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "subtractedValue", "type": "uint256"},
-        ],
-        "name": "decreaseAllowance",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "spender", "type": "address"},
-            {"internalType": "uint256", "name": "addedValue", "type": "uint256"},
-        ],
-        "name": "increaseAllowance",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "_tokens", "type": "uint256"},
-        ],
-        "name": "mint",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "name",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalSupply",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "recipient", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "transfer",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "sender", "type": "address"},
-            {"internalType": "address", "name": "recipient", "type": "address"},
-            {"internalType": "uint256", "name": "amount", "type": "uint256"},
-        ],
-        "name": "transferFrom",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-]
-ERC721A_ABI = [
-    {
-        "inputs": [
-            {"internalType": "string", "name": "name_", "type": "string"},
-            {"internalType": "string", "name": "symbol_", "type": "string"},
-            {"internalType": "string", "name": "baseURI_", "type": "string"},
-            {"internalType": "uint256", "name": "maxSupply_", "type": "uint256"},
-            {"internalType": "address", "name": "minter_", "type": "address"},
-            {"internalType": "address[]", "name": "payees_", "type": "address[]"},
-            {"internalType": "uint256[]", "name": "shares_", "type": "uint256[]"},
-            {"internalType": "uint256", "name": "royaltyBps_", "type": "uint256"},
-        ],
-        "stateMutability": "nonpayable",
-        "type": "constructor",
-    },
-    {"inputs": [], "name": "ApprovalCallerNotOwnerNorApproved", "type": "error"},
-    {"inputs": [], "name": "ApprovalQueryForNonexistentToken", "type": "error"},
-    {"inputs": [], "name": "ApprovalToCurrentOwner", "type": "error"},
-    {"inputs": [], "name": "ApproveToCaller", "type": "error"},
-    {"inputs": [], "name": "BalanceQueryForZeroAddress", "type": "error"},
-    {"inputs": [], "name": "MintToZeroAddress", "type": "error"},
-    {"inputs": [], "name": "MintZeroQuantity", "type": "error"},
-    {"inputs": [], "name": "MintedQueryForZeroAddress", "type": "error"},
-    {"inputs": [], "name": "OwnerQueryForNonexistentToken", "type": "error"},
-    {"inputs": [], "name": "TransferCallerNotOwnerNorApproved", "type": "error"},
-    {"inputs": [], "name": "TransferFromIncorrectOwner", "type": "error"},
-    {"inputs": [], "name": "TransferToNonERC721ReceiverImplementer", "type": "error"},
-    {"inputs": [], "name": "TransferToZeroAddress", "type": "error"},
-    {"inputs": [], "name": "URIQueryForNonexistentToken", "type": "error"},
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "owner",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "approved",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "tokenId",
-                "type": "uint256",
-            },
-        ],
-        "name": "Approval",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "owner",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "operator",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "bool",
-                "name": "approved",
-                "type": "bool",
-            },
-        ],
-        "name": "ApprovalForAll",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "contract IERC20",
-                "name": "token",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "to",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "amount",
-                "type": "uint256",
-            },
-        ],
-        "name": "ERC20PaymentReleased",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "account",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "shares",
-                "type": "uint256",
-            },
-        ],
-        "name": "PayeeAdded",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "from",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "amount",
-                "type": "uint256",
-            },
-        ],
-        "name": "PaymentReceived",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": False,
-                "internalType": "address",
-                "name": "to",
-                "type": "address",
-            },
-            {
-                "indexed": False,
-                "internalType": "uint256",
-                "name": "amount",
-                "type": "uint256",
-            },
-        ],
-        "name": "PaymentReleased",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "bytes32",
-                "name": "role",
-                "type": "bytes32",
-            },
-            {
-                "indexed": True,
-                "internalType": "bytes32",
-                "name": "previousAdminRole",
-                "type": "bytes32",
-            },
-            {
-                "indexed": True,
-                "internalType": "bytes32",
-                "name": "newAdminRole",
-                "type": "bytes32",
-            },
-        ],
-        "name": "RoleAdminChanged",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "bytes32",
-                "name": "role",
-                "type": "bytes32",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "account",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "sender",
-                "type": "address",
-            },
-        ],
-        "name": "RoleGranted",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "bytes32",
-                "name": "role",
-                "type": "bytes32",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "account",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "sender",
-                "type": "address",
-            },
-        ],
-        "name": "RoleRevoked",
-        "type": "event",
-    },
-    {
-        "anonymous": False,
-        "inputs": [
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "from",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "address",
-                "name": "to",
-                "type": "address",
-            },
-            {
-                "indexed": True,
-                "internalType": "uint256",
-                "name": "tokenId",
-                "type": "uint256",
-            },
-        ],
-        "name": "Transfer",
-        "type": "event",
-    },
-    {
-        "inputs": [],
-        "name": "DEFAULT_ADMIN_ROLE",
-        "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "MINTER_ROLE",
-        "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "tokenId", "type": "uint256"},
-        ],
-        "name": "approve",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "baseURI",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "contractURI",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "tokenId", "type": "uint256"}],
-        "name": "getApproved",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "bytes32", "name": "role", "type": "bytes32"}],
-        "name": "getRoleAdmin",
-        "outputs": [{"internalType": "bytes32", "name": "", "type": "bytes32"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "bytes32", "name": "role", "type": "bytes32"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "grantRole",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "bytes32", "name": "role", "type": "bytes32"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "hasRole",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "owner", "type": "address"},
-            {"internalType": "address", "name": "operator", "type": "address"},
-        ],
-        "name": "isApprovedForAll",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "maxSupply",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "count", "type": "uint256"},
-            {"internalType": "uint256", "name": "price", "type": "uint256"},
-            {"internalType": "uint256", "name": "mintLimit", "type": "uint256"},
-            {"internalType": "uint256", "name": "expires", "type": "uint256"},
-            {"internalType": "bytes", "name": "sig", "type": "bytes"},
-        ],
-        "name": "mint",
-        "outputs": [],
-        "stateMutability": "payable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "name",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "owner",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "tokenId", "type": "uint256"}],
-        "name": "ownerOf",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "index", "type": "uint256"}],
-        "name": "payee",
-        "outputs": [{"internalType": "address", "name": "", "type": "address"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address payable", "name": "account", "type": "address"}
-        ],
-        "name": "release",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "contract IERC20", "name": "token", "type": "address"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "release",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "contract IERC20", "name": "token", "type": "address"}
-        ],
-        "name": "releaseAll",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "releaseAll",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "contract IERC20", "name": "token", "type": "address"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "released",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-        "name": "released",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "bytes32", "name": "role", "type": "bytes32"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "renounceRole",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "bytes32", "name": "role", "type": "bytes32"},
-            {"internalType": "address", "name": "account", "type": "address"},
-        ],
-        "name": "revokeRole",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "royaltyBps",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-            {"internalType": "uint256", "name": "salePrice", "type": "uint256"},
-        ],
-        "name": "royaltyInfo",
-        "outputs": [
-            {"internalType": "address", "name": "", "type": "address"},
-            {"internalType": "uint256", "name": "", "type": "uint256"},
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "from", "type": "address"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "tokenId", "type": "uint256"},
-        ],
-        "name": "safeTransferFrom",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "from", "type": "address"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "tokenId", "type": "uint256"},
-            {"internalType": "bytes", "name": "_data", "type": "bytes"},
-        ],
-        "name": "safeTransferFrom",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "operator", "type": "address"},
-            {"internalType": "bool", "name": "approved", "type": "bool"},
-        ],
-        "name": "setApprovalForAll",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "string", "name": "_base", "type": "string"}],
-        "name": "setBaseURI",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "account", "type": "address"}],
-        "name": "shares",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "bytes4", "name": "interfaceId", "type": "bytes4"}],
-        "name": "supportsInterface",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"internalType": "uint256", "name": "tokenId", "type": "uint256"}],
-        "name": "tokenURI",
-        "outputs": [{"internalType": "string", "name": "", "type": "string"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "contract IERC20", "name": "token", "type": "address"}
-        ],
-        "name": "totalReleased",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalReleased",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalShares",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "totalSupply",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"internalType": "address", "name": "from", "type": "address"},
-            {"internalType": "address", "name": "to", "type": "address"},
-            {"internalType": "uint256", "name": "tokenId", "type": "uint256"},
-        ],
-        "name": "transferFrom",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {"stateMutability": "payable", "type": "receive"},
-]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from launchpad.cache import CachedContracts  # noqa: E402
+from launchpad.pinned import BlockPins  # noqa: E402
+from launchpad.registry import NETWORKS, ContractRegistry  # noqa: E402
+
+
+def lazy(module, name, *args):
+    """
+    `launchpad.<module>.<name>` with `args` bound, imported on first call so
+    starting the console doesn't import every helper and NumPy with them.
+    """
+
+    def helper(*more, **kwargs):
+        target = importlib.import_module(f"launchpad.{module}")
+        for attr in name.split("."):
+            target = getattr(target, attr)
+        return target(*args, *more, **kwargs)
+
+    helper.__name__ = name
+    return helper
+
+
+def network_contracts(web3, network):
+    return ContractRegistry(web3, network).namespace()
 
 
 def goerli_contracts(web3):
-    return {
-        "ogn": web3.eth.contract(
-            address="0xde4E13E34D441415ECc7E30E4d39f97d933801f4", abi=MOCKOGN_ABI
-        ),
-        "vault": web3.eth.contract(
-            address="0xF149A3E8f6556ce67BB256359a655aE765854aA5", abi=FEEVAULT_ABI
-        ),
-        "series": web3.eth.contract(
-            address="0xD8cf309416C5B039C7804Cad2c3ED0E338451ba5", abi=SERIES_ABI
-        ),
-        "season_one": web3.eth.contract(
-            address="0x5f450F4318592c428DfE52e2b0CbCd57591B93dc", abi=SEASON_ABI
-        ),
-        "season_two": web3.eth.contract(
-            address="0xfDF5BBd2F07178d23F3217882452f5463F04cecD", abi=SEASON_ABI
-        ),
-        "season_three": web3.eth.contract(
-            address="0x0EF91735FF851Ddc6C44801798483B70CC466A15", abi=SEASON_ABI
-        ),
-    }
+    return network_contracts(web3, "goerli")
 
 
 def rinkeby_contracts(web3):
-    return {
-        "ogn": web3.eth.contract(
-            address="0xe9E5dDb56c378de1899187aeAcd8c6e23C764F52", abi=MOCKOGN_ABI
-        ),
-        "vault": web3.eth.contract(
-            address="0x8e7Ba749F14df053Eb579B5142201E98887D27f5", abi=FEEVAULT_ABI
-        ),
-        "series": web3.eth.contract(
-            address="0xcFE44b7c64a6794B57eeB6b52cd5ae98CDc5B0B5", abi=SERIES_ABI
-        ),
-        "season_one": web3.eth.contract(
-            address="0xd34cD8D7C9400286B695C9F846c8c100ae439B34", abi=SEASON_ABI
-        ),
-    }
+    return network_contracts(web3, "rinkeby")
 
 
 def mainnet_contracts(web3):
-    ogn = None
-
-    # You must have a token list installed to resolve this.
-    # e.g.: `ape tokens install tokens.1inch.eth`
-    try:
-        ogn = tokens["OGN"]
-    except KeyError:
-        ...
-
-    return {
-        "ogn": ogn,
-        "vault": web3.eth.contract(
-            address="0xc626F08Cf88972332CFcb48B227409658be67a1c", abi=FEEVAULT_ABI
-        ),
-        "series": web3.eth.contract(
-            address="0xCcE8E784c777fb9435F89f4E45f8b7FC49f7669f", abi=SERIES_ABI
-        ),
-        "season_one": web3.eth.contract(
-            address="0xf198fB4efd100B9be9654C79158704BFC0BABa90", abi=SEASON_ABI
-        ),
-        "season_two": web3.eth.contract(
-            address="0x6639CdB3EA7A48b0aD95B47bEc78023c6F706160", abi=SEASON_ABI
-        ),
-        "season_three": web3.eth.contract(
-            address="0x07B0226465A50300F91c8A7930f90aEcae3D6Ed4", abi=SEASON_ABI
-        ),
-    }
+    return network_contracts(web3, "mainnet")
 
 
 def ape_init_extras(chain):
     ns_updates = {"web3": chain.provider._web3}
 
-    if chain.chain_id == 1:
-        ns_updates.update(mainnet_contracts(ns_updates["web3"]))
-    if chain.chain_id == 4:
-        ns_updates.update(rinkeby_contracts(ns_updates["web3"]))
-    if chain.chain_id == 5:
-        ns_updates.update(goerli_contracts(ns_updates["web3"]))
+    network = NETWORKS.get(chain.chain_id)
+    if network is not None:
+        contracts = ContractRegistry(ns_updates["web3"], network)
+        ns_updates["contracts"] = contracts
+        ns_updates.update(contracts.namespace())
+        ns_updates["bulk_positions"] = lazy("positions", "bulk_positions", contracts)
+        ns_updates["season_points"] = lazy("points", "season_points", contracts)
+        ns_updates["event_indexer"] = lazy("indexer", "EventIndexer", contracts)
+        ns_updates["async_contracts"] = lazy("aio", "AsyncContracts", contracts)
+        ns_updates["cached"] = CachedContracts(contracts)
+        ns_updates["collection_index"] = lazy("factories", "CollectionIndex", contracts)
+        ns_updates["export_snapshot"] = lazy("snapshot", "export_snapshot", contracts)
+        ns_updates["daily_metrics"] = lazy("metrics", "daily_metrics", contracts)
+        ns_updates["holder_snapshot"] = lazy(
+            "holders", "HolderSnapshot.take", ns_updates["web3"]
+        )
+        ns_updates["ownership_indexer"] = lazy(
+            "ownership", "OwnershipIndexer", ns_updates["web3"]
+        )
+        ns_updates["plan_sweep"] = lazy("sweep", "plan_sweep", contracts)
+        ns_updates["plan_payouts"] = lazy("payouts", "plan_payouts", contracts)
+        ns_updates["deposit_scanner"] = lazy("deposits", "DepositScanner", contracts)
+        ns_updates["at_block"] = BlockPins(ns_updates["web3"])
+        ns_updates["pipeline"] = lazy(
+            "submit", "TransactionPipeline", ns_updates["web3"]
+        )
+        ns_updates["block_times"] = lazy(
+            "blocktime", "BlockTimeIndex.for_contracts", contracts
+        )
+        ns_updates["timeline"] = lazy(
+            "timeline", "SeriesTimeline.from_registry", contracts
+        )
+        ns_updates["vault_ledger"] = lazy("vault", "VaultLedger", contracts)
+        ns_updates["live_staking"] = lazy("live", "LiveStaking", contracts)
+        ns_updates["leaderboard"] = lazy("leaderboard", "season_leaderboard", contracts)
+        ns_updates["rollover_view"] = lazy("leaderboard", "rollover_view", contracts)
 
     return ns_updates
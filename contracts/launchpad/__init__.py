@@ -0,0 +1,4 @@
+"""
+Python helpers for working with the launchpad and staking contracts from the
+ape console.  See ape_console_extras.py for how these are wired up.
+"""
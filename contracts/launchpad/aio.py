@@ -0,0 +1,146 @@
+"""
+AsyncWeb3 versions of the console contracts.
+
+All contracts share one aiohttp session, so concurrent `eth_call`s reuse a
+pool of keep-alive connections instead of opening one per request.  The
+provider posts through that session directly rather than web3's
+per-thread session cache, which would replace a closed session with a
+default one on the next open.  IPython
+supports top-level await, so these can be used directly from the console:
+
+    async with async_contracts() as actx:
+        supply = await actx.series.functions.totalSupply().call()
+"""
+
+import asyncio
+import time
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncHTTPProvider, AsyncWeb3
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_KEEPALIVE = 30
+DEFAULT_TIMEOUT = 60
+
+
+def provider_uri(web3):
+    uri = getattr(web3.provider, "endpoint_uri", None)
+    if not uri or not str(uri).startswith("http"):
+        raise ValueError("Async contracts need an HTTP provider")
+    return str(uri)
+
+
+class SessionHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider that sends every request through `session`"""
+
+    def __init__(self, endpoint_uri, session, **kwargs):
+        super().__init__(endpoint_uri, **kwargs)
+        self.session = session
+
+    async def make_request(self, method, params):
+        data = self.encode_rpc_request(method, params)
+        async with self.session.post(
+            self.endpoint_uri, data=data, **self.get_request_kwargs()
+        ) as response:
+            response.raise_for_status()
+            raw = await response.read()
+        return self.decode_rpc_response(raw)
+
+
+class AsyncContracts:
+    """
+    Async counterpart of ContractRegistry, sharing its addresses and ABIs.
+    Use as an async context manager, or call `open()`/`close()`.
+    """
+
+    def __init__(
+        self,
+        contracts,
+        uri=None,
+        pool_size=DEFAULT_POOL_SIZE,
+        keepalive=DEFAULT_KEEPALIVE,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.contracts = contracts
+        self.uri = uri or provider_uri(contracts.web3)
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.session = None
+        self.web3 = None
+        self._contracts = {}
+
+    async def open(self):
+        connector = TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive)
+        self.session = ClientSession(
+            connector=connector, timeout=ClientTimeout(total=self.timeout)
+        )
+        self.web3 = AsyncWeb3(SessionHTTPProvider(self.uri, self.session))
+        self._contracts = {}
+        return self
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            self.web3 = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self.contracts.names():
+            raise AttributeError(name)
+        return self.contract(name)
+
+    def contract(self, name):
+        if self.web3 is None:
+            raise RuntimeError("AsyncContracts is not open")
+        if name not in self._contracts:
+            self._contracts[name] = self.web3.eth.contract(
+                address=self.web3.to_checksum_address(self.contracts.address(name)),
+                abi=self.contracts.abi(name),
+            )
+        return self._contracts[name]
+
+    def namespace(self):
+        return {name: self.contract(name) for name in self.contracts.names()}
+
+
+async def gather_limited(coros, limit=DEFAULT_POOL_SIZE):
+    """`asyncio.gather` with at most `limit` awaiting at once"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros))
+
+
+async def benchmark(contracts, name="series", fn_name="totalSupply", calls=1000):
+    """
+    Time `calls` reads of `name.fn_name()` through the sync contracts and
+    through AsyncContracts.  Returns calls/sec for each.
+    """
+    sync_fn = getattr(contracts.contract(name).functions, fn_name)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        sync_fn().call()
+    sync_elapsed = time.perf_counter() - start
+
+    async with AsyncContracts(contracts) as actx:
+        async_fn = getattr(actx.contract(name).functions, fn_name)
+        start = time.perf_counter()
+        await gather_limited(async_fn().call() for _ in range(calls))
+        async_elapsed = time.perf_counter() - start
+
+    return {
+        "sync_per_sec": calls / sync_elapsed,
+        "async_per_sec": calls / async_elapsed,
+        "speedup": sync_elapsed / async_elapsed,
+    }
@@ -0,0 +1,180 @@
+"""
+Timestamp -> block number resolution.
+
+Every header fetched is kept in a sorted (number, timestamp) index, persisted
+to SQLite per network, and each lookup starts from the closest known headers
+on either side.  Blocks are close to evenly spaced, so the next guess is
+interpolated between the two rather than bisected; a guess that barely
+narrows the range is followed by a plain bisection step so bad spacing (e.g.
+around the merge) can't stall the search.  A lookup near blocks seen before
+typically costs a couple of `getBlock` calls, and none once the boundary is
+known.
+"""
+
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from .indexer import DEFAULT_CONFIRMATIONS
+from .registry import CACHE_DIR
+from .timeline import season_model
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headers (
+    number INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+"""
+
+# Shrink the bracket to at most this share per interpolation, or bisect next
+MIN_PROGRESS = 0.5
+
+
+class BlockTimeIndex:
+    def __init__(self, web3, path, confirmations=DEFAULT_CONFIRMATIONS):
+        self.web3 = web3
+        self.confirmations = confirmations
+        self.lock = threading.Lock()
+        self.rpc_calls = 0
+        self.head = None
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+        rows = self.db.execute(
+            "SELECT number, timestamp FROM headers ORDER BY number"
+        ).fetchall()
+        self.numbers = [number for number, _ in rows]
+        self.timestamps = [timestamp for _, timestamp in rows]
+
+    @classmethod
+    def for_contracts(cls, contracts, **kwargs):
+        path = Path(CACHE_DIR) / f"{contracts.network}-blocks.sqlite"
+        return cls(contracts.web3, path, **kwargs)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def _remember(self, number, timestamp):
+        with self.lock:
+            i = bisect_left(self.numbers, number)
+            if i < len(self.numbers) and self.numbers[i] == number:
+                return
+            self.numbers.insert(i, number)
+            self.timestamps.insert(i, timestamp)
+
+            # Headers near the tip could still be reorged away
+            if self.head is not None and number <= self.head - self.confirmations:
+                with self.db:
+                    self.db.execute(
+                        "INSERT OR IGNORE INTO headers VALUES (?, ?)",
+                        (number, timestamp),
+                    )
+
+    def timestamp(self, number):
+        """Timestamp of block `number`, from the index or the chain"""
+        with self.lock:
+            i = bisect_left(self.numbers, number)
+            if i < len(self.numbers) and self.numbers[i] == number:
+                return self.timestamps[i]
+
+        block = self.web3.eth.get_block(number)
+        self.rpc_calls += 1
+        self._remember(block["number"], block["timestamp"])
+        return block["timestamp"]
+
+    def refresh_head(self):
+        block = self.web3.eth.get_block("latest")
+        self.rpc_calls += 1
+        self.head = block["number"]
+        self._remember(block["number"], block["timestamp"])
+        return self.head
+
+    def _bracket(self, timestamp):
+        """Closest known (number, timestamp) at or before and after `timestamp`"""
+        with self.lock:
+            i = bisect_right(self.timestamps, timestamp)
+            before = (self.numbers[i - 1], self.timestamps[i - 1]) if i else None
+            after = (
+                (self.numbers[i], self.timestamps[i]) if i < len(self.numbers) else None
+            )
+        return before, after
+
+    def block_before(self, timestamp):
+        """
+        Last block with `block.timestamp <= timestamp`, or None if the
+        chain starts later.  Raises ValueError for a timestamp past the head.
+        """
+        if self.head is None:
+            self.refresh_head()
+
+        before, after = self._bracket(timestamp)
+        if after is None:
+            self.refresh_head()
+            before, after = self._bracket(timestamp)
+            if after is None:
+                if before[0] == self.head:
+                    # Later blocks could still share the head's timestamp
+                    if timestamp > before[1]:
+                        raise ValueError(f"Timestamp {timestamp} is after the head")
+                    return self.head
+                after = (self.head, self.timestamp(self.head))
+        if before is None:
+            genesis = self.timestamp(0)
+            if genesis > timestamp:
+                return None
+            before = (0, genesis)
+
+        (lo, lo_ts), (hi, hi_ts) = before, after
+        bisect_next = False
+
+        while hi - lo > 1:
+            if bisect_next or hi_ts == lo_ts:
+                guess = (lo + hi) // 2
+            else:
+                guess = lo + (timestamp - lo_ts) * (hi - lo) // (hi_ts - lo_ts)
+                guess = min(max(guess, lo + 1), hi - 1)
+
+            span = hi - lo
+            guess_ts = self.timestamp(guess)
+            if guess_ts <= timestamp:
+                lo, lo_ts = guess, guess_ts
+            else:
+                hi, hi_ts = guess, guess_ts
+            bisect_next = not bisect_next and (hi - lo) > span * MIN_PROGRESS
+
+        return lo
+
+    def block_after(self, timestamp):
+        """First block with `block.timestamp >= timestamp`, e.g. the first
+        block a season boundary applies to"""
+        before = self.block_before(timestamp - 1)
+        return 0 if before is None else before + 1
+
+    def close(self):
+        self.db.close()
+
+
+def season_boundaries(contracts, index, seasons=None):
+    """
+    First block at or after each season boundary, per season.  Boundaries
+    still in the future are None.
+    """
+    boundaries = {}
+    for name in seasons or contracts.seasons():
+        model = season_model(contracts, name)
+        blocks = {}
+        for key, timestamp in (
+            ("start", model.start_time),
+            ("lock_start", model.lock_start_time),
+            ("end", model.end_time),
+            ("claim_end", model.claim_end_time),
+        ):
+            try:
+                blocks[key] = index.block_after(timestamp)
+            except ValueError:
+                blocks[key] = None
+        boundaries[name] = blocks
+    return boundaries
@@ -0,0 +1,283 @@
+"""
+Read-through cache for console contract calls.
+
+Calls to functions that can never change (Solidity `immutable` getters and
+`pure` functions) are stored on disk forever.  Some functions only become
+fixed later, e.g. a season's `snapshot` and `season.totalPoints` after its
+`Finale`; once that is observed their results are stored permanently too.
+Everything else is cached per `(block, call)` in memory with LRU eviction.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .registry import CACHE_DIR
+
+# Contract kind -> getters of Solidity immutables
+IMMUTABLE = {
+    "season": {"series", "startTime", "lockStartTime", "endTime", "claimEndTime"},
+    "ogn": {"decimals", "name", "symbol"},
+}
+
+# Contract kind -> function -> rule after which its result never changes
+FROZEN = {
+    "season": {
+        "season": "finale",
+        "snapshot": "finale",
+        "getTotalPoints": "finale",
+        "expectedRewards": "claim_ended",
+    },
+}
+
+DEFAULT_LRU_SIZE = 4096
+
+# How long a resolved "latest" block number is reused
+DEFAULT_LATEST_TTL = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    address TEXT NOT NULL,
+    calldata TEXT NOT NULL,
+    result BLOB NOT NULL,
+    PRIMARY KEY (address, calldata)
+);
+CREATE TABLE IF NOT EXISTS frozen (
+    address TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    PRIMARY KEY (address, rule)
+);
+"""
+
+
+def contract_kind(name):
+    return "season" if name.startswith("season_") else name
+
+
+class LRU:
+    def __init__(self, maxsize=DEFAULT_LRU_SIZE):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.data:
+                return default
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+
+class ResultStore:
+    """Permanent results in SQLite"""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def get(self, address, calldata):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT result FROM results WHERE address = ? AND calldata = ?",
+                (address, calldata),
+            ).fetchone()
+        return (True, pickle.loads(row[0])) if row else (False, None)
+
+    def put(self, address, calldata, result):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (address, calldata, pickle.dumps(result)),
+            )
+
+    def frozen_block(self, address, rule):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT block FROM frozen WHERE address = ? AND rule = ?",
+                (address, rule),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_frozen_block(self, address, rule, block):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO frozen VALUES (?, ?, ?)", (address, rule, block)
+            )
+
+
+class CachedCall:
+    def __init__(self, owner, fn_name, args):
+        self.owner = owner
+        self.fn_name = fn_name
+        self.args = args
+        self.fn = owner.contract.functions[fn_name](*args)
+
+    def __getattr__(self, attr):
+        # transact(), estimate_gas() etc. go straight to web3
+        return getattr(self.fn, attr)
+
+    def call(self, transaction=None, block_identifier="latest"):
+        if transaction is not None:
+            return self.fn.call(transaction, block_identifier=block_identifier)
+        return self.owner.read(self.fn_name, self.args, block_identifier)
+
+
+class CachedFunctions:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def __getattr__(self, fn_name):
+        if fn_name.startswith("_"):
+            raise AttributeError(fn_name)
+        return lambda *args: CachedCall(self.owner, fn_name, args)
+
+    def __getitem__(self, fn_name):
+        return getattr(self, fn_name)
+
+
+class CachedContract:
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+        self.contract = cache.contracts.contract(name)
+        self.address = self.contract.address
+        self.functions = CachedFunctions(self)
+
+        kind = contract_kind(name)
+        pure = {
+            m["name"]
+            for m in self.contract.abi
+            if m["type"] == "function" and m.get("stateMutability") == "pure"
+        }
+        self.immutable = IMMUTABLE.get(kind, set()) | pure
+        self.frozen = FROZEN.get(kind, {})
+
+    def __getattr__(self, attr):
+        return getattr(self.contract, attr)
+
+    def _call(self, fn_name, args, block):
+        fn = self.contract.functions[fn_name](*args)
+        return fn.call(block_identifier=block)
+
+    def _permanent(self, fn_name, args, calldata, block):
+        found, result = self.cache.store.get(self.address, calldata)
+        if not found:
+            result = self._call(fn_name, args, block)
+            self.cache.store.put(self.address, calldata, result)
+        return result
+
+    def _at_block(self, fn_name, args, calldata, block):
+        key = (self.address, calldata, block)
+        missing = object()
+        result = self.cache.lru.get(key, missing)
+        if result is missing:
+            result = self._call(fn_name, args, block)
+            self.cache.lru.put(key, result)
+        return result
+
+    def read(self, fn_name, args, block="latest"):
+        calldata = self.contract.encodeABI(fn_name=fn_name, args=args)
+
+        if fn_name in self.immutable:
+            return self._permanent(fn_name, args, calldata, block)
+
+        block = self.cache.resolve_block(block)
+
+        rule = self.frozen.get(fn_name)
+        if rule and self.is_frozen(rule, block):
+            return self._permanent(fn_name, args, calldata, block)
+
+        return self._at_block(fn_name, args, calldata, block)
+
+    def is_frozen(self, rule, block):
+        """Whether `rule` holds at `block`, remembering the earliest block seen"""
+        known = self.cache.store.frozen_block(self.address, rule)
+        if known is not None and block >= known:
+            return True
+
+        if rule == "finale":
+            calldata = self.contract.encodeABI(fn_name="season")
+            holds = self._at_block("season", (), calldata, block)[1]
+        elif rule == "claim_ended":
+            holds = self.cache.block_timestamp(block) >= self.read("claimEndTime", ())
+        else:
+            raise ValueError(f"Unknown freeze rule {rule}")
+
+        if holds:
+            self.cache.store.set_frozen_block(self.address, rule, block)
+        return holds
+
+
+class CachedContracts:
+    """
+    Cached stand-ins for the console contracts:
+
+        cached.season_two.functions.startTime().call()
+    """
+
+    def __init__(
+        self,
+        contracts,
+        path=None,
+        lru_size=DEFAULT_LRU_SIZE,
+        latest_ttl=DEFAULT_LATEST_TTL,
+    ):
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.path = path or Path(CACHE_DIR) / f"{contracts.network}-reads.sqlite"
+        self.lru = LRU(lru_size)
+        self.latest_ttl = latest_ttl
+        self._store = None
+        self._latest = (0, None)
+        self._cached = {}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = ResultStore(self.path)
+        return self._store
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self.contracts.names():
+            raise AttributeError(name)
+        return self.contract(name)
+
+    def contract(self, name):
+        if name not in self._cached:
+            self._cached[name] = CachedContract(self, name)
+        return self._cached[name]
+
+    def resolve_block(self, block):
+        """Block number for `block`, reusing "latest" for `latest_ttl` secs"""
+        if isinstance(block, int):
+            return block
+
+        if block in (None, "latest"):
+            fetched_at, number = self._latest
+            if number is None or time.monotonic() - fetched_at > self.latest_ttl:
+                number = self.web3.eth.block_number
+                self._latest = (time.monotonic(), number)
+            return number
+
+        return self.web3.eth.get_block(block)["number"]
+
+    def block_timestamp(self, block):
+        key = ("timestamp", block)
+        timestamp = self.lru.get(key)
+        if timestamp is None:
+            timestamp = self.web3.eth.get_block(block)["timestamp"]
+            self.lru.put(key, timestamp)
+        return timestamp
@@ -0,0 +1,269 @@
+"""
+Incoming deposits to ingest endpoints, found by scanning the chain.
+
+The endpoint set is held as a sorted array of raw 20-byte addresses, fronted
+by a bitmap over each address's top 24 bits.  Nearly every address that is
+not an endpoint is rejected by a single bit test; the rest are confirmed
+with a binary search.  Candidates from a whole block or log page are tested
+in one vectorized call.
+
+ETH deposits are top-level transactions whose `to` is an endpoint; ETH sent
+by a contract through an internal call does not show up here and is only
+picked up by a balance scan (see `sweep.scan_balances`).  ERC20 deposits
+are `Transfer` logs of the watched tokens.  Only blocks at least
+`confirmations` deep are scanned, so a reorg can't invalidate the ledger.
+"""
+
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from eth_utils import decode_hex, to_checksum_address
+
+from .encoding import hex_str
+from .indexer import DEFAULT_CONFIRMATIONS
+from .ingest import ADDRESS_DTYPE
+from .logs import LogPager
+from .sweep import ETH_ADDRESS, Balance, asset_address
+from .vouchers import TRANSFER_TOPIC
+
+PREFIX_BITS = 24
+
+DEFAULT_BLOCK_WORKERS = 8
+
+# Blocks scanned before the ledger is advanced and saved
+DEFAULT_BATCH_BLOCKS = 1000
+
+Deposit = namedtuple(
+    "Deposit", ["block", "transaction_hash", "endpoint", "asset", "amount"]
+)
+
+
+def _raw(address):
+    return address if isinstance(address, bytes) else decode_hex(address)
+
+
+class EndpointSet:
+    """Membership test over a large set of endpoint addresses"""
+
+    def __init__(self, addresses):
+        self.addresses = np.unique(np.asarray(addresses, dtype=ADDRESS_DTYPE))
+        self.bitmap = np.zeros(1 << (PREFIX_BITS - 3), dtype=np.uint8)
+        prefixes = self._prefixes(self.addresses)
+        np.bitwise_or.at(self.bitmap, prefixes >> 3, 1 << (prefixes & 7))
+
+    @classmethod
+    def from_index(cls, index):
+        return cls(index.addresses)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    @staticmethod
+    def _prefixes(addresses):
+        # Top 24 bits of each address; "S20" items are NUL padded on the right
+        raw = np.frombuffer(
+            np.ascontiguousarray(addresses, dtype=ADDRESS_DTYPE).tobytes(),
+            dtype=np.uint8,
+        ).reshape(-1, 20)
+        return (
+            (raw[:, 0].astype(np.uint32) << 16)
+            | (raw[:, 1].astype(np.uint32) << 8)
+            | raw[:, 2]
+        )
+
+    def contains(self, addresses):
+        """Boolean mask of which `addresses` (raw or hex) are endpoints"""
+        candidates = np.asarray([_raw(a) for a in addresses], dtype=ADDRESS_DTYPE)
+        if not len(candidates) or not len(self.addresses):
+            return np.zeros(len(candidates), dtype=bool)
+
+        prefixes = self._prefixes(candidates)
+        mask = (self.bitmap[prefixes >> 3] >> (prefixes & 7)) & 1 == 1
+
+        hits = np.flatnonzero(mask)
+        if len(hits):
+            found = np.searchsorted(self.addresses, candidates[hits])
+            found = np.minimum(found, len(self.addresses) - 1)
+            mask[hits] = self.addresses[found] == candidates[hits]
+        return mask
+
+    def __contains__(self, address):
+        return bool(self.contains([address])[0])
+
+
+class DepositLedger:
+    """
+    Pending (deposited but not yet collected) balance per endpoint and
+    asset, with the last block scanned.
+    """
+
+    def __init__(self, checkpoint=None, pending=None):
+        self.checkpoint = checkpoint
+        self.pending = pending or {}
+
+    def credit(self, deposit):
+        key = (deposit.endpoint, deposit.asset)
+        self.pending[key] = self.pending.get(key, 0) + deposit.amount
+
+    def debit(self, endpoint, asset, amount):
+        key = (endpoint, asset)
+        remaining = self.pending.get(key, 0) - amount
+        if remaining > 0:
+            self.pending[key] = remaining
+        else:
+            self.pending.pop(key, None)
+
+    def apply_sweep(self, batch):
+        """Clear the items of a mined `sweep.SweepBatch`"""
+        for item in batch.items:
+            self.debit(item.endpoint, item.asset, item.amount)
+
+    def balances(self, index):
+        """Pending balances as `sweep.Balance`s, ready for `sweep_items`"""
+        return [
+            Balance(decode_hex(index.salt_for(endpoint)), endpoint, asset, amount)
+            for (endpoint, asset), amount in self.pending.items()
+        ]
+
+    def save(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "checkpoint": self.checkpoint,
+                    "pending": [
+                        [endpoint, asset, str(amount)]
+                        for (endpoint, asset), amount in self.pending.items()
+                    ],
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            data["checkpoint"],
+            {(e, a): int(amount) for e, a, amount in data["pending"]},
+        )
+
+
+class DepositScanner:
+    def __init__(
+        self,
+        contracts,
+        endpoints,
+        tokens=("ogn",),
+        confirmations=DEFAULT_CONFIRMATIONS,
+        pager=None,
+        max_workers=DEFAULT_BLOCK_WORKERS,
+        batch_blocks=DEFAULT_BATCH_BLOCKS,
+    ):
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.endpoints = endpoints
+        self.tokens = [asset_address(contracts, t) for t in tokens]
+        self.confirmations = confirmations
+        self.pager = pager or LogPager(self.web3)
+        self.max_workers = max_workers
+        self.batch_blocks = batch_blocks
+
+    def _block(self, number):
+        return self.web3.eth.get_block(number, full_transactions=True)
+
+    def eth_deposits(self, from_block, to_block):
+        """Top-level ETH transfers to endpoints, in block order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for block in pool.map(self._block, range(from_block, to_block + 1)):
+                txs = [t for t in block["transactions"] if t["to"] and t["value"]]
+                if not txs:
+                    continue
+                mask = self.endpoints.contains([t["to"] for t in txs])
+                for tx in (t for t, hit in zip(txs, mask) if hit):
+                    yield Deposit(
+                        block["number"],
+                        hex_str(tx["hash"]),
+                        to_checksum_address(tx["to"]),
+                        ETH_ADDRESS,
+                        tx["value"],
+                    )
+
+    def token_transfers(self, from_block, to_block):
+        """
+        `Transfer` logs of the watched tokens touching an endpoint, as
+        (deposit, outgoing) pairs in chain order.  A transfer between two
+        endpoints is both: outgoing for the sender, then a deposit to the
+        receiver.
+        """
+        if not self.tokens:
+            return
+
+        params = {"address": self.tokens, "topics": [TRANSFER_TOPIC]}
+        page = []
+
+        def flush():
+            senders = self.endpoints.contains([log["topics"][1][-20:] for log in page])
+            receivers = self.endpoints.contains(
+                [log["topics"][2][-20:] for log in page]
+            )
+            for log, outgoing, incoming in zip(page, senders, receivers):
+                for side, hit in ((1, outgoing), (2, incoming)):
+                    if not hit:
+                        continue
+                    yield Deposit(
+                        log["blockNumber"],
+                        hex_str(log["transactionHash"]),
+                        to_checksum_address(log["topics"][side][-20:]),
+                        to_checksum_address(log["address"]),
+                        int.from_bytes(_raw(log["data"]), "big"),
+                    ), side == 1
+            page.clear()
+
+        for log in self.pager.iter_logs(params, from_block, to_block):
+            page.append(log)
+            if len(page) >= self.pager.target_logs:
+                yield from flush()
+        if page:
+            yield from flush()
+
+    def scan(self, ledger, to_block="latest", path=None):
+        """
+        Advance `ledger` to `to_block` less the confirmation depth, yielding
+        each new deposit.  Token transfers out of an endpoint (collections)
+        are debited.
+
+        Blocks are scanned `batch_blocks` at a time.  A batch's credits,
+        debits and checkpoint are applied together once all of it has been
+        fetched, and the ledger is saved to `path` (if given) before the
+        batch's deposits are yielded, so an error or an abandoned scan never
+        credits a block twice and a long first scan resumes where it
+        stopped.
+        """
+        head = self.web3.eth.get_block(to_block)["number"] - self.confirmations
+        if ledger.checkpoint is None:
+            ledger.checkpoint = self.contracts.deploy_block("ingest_master") or head
+            ledger.checkpoint -= 1
+
+        while ledger.checkpoint < head:
+            from_block = ledger.checkpoint + 1
+            batch_end = min(from_block + self.batch_blocks - 1, head)
+            deposits = list(self.eth_deposits(from_block, batch_end))
+            transfers = list(self.token_transfers(from_block, batch_end))
+
+            for deposit in deposits:
+                ledger.credit(deposit)
+            for transfer, outgoing in transfers:
+                if outgoing:
+                    ledger.debit(transfer.endpoint, transfer.asset, transfer.amount)
+                else:
+                    ledger.credit(transfer)
+                    deposits.append(transfer)
+            ledger.checkpoint = batch_end
+            if path is not None:
+                ledger.save(path)
+
+            yield from deposits
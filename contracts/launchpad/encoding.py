@@ -0,0 +1,21 @@
+"""
+Byte and hex conversions shared across the launchpad helpers.
+"""
+
+from eth_utils import encode_hex
+
+
+def hex_str(value):
+    """0x-prefixed hex of `value`, which may already be a hex string"""
+    return value if isinstance(value, str) else encode_hex(value)
+
+
+def fixed_bytes(value, size):
+    """`value` padded back to `size` bytes"""
+    # NumPy "S" arrays drop trailing NUL bytes when items are read back
+    return bytes(value).ljust(size, b"\x00")
+
+
+def address_topic(address):
+    """An address as an indexed log topic"""
+    return "0x" + "00" * 12 + address[2:].lower()
@@ -0,0 +1,301 @@
+"""
+Index of every collection launched from the NFT factories.
+
+`OriginERC721V6Factory` and `OriginERC721_v3Factory` both emit
+`CreateToken(addr, deployer)` for each clone.  New clones are found with an
+incremental log scan per factory, and their metadata is read in one
+Multicall when first seen.  `name`, `symbol`, `maxSupply` and the payees are
+set once in `initialize`, so a refresh only re-reads `totalSupply` and
+`baseURI`/`contractURI`, again in a single Multicall for all collections.
+Functions a collection doesn't have (v3 clones have no `maxSupply`,
+`baseURI` getter or payees) are stored as None.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from eth_utils import encode_hex, event_signature_to_log_topic, to_checksum_address
+
+from .indexer import DEFAULT_CONFIRMATIONS
+from .logs import LogPager
+from .multicall import Multicall, call
+from .registry import CACHE_DIR
+
+CREATE_TOKEN_TOPIC = encode_hex(
+    event_signature_to_log_topic("CreateToken(address,address)")
+)
+
+# Payee slots probed per round; more rounds run while all slots are filled
+PAYEE_PROBE = 8
+
+COLLECTION_ABI = [
+    {
+        "inputs": [],
+        "name": name,
+        "outputs": [{"name": "", "type": kind}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+    for name, kind in (
+        ("name", "string"),
+        ("symbol", "string"),
+        ("maxSupply", "uint256"),
+        ("totalSupply", "uint256"),
+        ("baseURI", "string"),
+        ("contractURI", "string"),
+    )
+] + [
+    {
+        "inputs": [{"name": "index", "type": "uint256"}],
+        "name": "payee",
+        "outputs": [{"name": "", "type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "account", "type": "address"}],
+        "name": "shares",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+STATIC_FIELDS = ("name", "symbol", "maxSupply")
+LIVE_FIELDS = ("totalSupply", "baseURI", "contractURI")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    factory TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS collections (
+    address TEXT PRIMARY KEY,
+    factory TEXT NOT NULL,
+    deployer TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    name TEXT,
+    symbol TEXT,
+    max_supply TEXT,
+    total_supply TEXT,
+    base_uri TEXT,
+    contract_uri TEXT,
+    payees TEXT,
+    refreshed_block INTEGER
+);
+CREATE INDEX IF NOT EXISTS collections_factory ON collections (factory, block);
+"""
+
+COLUMNS = (
+    "address",
+    "factory",
+    "deployer",
+    "block",
+    "name",
+    "symbol",
+    "max_supply",
+    "total_supply",
+    "base_uri",
+    "contract_uri",
+    "payees",
+    "refreshed_block",
+)
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+class CollectionIndex:
+    def __init__(
+        self,
+        contracts,
+        factories=None,
+        path=None,
+        confirmations=DEFAULT_CONFIRMATIONS,
+        pager=None,
+        multicall=None,
+    ):
+        """
+        `factories` maps factory address -> first block to scan, and
+        defaults to the network's `nft_factory` deployment.
+        """
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.confirmations = confirmations
+        self.pager = pager or LogPager(self.web3)
+        self.multicall = multicall or Multicall(self.web3)
+
+        if factories is None:
+            factories = {}
+            if "nft_factory" in contracts.names():
+                factories[contracts.address("nft_factory")] = (
+                    contracts.deploy_block("nft_factory") or 0
+                )
+        self.factories = {to_checksum_address(k): v for k, v in factories.items()}
+
+        if path is None:
+            path = Path(CACHE_DIR) / f"{contracts.network}-collections.sqlite"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def collection(self, address):
+        return self.web3.eth.contract(
+            address=to_checksum_address(address), abi=COLLECTION_ABI
+        )
+
+    def checkpoint(self, factory):
+        row = self.db.execute(
+            "SELECT block FROM checkpoints WHERE factory = ?", (factory,)
+        ).fetchone()
+        return row[0] if row else self.factories[factory] - 1
+
+    def discover(self, factory, head):
+        """New (address, deployer, block) clones of `factory` up to `head`"""
+        from_block = self.checkpoint(factory) + 1
+        if from_block > head:
+            return []
+        params = {"address": factory, "topics": [CREATE_TOKEN_TOPIC]}
+        return [
+            (
+                to_checksum_address(log["topics"][1][-20:]),
+                to_checksum_address(log["topics"][2][-20:]),
+                log["blockNumber"],
+            )
+            for log in self.pager.iter_logs(params, from_block, head)
+        ]
+
+    def _payees(self, addresses, block):
+        """Payee list per collection, probing `payee(i)` until it reverts"""
+        payees = {a: [] for a in addresses}
+        open_ = list(addresses)
+        offset = 0
+        while open_:
+            calls = [
+                call(self.collection(a), "payee", offset + i)
+                for a in open_
+                for i in range(PAYEE_PROBE)
+            ]
+            results = self.multicall(calls, block=block)
+            still_open = []
+            for n, address in enumerate(open_):
+                found = results[n * PAYEE_PROBE : (n + 1) * PAYEE_PROBE]
+                payees[address] += [p for p in found if p is not None]
+                if all(p is not None for p in found):
+                    still_open.append(address)
+            open_ = still_open
+            offset += PAYEE_PROBE
+
+        share_calls = [
+            (address, payee, call(self.collection(address), "shares", payee))
+            for address, found in payees.items()
+            for payee in found
+        ]
+        shares = self.multicall([c for _, _, c in share_calls], block=block)
+        result = {a: [] for a in addresses}
+        for (address, payee, _), share in zip(share_calls, shares):
+            result[address].append([payee, _str(share)])
+        return result
+
+    def _read(self, addresses, fields, block):
+        calls = [call(self.collection(a), f) for a in addresses for f in fields]
+        results = self.multicall(calls, block=block)
+        width = len(fields)
+        return {
+            address: dict(zip(fields, results[i * width : (i + 1) * width]))
+            for i, address in enumerate(addresses)
+        }
+
+    def sync(self, to_block="latest"):
+        """Find new clones and fetch their metadata.  Returns how many."""
+        head = self.web3.eth.get_block(to_block)["number"] - self.confirmations
+        added = 0
+
+        for factory in self.factories:
+            found = self.discover(factory, head)
+            addresses = [address for address, _, _ in found]
+            if addresses:
+                values = self._read(addresses, STATIC_FIELDS + LIVE_FIELDS, head)
+                payees = self._payees(addresses, head)
+            with self.db:
+                for address, deployer, block in found:
+                    v = values[address]
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO collections VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            address,
+                            factory,
+                            deployer,
+                            block,
+                            v["name"],
+                            v["symbol"],
+                            _str(v["maxSupply"]),
+                            _str(v["totalSupply"]),
+                            v["baseURI"],
+                            v["contractURI"],
+                            json.dumps(payees[address]) if payees[address] else None,
+                            head,
+                        ),
+                    )
+                self.db.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (factory, head)
+                )
+            added += len(found)
+
+        return added
+
+    def refresh(self, block="latest"):
+        """Re-read the fields that can change, for every known collection"""
+        block = self.multicall.resolve_block(block)
+        addresses = [
+            row[0] for row in self.db.execute("SELECT address FROM collections")
+        ]
+        if not addresses:
+            return 0
+
+        values = self._read(addresses, LIVE_FIELDS, block)
+        with self.db:
+            self.db.executemany(
+                "UPDATE collections SET total_supply = ?, base_uri = ?, "
+                "contract_uri = ?, refreshed_block = ? WHERE address = ?",
+                [
+                    (
+                        _str(v["totalSupply"]),
+                        v["baseURI"],
+                        v["contractURI"],
+                        block,
+                        address,
+                    )
+                    for address, v in values.items()
+                ],
+            )
+        return len(addresses)
+
+    def collections(self, factory=None, deployer=None):
+        """Indexed collections as dicts, oldest first"""
+        query = "SELECT * FROM collections WHERE 1 = 1"
+        params = []
+        if factory is not None:
+            query += " AND factory = ?"
+            params.append(to_checksum_address(factory))
+        if deployer is not None:
+            query += " AND deployer = ?"
+            params.append(to_checksum_address(deployer))
+        query += " ORDER BY block, address"
+
+        for row in self.db.execute(query, params):
+            record = dict(zip(COLUMNS, row))
+            for key in ("max_supply", "total_supply"):
+                if record[key] is not None:
+                    record[key] = int(record[key])
+            record["payees"] = [
+                (payee, int(share))
+                for payee, share in json.loads(record["payees"] or "[]")
+            ]
+            yield record
+
+    def close(self):
+        self.db.close()
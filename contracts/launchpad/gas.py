@@ -0,0 +1,25 @@
+"""
+Gas estimates shared by the sweep and payout planners.
+
+Both plan transactions that move balances out of many contracts: an
+IngestImpl `collect` or a PaymentSplitter `release` per item, alone or
+inside a batch call.  The figures are estimates for the current contracts;
+re-check them against `estimate_gas` on a real transaction after contract
+changes.
+"""
+
+# Intrinsic cost of any transaction
+TX_GAS = 21000
+
+# Calldata headers and dispatch of a batch call, or a loop's own reads
+CALL_OVERHEAD_GAS = 5000
+
+BASE_GAS = TX_GAS + CALL_OVERHEAD_GAS
+
+# Moving one balance out of a contract: the bookkeeping reads and writes, the
+# transfer and its event, plus the item's calldata
+ETH_TRANSFER_GAS = 45000
+TOKEN_TRANSFER_GAS = 60000
+
+# CREATE2 of a 55 byte minimal proxy
+CLONE_GAS = 45000
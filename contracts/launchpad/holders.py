@@ -0,0 +1,177 @@
+"""
+Holder snapshots across many NFT collections at once.
+
+Owners are interned once into integer ids, keyed by their raw 20 bytes, and
+only checksummed on output.  Each collection's `Transfer` logs up to the
+snapshot block are replayed into a `RangeOwnership`, and its runs expanded
+into parallel NumPy arrays of (token id, owner id) for the held tokens.
+Per-holder counts, overall and per collection, are then vectorized
+group-bys, and the whole snapshot saves to one compressed `.npz`.
+
+Works for OriginERC721V6 and OriginERC721a_v3 alike: both emit one
+`Transfer` per token, including on mint.
+"""
+
+import numpy as np
+from eth_utils import to_checksum_address
+
+from .encoding import fixed_bytes
+from .ingest import ADDRESS_DTYPE
+from .logs import LogPager
+from .ownership import RangeOwnership
+from .vouchers import TRANSFER_TOPIC
+
+ZERO = b"\x00" * 20
+
+
+class AddressTable:
+    """Raw 20-byte address <-> dense integer id.  Id 0 is the zero address."""
+
+    def __init__(self, raw=None):
+        self.raw = list(raw) if raw is not None else [ZERO]
+        self.ids = {address: i for i, address in enumerate(self.raw)}
+
+    def __len__(self):
+        return len(self.raw)
+
+    def intern(self, raw):
+        i = self.ids.get(raw)
+        if i is None:
+            i = self.ids[raw] = len(self.raw)
+            self.raw.append(raw)
+        return i
+
+    def id_of(self, address):
+        return self.ids.get(bytes.fromhex(address[2:]))
+
+    def address(self, i):
+        return to_checksum_address(self.raw[i])
+
+    def array(self):
+        return np.array(self.raw, dtype=ADDRESS_DTYPE)
+
+    @classmethod
+    def from_array(cls, array):
+        return cls(fixed_bytes(a, 20) for a in array)
+
+
+class HolderSnapshot:
+    def __init__(self, block, collections, table, collection_idx, token_ids, owners):
+        self.block = block
+        self.collections = list(collections)
+        self.table = table
+        self.collection_idx = collection_idx
+        self.token_ids = token_ids
+        self.owners = owners
+
+    def __len__(self):
+        """Tokens held (not burned) across all collections"""
+        return len(self.token_ids)
+
+    @classmethod
+    def take(cls, web3, collections, block="latest", pager=None, table=None):
+        """
+        Snapshot `collections` at `block`.  `collections` is a list of
+        addresses, or a dict of address -> first block to scan.
+        """
+        pager = pager or LogPager(web3)
+        if isinstance(block, str):
+            block = web3.eth.get_block(block)["number"]
+        if not isinstance(collections, dict):
+            collections = {address: 0 for address in collections}
+        table = table or AddressTable()
+
+        parts_idx, parts_tokens, parts_owners = [], [], []
+        addresses = []
+        for i, (address, from_block) in enumerate(collections.items()):
+            address = to_checksum_address(address)
+            addresses.append(address)
+
+            # Token ids are not assumed to start at 1 or to be consecutive
+            ownership = RangeOwnership(start_token_id=0, raw=True)
+            params = {"address": address, "topics": [TRANSFER_TOPIC]}
+            for log in pager.iter_logs(params, from_block, block):
+                topics = log["topics"]
+                ownership.set_owner(
+                    int.from_bytes(bytes(topics[3]), "big"), bytes(topics[2][-20:])
+                )
+
+            held_tokens, local_owners = ownership.held()
+            owner_ids = np.array(
+                [table.intern(a) for a in ownership.addresses],
+                dtype=np.uint32,
+            )
+            parts_tokens.append(held_tokens)
+            parts_owners.append(owner_ids[local_owners])
+            parts_idx.append(np.full(len(held_tokens), i, dtype=np.uint16))
+
+        return cls(
+            block,
+            addresses,
+            table,
+            np.concatenate(parts_idx) if parts_idx else np.zeros(0, np.uint16),
+            np.concatenate(parts_tokens) if parts_tokens else np.zeros(0, np.uint64),
+            np.concatenate(parts_owners) if parts_owners else np.zeros(0, np.uint32),
+        )
+
+    def _mask(self, collections):
+        if collections is None:
+            return slice(None)
+        wanted = [self.collections.index(to_checksum_address(c)) for c in collections]
+        return np.isin(self.collection_idx, wanted)
+
+    def counts(self, collections=None):
+        """Tokens held per owner id, over all or some collections"""
+        owners = self.owners[self._mask(collections)]
+        return np.bincount(owners, minlength=len(self.table))
+
+    def holders(self, collections=None, min_count=1):
+        """{checksummed address: tokens held}, largest holders first"""
+        counts = self.counts(collections)
+        ids = np.flatnonzero(counts >= min_count)
+        ids = ids[np.argsort(-counts[ids], kind="stable")]
+        return {self.table.address(i): int(counts[i]) for i in ids}
+
+    def by_collection(self):
+        """
+        (owner ids, collection indexes, counts) for every holder and
+        collection pair, from one group-by.
+        """
+        width = len(self.collections)
+        keys = self.owners.astype(np.int64) * width + self.collection_idx
+        pairs, counts = np.unique(keys, return_counts=True)
+        return pairs // width, pairs % width, counts
+
+    def collections_held(self):
+        """Number of distinct collections held per owner id"""
+        owners, _, _ = self.by_collection()
+        return np.bincount(owners, minlength=len(self.table))
+
+    def tokens_of(self, address, collection):
+        owner = self.table.id_of(address)
+        i = self.collections.index(to_checksum_address(collection))
+        mask = (self.owners == owner) & (self.collection_idx == i)
+        return sorted(int(t) for t in self.token_ids[mask])
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            block=np.array(self.block, dtype=np.int64),
+            collections=np.array(self.collections),
+            addresses=self.table.array(),
+            collection_idx=self.collection_idx,
+            token_ids=self.token_ids,
+            owners=self.owners,
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(
+            int(data["block"]),
+            [str(c) for c in data["collections"]],
+            AddressTable.from_array(data["addresses"]),
+            data["collection_idx"],
+            data["token_ids"],
+            data["owners"],
+        )
@@ -0,0 +1,236 @@
+"""
+Incremental event index for the staking contracts, stored in SQLite.
+
+Each contract is scanned from its deployment block and checkpointed, so a
+sync only fetches blocks added since the last run.  Hashes of recently
+indexed blocks are kept for `confirmations` blocks; if any of them change on
+the next sync, everything from the last still-matching block onward is
+rolled back and re-indexed.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from .encoding import hex_str
+from .logs import LogPager, event_topics
+from .registry import CACHE_DIR
+
+SERIES_EVENTS = ("NewSeason", "SeasonStart", "SeasonCancelled")
+SEASON_EVENTS = ("Stake", "Unstake", "Finale")
+VAULT_EVENTS = ("RewardsSent",)
+
+DEFAULT_CONFIRMATIONS = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    contract TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    contract TEXT NOT NULL,
+    event TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_contract_event
+    ON events (contract, event, block_number);
+"""
+
+
+def _jsonable(value):
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+class EventIndexer:
+    def __init__(
+        self,
+        contracts,
+        path=None,
+        confirmations=DEFAULT_CONFIRMATIONS,
+        pager=None,
+    ):
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.confirmations = confirmations
+        self.pager = pager or LogPager(self.web3)
+
+        if path is None:
+            path = Path(CACHE_DIR) / f"{contracts.network}-events.sqlite"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def targets(self):
+        """Console name -> event names to index"""
+        targets = {"series": SERIES_EVENTS, "vault": VAULT_EVENTS}
+        for name in self.contracts.seasons():
+            targets[name] = SEASON_EVENTS
+        return targets
+
+    def start_block(self, name):
+        block = self.contracts.deploy_block(name)
+        if block is None:
+            # Seasons are always deployed after the Series
+            block = self.contracts.deploy_block("series") or 0
+        return block
+
+    def checkpoint(self, name):
+        row = self.db.execute(
+            "SELECT block FROM checkpoints WHERE contract = ?", (name,)
+        ).fetchone()
+        return row[0] if row else self.start_block(name) - 1
+
+    def indexed_block(self):
+        """Block every target is indexed up to"""
+        return min(self.checkpoint(name) for name in self.targets())
+
+    def check_reorg(self, head):
+        """
+        Compare recorded hashes within the confirmation window, up to `head`,
+        with the chain, rolling back if any changed.  Returns the block
+        rolled back to, or None.
+        """
+        rows = self.db.execute(
+            "SELECT number, hash FROM blocks WHERE number > ? AND number <= ? "
+            "ORDER BY number",
+            (head - self.confirmations, head),
+        ).fetchall()
+
+        last_good = None
+        for number, recorded in rows:
+            if hex_str(self.web3.eth.get_block(number)["hash"]) != recorded:
+                rollback_to = (
+                    last_good if last_good is not None else head - self.confirmations
+                )
+                self.rollback(rollback_to)
+                return rollback_to
+            last_good = number
+
+        return None
+
+    def rollback(self, block):
+        """Forget everything indexed after `block`"""
+        with self.db:
+            self.db.execute("DELETE FROM events WHERE block_number > ?", (block,))
+            self.db.execute("DELETE FROM blocks WHERE number > ?", (block,))
+            self.db.execute(
+                "UPDATE checkpoints SET block = ? WHERE block > ?", (block, block)
+            )
+
+    def _record_block(self, number, block_hash):
+        self.db.execute(
+            "INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)",
+            (number, hex_str(block_hash)),
+        )
+
+    def sync_contract(self, name, event_names, head):
+        contract = self.contracts.contract(name)
+        topics = event_topics(contract, event_names)
+        from_block = self.checkpoint(name) + 1
+
+        if from_block > head:
+            return 0
+
+        logs = self.pager.get_logs(
+            {"address": contract.address, "topics": [list(topics)]}, from_block, head
+        )
+        window_start = head - self.confirmations
+
+        with self.db:
+            for log in logs:
+                event = topics[hex_str(log["topics"][0])]
+                decoded = event().process_log(log)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        name,
+                        decoded["event"],
+                        log["blockNumber"],
+                        log["logIndex"],
+                        hex_str(log["transactionHash"]),
+                        log["address"],
+                        json.dumps(
+                            {k: _jsonable(v) for k, v in decoded["args"].items()}
+                        ),
+                    ),
+                )
+                if log["blockNumber"] > window_start:
+                    self._record_block(log["blockNumber"], log["blockHash"])
+
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+                (name, contract.address, head),
+            )
+
+        return len(logs)
+
+    def sync(self, to_block="latest"):
+        """
+        Index all targets up to `to_block`.  Returns the number of new events.
+
+        Checkpoints never move backwards: syncing to a block the index is
+        already past does nothing.  To read the index as of an older block,
+        pass `to_block` to `events` instead.
+        """
+        head_block = self.web3.eth.get_block(to_block)
+        head = head_block["number"]
+        if head <= self.indexed_block():
+            return 0
+
+        self.check_reorg(head)
+
+        count = 0
+        for name, event_names in self.targets().items():
+            count += self.sync_contract(name, event_names, head)
+
+        with self.db:
+            self._record_block(head, head_block["hash"])
+            self.db.execute(
+                "DELETE FROM blocks WHERE number <= ?", (head - self.confirmations,)
+            )
+
+        return count
+
+    def events(self, contract=None, event=None, from_block=0, to_block=None):
+        """Iterate indexed events as dicts, in chain order"""
+        query = "SELECT * FROM events WHERE block_number >= ?"
+        params = [from_block]
+        if to_block is not None:
+            query += " AND block_number <= ?"
+            params.append(to_block)
+        if contract is not None:
+            query += " AND contract = ?"
+            params.append(contract)
+        if event is not None:
+            query += " AND event = ?"
+            params.append(event)
+        query += " ORDER BY block_number, log_index"
+
+        for row in self.db.execute(query, params):
+            yield {
+                "contract": row[0],
+                "event": row[1],
+                "block_number": row[2],
+                "log_index": row[3],
+                "transaction_hash": row[4],
+                "address": row[5],
+                "args": json.loads(row[6]),
+            }
+
+    def close(self):
+        self.db.close()
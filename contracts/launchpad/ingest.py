@@ -0,0 +1,282 @@
+"""
+Offline ingest endpoint addresses.
+
+`IngestMaster.getAddress(salt)` is `Clones.predictDeterministicAddress`
+for an EIP-1167 clone of the IngestMidProxy, deployed by the master proxy
+with CREATE2:
+
+    keccak256(0xff ++ master ++ salt ++ keccak256(cloneInitCode))[12:]
+
+The init code only depends on the mid proxy, so its hash is computed once
+and each endpoint costs a single keccak over 85 bytes.  Those 85 bytes fit
+in one keccak block, so a whole chunk of salts is hashed at once: the
+Keccak-f[1600] rounds run on NumPy arrays holding each lane of every
+message.  Chunks are spread across a process pool, and the results kept in a
+salt-sorted index on disk.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from eth_hash.auto import keccak
+from eth_utils import decode_hex, to_checksum_address
+
+from .encoding import fixed_bytes
+from .multicall import Multicall, call
+
+# OpenZeppelin Clones.sol minimal proxy creation code, around the implementation
+CLONE_PREFIX = bytes.fromhex("3d602d80600a3d3981f3363d3d373d3d3d363d73")
+CLONE_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+DEFAULT_CHUNK_SIZE = 50000
+
+SALT_DTYPE = "S32"
+ADDRESS_DTYPE = "S20"
+
+
+def clone_init_code_hash(implementation):
+    return keccak(CLONE_PREFIX + decode_hex(implementation) + CLONE_SUFFIX)
+
+
+def as_salt(salt):
+    """Normalize an int, hex string or bytes salt to 32 bytes"""
+    if isinstance(salt, int):
+        return salt.to_bytes(32, "big")
+    if isinstance(salt, str):
+        salt = decode_hex(salt)
+    if len(salt) != 32:
+        raise ValueError(f"Salt must be 32 bytes, got {len(salt)}")
+    return bytes(salt)
+
+
+def create2_prefix(deployer):
+    return b"\xff" + decode_hex(deployer)
+
+
+def predict_address(deployer, implementation, salt):
+    """Endpoint address for one salt, as `IngestMaster.getAddress(salt)`"""
+    digest = keccak(
+        create2_prefix(deployer) + as_salt(salt) + clone_init_code_hash(implementation)
+    )
+    return to_checksum_address(digest[12:])
+
+
+# Keccak-256 absorbs 136 bytes per block, as 17 of the 25 64-bit lanes
+RATE = 136
+
+KECCAK_ROUND_CONSTANTS = np.array(
+    [
+        0x0000000000000001, 0x0000000000008082, 0x800000000000808A,
+        0x8000000080008000, 0x000000000000808B, 0x0000000080000001,
+        0x8000000080008081, 0x8000000000008009, 0x000000000000008A,
+        0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+        0x000000008000808B, 0x800000000000008B, 0x8000000000008089,
+        0x8000000000008003, 0x8000000000008002, 0x8000000000000080,
+        0x000000000000800A, 0x800000008000000A, 0x8000000080008081,
+        0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+    ],
+    dtype=np.uint64,
+)  # fmt: skip
+
+# Rotation of lane x + 5y, which rho/pi then moves to (y, 2x + 3y)
+KECCAK_ROTATIONS = np.array(
+    [
+        0, 1, 62, 28, 27,
+        36, 44, 6, 55, 20,
+        3, 10, 43, 25, 39,
+        41, 45, 15, 21, 8,
+        18, 2, 61, 56, 14,
+    ],
+    dtype=np.uint64,
+)  # fmt: skip
+_PI = np.array([y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5)])
+# Source lane of each lane after rho/pi, with its rotation
+_PI_SOURCE = np.argsort(_PI)
+_LEFT = KECCAK_ROTATIONS[_PI_SOURCE][:, None]
+_RIGHT = (64 - _LEFT) % 64
+_NEXT = np.array([1, 2, 3, 4, 0])
+_NEXT_2 = np.array([2, 3, 4, 0, 1])
+_PREVIOUS = np.array([4, 0, 1, 2, 3])
+
+# Messages hashed together; small enough for the lanes to stay in cache
+KECCAK_BATCH = 4096
+
+
+def _keccak_f(lanes):
+    """Keccak-f[1600] on a (25, n) array of lanes, one column per message"""
+    for constant in KECCAK_ROUND_CONSTANTS:
+        # theta
+        rows = lanes.reshape(5, 5, -1)
+        parity = rows[0] ^ rows[1]
+        for y in range(2, 5):
+            parity ^= rows[y]
+        after = parity[_NEXT]
+        rows ^= parity[_PREVIOUS] ^ ((after << np.uint64(1)) | (after >> np.uint64(63)))
+
+        # rho and pi
+        moved = lanes[_PI_SOURCE]
+        rotated = moved << _LEFT
+        moved >>= _RIGHT
+        rotated |= moved
+
+        # chi and iota
+        rows = rotated.reshape(5, 5, -1)
+        lanes = ~rows[:, _NEXT]
+        lanes &= rows[:, _NEXT_2]
+        lanes ^= rows
+        lanes = lanes.reshape(25, -1)
+        lanes[0] ^= constant
+    return lanes
+
+
+def _keccak_create2(prefix, salts, init_hash):
+    """Digests of prefix ++ salt ++ init_hash for a (n, 32) uint8 array of salts"""
+    message_length = len(prefix) + 32 + len(init_hash)
+    block = np.zeros((len(salts), RATE), dtype=np.uint8)
+    block[:, : len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    block[:, len(prefix) : len(prefix) + 32] = salts
+    block[:, len(prefix) + 32 : message_length] = np.frombuffer(
+        init_hash, dtype=np.uint8
+    )
+    # Keccak padding, not SHA-3's
+    block[:, message_length] = 0x01
+    block[:, RATE - 1] |= 0x80
+
+    lanes = np.zeros((25, len(salts)), dtype=np.uint64)
+    lanes[: RATE // 8] = block.view("<u8").T
+    digests = np.ascontiguousarray(_keccak_f(lanes)[:4].T, dtype="<u8")
+    return digests.view(np.uint8)
+
+
+def _predict_chunk(args):
+    prefix, init_hash, salts = args
+    salts = np.frombuffer(salts, dtype=np.uint8).reshape(-1, 32)
+    addresses = []
+    for i in range(0, len(salts), KECCAK_BATCH):
+        digests = _keccak_create2(prefix, salts[i : i + KECCAK_BATCH], init_hash)
+        addresses.append(digests[:, 12:].tobytes())
+    return b"".join(addresses)
+
+
+def predict_addresses(
+    deployer, implementation, salts, processes=None, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Raw 20-byte endpoint addresses for `salts`, in order, as a NumPy
+    array of dtype S20.
+    """
+    salts = b"".join(as_salt(s) for s in salts)
+    prefix = create2_prefix(deployer)
+    init_hash = clone_init_code_hash(implementation)
+    step = chunk_size * 32
+    chunks = [
+        (prefix, init_hash, salts[i : i + step]) for i in range(0, len(salts), step)
+    ]
+
+    if len(chunks) <= 1 or processes == 1:
+        raw = b"".join(_predict_chunk(c) for c in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            raw = b"".join(pool.map(_predict_chunk, chunks))
+
+    return np.frombuffer(raw, dtype=ADDRESS_DTYPE)
+
+
+class EndpointIndex:
+    """
+    Salt -> endpoint address index backed by two sorted NumPy arrays, with
+    an address-sorted permutation for reverse lookups.
+    """
+
+    def __init__(self, salts, addresses):
+        order = np.argsort(salts)
+        self.salts = np.asarray(salts, dtype=SALT_DTYPE)[order]
+        self.addresses = np.asarray(addresses, dtype=ADDRESS_DTYPE)[order]
+        self._by_address = None
+
+    def __len__(self):
+        return len(self.salts)
+
+    @classmethod
+    def build(cls, deployer, implementation, salts, processes=None):
+        salts = [as_salt(s) for s in salts]
+        addresses = predict_addresses(
+            deployer, implementation, salts, processes=processes
+        )
+        return cls(np.array(salts, dtype=SALT_DTYPE), addresses)
+
+    @classmethod
+    def from_registry(cls, contracts, salts, processes=None):
+        """Build for the network's IngestMaster proxy and IngestMidProxy"""
+        return cls.build(
+            contracts.address("ingest_master"),
+            contracts.address("ingest_mid_proxy"),
+            salts,
+            processes=processes,
+        )
+
+    def extend(self, deployer, implementation, salts, processes=None):
+        """Add new salts (e.g. a new onboarding batch), skipping known ones"""
+        salts = np.unique(np.array([as_salt(s) for s in salts], dtype=SALT_DTYPE))
+        i = np.minimum(np.searchsorted(self.salts, salts), max(len(self) - 1, 0))
+        if len(self):
+            salts = salts[self.salts[i] != salts]
+        added = EndpointIndex.build(
+            deployer, implementation, [fixed_bytes(s, 32) for s in salts], processes
+        )
+        return EndpointIndex(
+            np.concatenate([self.salts, added.salts]),
+            np.concatenate([self.addresses, added.addresses]),
+        )
+
+    def save(self, path):
+        np.savez(path, salts=self.salts, addresses=self.addresses)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls.__new__(cls)
+        index.salts = data["salts"]
+        index.addresses = data["addresses"]
+        index._by_address = None
+        return index
+
+    def address_for(self, salt):
+        salt = as_salt(salt)
+        i = np.searchsorted(self.salts, salt)
+        if i < len(self.salts) and fixed_bytes(self.salts[i], 32) == salt:
+            return to_checksum_address(fixed_bytes(self.addresses[i], 20))
+        raise KeyError(salt.hex())
+
+    def salt_for(self, address):
+        if self._by_address is None:
+            self._by_address = np.argsort(self.addresses)
+        raw = decode_hex(address)
+        sorted_addresses = self.addresses[self._by_address]
+        i = np.searchsorted(sorted_addresses, raw)
+        if i < len(sorted_addresses) and fixed_bytes(sorted_addresses[i], 20) == raw:
+            return "0x" + fixed_bytes(self.salts[self._by_address[i]], 32).hex()
+        raise KeyError(address)
+
+
+def verify(contracts, index, sample=100, multicall=None):
+    """
+    Compare a sample of the index against `IngestMaster.getAddress` on
+    chain.  Returns mismatching (salt, expected, onchain) tuples.
+    """
+    master = contracts.contract("ingest_master")
+    multicall = multicall or Multicall(contracts.web3)
+    step = max(1, len(index) // sample)
+    picks = list(range(0, len(index), step))[:sample]
+
+    results = multicall(
+        [call(master, "getAddress", fixed_bytes(index.salts[i], 32)) for i in picks]
+    )
+
+    mismatches = []
+    for i, onchain in zip(picks, results):
+        expected = to_checksum_address(fixed_bytes(index.addresses[i], 20))
+        if onchain != expected:
+            salt = "0x" + fixed_bytes(index.salts[i], 32).hex()
+            mismatches.append((salt, expected, onchain))
+    return mismatches
@@ -0,0 +1,324 @@
+"""
+Season points leaderboards, maintained incrementally.
+
+Users are kept in an order-statistic index: a treap ordered by points
+(highest first, ties by address) where every node knows the size of its
+subtree.  Setting a user's points is one removal and one insertion, both
+O(log n) expected, and rank, percentile and "who is at rank i" are a single
+walk down the tree.  Top-k is the first k nodes in order.
+
+Users appear on a season's board once they have a record in it, i.e. after
+their first `Stake` or `Unstake` there.  Stakers who haven't touched the
+season yet still get points lazily from their Series balance
+(`_initMemUser`), so the rollover view adds them from a second board:
+queries count across both, and top-k lazily merges the two orders with a
+heap.
+"""
+
+import heapq
+import random
+from itertools import islice
+
+from .indexer import EventIndexer
+from .multicall import Multicall, call
+from .snapshot import stakers
+from .timeline import season_model
+
+
+class _Node:
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+def _split(node, key, inclusive=False):
+    """(keys before `key`, the rest); `key` itself goes left if inclusive"""
+    if node is None:
+        return None, None
+    if node.key < key or (inclusive and node.key == key):
+        left, right = _split(node.right, key, inclusive)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key, inclusive)
+    node.left = right
+    return left, _update(node)
+
+
+def _merge(left, right):
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+class OrderIndex:
+    """Sorted keys with O(log n) insert, remove, rank and select"""
+
+    def __init__(self):
+        self.root = None
+
+    def __len__(self):
+        return _size(self.root)
+
+    def insert(self, key):
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key):
+        left, rest = _split(self.root, key)
+        _, right = _split(rest, key, inclusive=True)
+        self.root = _merge(left, right)
+
+    def count_before(self, key):
+        """Number of keys less than `key`"""
+        node, count = self.root, 0
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, i):
+        """The key at 0-based position `i`"""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        node = self.root
+        while True:
+            left = _size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node.key
+            else:
+                i -= left + 1
+                node = node.right
+
+    def __iter__(self):
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+
+def _key(address, points):
+    return (-points, address)
+
+
+class Leaderboard:
+    """
+    Users ranked by points.  `points` holds every user seen, including those
+    at zero, who are not ranked.
+    """
+
+    def __init__(self):
+        self.points = {}
+        self.index = OrderIndex()
+
+    def __len__(self):
+        """Users with points"""
+        return len(self.index)
+
+    def __contains__(self, address):
+        return address in self.points
+
+    def update(self, address, points):
+        """Set a user's points.  Returns their previous points."""
+        old = self.points.get(address, 0)
+        if old == points and address in self.points:
+            return old
+        if old:
+            self.index.remove(_key(address, old))
+        if points:
+            self.index.insert(_key(address, points))
+        self.points[address] = points
+        return old
+
+    def remove(self, address):
+        old = self.points.pop(address, 0)
+        if old:
+            self.index.remove(_key(address, old))
+        return old
+
+    def count_above(self, points):
+        """Users with strictly more than `points`"""
+        return self.index.count_before((-points, ""))
+
+    def rank(self, address):
+        """1-based rank, shared by users with equal points; None if unranked"""
+        points = self.points.get(address)
+        if not points:
+            return None
+        return self.count_above(points) + 1
+
+    def percentile(self, address):
+        """Share of ranked users with fewer points, in percent"""
+        rank = self.rank(address)
+        if rank is None:
+            return None
+        below = len(self) - self.count_above(self.points[address] - 1)
+        return 100 * below / len(self)
+
+    def at(self, rank):
+        """(address, points) at 1-based position `rank`"""
+        neg_points, address = self.index.select(rank - 1)
+        return address, -neg_points
+
+    def __iter__(self):
+        """(address, points), highest first"""
+        for neg_points, address in self.index:
+            yield address, -neg_points
+
+    def top(self, k):
+        return list(islice(self, k))
+
+    def apply(self, event):
+        """Apply a `Stake` or `Unstake` event dict from the event index"""
+        address = event["args"]["userAddress"]
+        if event["event"] == "Stake":
+            self.update(address, int(event["args"]["points"]))
+        elif event["event"] == "Unstake":
+            self.update(address, 0)
+
+
+class RolloverView:
+    """
+    A season's recorded points plus the points `_initMemUser` would give
+    stakers without a record yet.  Both boards stay live: once a rolled-over
+    user gets a record, `apply` moves them to the recorded board.
+    """
+
+    def __init__(self, recorded, rollover):
+        self.recorded = recorded
+        self.rollover = rollover
+
+    def __len__(self):
+        return len(self.recorded) + len(self.rollover)
+
+    def points(self, address):
+        if address in self.recorded:
+            return self.recorded.points[address]
+        return self.rollover.points.get(address, 0)
+
+    def count_above(self, points):
+        return self.recorded.count_above(points) + self.rollover.count_above(points)
+
+    def rank(self, address):
+        points = self.points(address)
+        if not points:
+            return None
+        return self.count_above(points) + 1
+
+    def percentile(self, address):
+        points = self.points(address)
+        if not points:
+            return None
+        return 100 * (len(self) - self.count_above(points - 1)) / len(self)
+
+    def __iter__(self):
+        return heapq.merge(self.recorded, self.rollover, key=lambda item: -item[1])
+
+    def top(self, k):
+        return list(islice(self, k))
+
+    def apply(self, event):
+        self.rollover.remove(event["args"]["userAddress"])
+        self.recorded.apply(event)
+
+
+def season_leaderboard(contracts, name, block="latest", indexer=None):
+    """Leaderboard of recorded points in season `name` at `block`"""
+    block = contracts.web3.eth.get_block(block)["number"]
+    own_indexer = indexer is None
+    indexer = indexer or EventIndexer(contracts)
+    try:
+        # Never sync the index back to an older block; read it at one
+        if indexer.indexed_block() < block:
+            indexer.sync()
+        board = Leaderboard()
+        for event in indexer.events(name, to_block=block):
+            board.apply(event)
+        return board
+    finally:
+        if own_indexer:
+            indexer.close()
+
+
+def rollover_points(contracts, name, addresses, block="latest", multicall=None):
+    """
+    {address: points} for `addresses` with no record in season `name` that
+    `_initMemUser` would roll over from their Series balance.
+    """
+    multicall = multicall or Multicall(contracts.web3)
+    block = multicall.resolve_block(block)
+    series = contracts.contract("series")
+    season = contracts.contract(name)
+
+    calls = []
+    for address in addresses:
+        calls.append(call(season, "users", address))
+        calls.append(call(series, "balanceOf", address))
+        calls.append(call(series, "latestStakeTime", address))
+    results = multicall(calls, block=block)
+
+    candidates = [
+        (address, balance, latest)
+        for address, user, balance, latest in zip(
+            addresses, results[0::3], results[1::3], results[2::3]
+        )
+        if user is not None and not user[0] and balance
+    ]
+    if not candidates:
+        return {}
+    points = season_model(contracts, name).rollover_points(
+        [balance for _, balance, _ in candidates],
+        [latest for _, _, latest in candidates],
+    )
+    return {address: int(p) for (address, _, _), p in zip(candidates, points) if p}
+
+
+def rollover_view(contracts, name, block="latest", indexer=None, multicall=None):
+    """
+    RolloverView of season `name` at `block`: every recorded user plus every
+    staker the season would roll over.
+    """
+    block = contracts.web3.eth.get_block(block)["number"]
+    own_indexer = indexer is None
+    indexer = indexer or EventIndexer(contracts)
+    try:
+        if indexer.indexed_block() < block:
+            indexer.sync()
+        recorded = season_leaderboard(contracts, name, block, indexer)
+        candidates = [a for a in stakers(indexer, block) if a not in recorded]
+    finally:
+        if own_indexer:
+            indexer.close()
+
+    rollover = Leaderboard()
+    for address, points in rollover_points(
+        contracts, name, candidates, block, multicall
+    ).items():
+        rollover.update(address, points)
+    return RolloverView(recorded, rollover)
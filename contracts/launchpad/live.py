@@ -0,0 +1,610 @@
+"""
+Live staking aggregates over a websocket subscription.
+
+The state is seeded once: the event index is brought up to a seed block and
+its `Stake`/`Unstake`/`RewardsSent` events replayed for per-user points and
+claimed rewards, every staker's Series balance and latest stake time are read
+in one Multicall, and each season's totals and snapshot are read at that
+block.  From then on `eth_subscribe` delivers `newHeads`, the seasons' and
+vault's logs and OGN transfers out of the Series, and every event updates the
+aggregates in place, without further reads:
+
+- `Stake` adds `_pointsInTime(amount, block.timestamp)` to the total and
+  records the user's new points from the event.  The stake that bootstraps a
+  season starts its total from the Series supply before the transaction,
+  as `_acquireStakingSeason` does.
+- `Unstake` before `endTime` removes the user's points from the total, taken
+  from their record or, if they never had one, from the points
+  `_initMemUser` would have rolled over; after `endTime` the total is kept,
+  as the contract does.
+- `Finale` records the reward snapshot; `RewardsSent` is attributed to the
+  season whose claim period it falls in.
+- Series balances follow each transaction's first `Stake` amount and the
+  OGN returned by `unstake`.  Seasons not bootstrapped yet derive their
+  total and rollover points from them.
+
+Every applied log is journaled with what undoing it takes.  Logs removed by
+a reorg are undone newest first, and their replacements are applied as new
+logs.  A season bootstrapped by the governor (`Series.bootstrapSeason`)
+emits nothing, so re-`seed` after one.
+
+The subscription runs on its own thread, so the console stays usable:
+
+    live = live_staking("wss://...")
+    live.start()
+    live.summary()
+    live.stop()
+"""
+
+import asyncio
+import logging
+import threading
+
+from eth_utils import to_checksum_address
+from web3 import AsyncWeb3, WebsocketProviderV2
+from web3.exceptions import ProviderConnectionError, TimeExhausted
+from websockets.exceptions import WebSocketException
+
+from .blocktime import BlockTimeIndex
+from .encoding import address_topic, hex_str
+from .indexer import SEASON_EVENTS, EventIndexer
+from .leaderboard import Leaderboard, RolloverView
+from .logs import LogPager, event_topics
+from .multicall import Multicall, call
+from .snapshot import stakers
+from .sweep import ETH_ADDRESS
+from .timeline import season_model
+from .vouchers import TRANSFER_TOPIC
+
+DEFAULT_TOP = 10
+
+# Blocks of timestamps and undo records kept for reorgs
+REORG_WINDOW = 256
+
+# A dropped websocket, a failed reconnect or an unanswered request
+RECONNECT_ERRORS = (
+    ConnectionError,
+    OSError,
+    asyncio.TimeoutError,
+    WebSocketException,
+    ProviderConnectionError,
+    TimeExhausted,
+)
+RECONNECT_DELAY = 5
+
+logger = logging.getLogger(__name__)
+
+
+def ws_uri(web3, uri=None):
+    if uri is None:
+        uri = getattr(web3.provider, "endpoint_uri", None)
+    if not uri or not str(uri).startswith("ws"):
+        raise ValueError("Live mode needs a websocket endpoint")
+    return str(uri)
+
+
+class SeasonAggregate:
+    """One season's running totals"""
+
+    def __init__(self, name, address, model):
+        self.name = name
+        self.address = address
+        self.model = model
+        self.bootstrapped = False
+        self.snapshot_taken = False
+        self.total_points = 0
+        self.reward_eth = 0
+        self.reward_ogn = 0
+        self.claimed_eth = 0
+        self.claimed_ogn = 0
+        # Points from the latest Stake/Unstake of every user with a record
+        self.board = Leaderboard()
+        # Points `_initMemUser` would give stakers without a record
+        self.rollover = Leaderboard()
+
+    @property
+    def stakers(self):
+        return len(self.board)
+
+    def set_points(self, user, points):
+        return self.board.update(user, points)
+
+    def view(self):
+        return RolloverView(self.board, self.rollover)
+
+    def top(self, k=DEFAULT_TOP):
+        return self.board.top(k)
+
+    def summary(self, k=DEFAULT_TOP):
+        return {
+            "total_points": self.total_points,
+            "stakers": self.stakers,
+            "rollover_stakers": len(self.rollover),
+            "top": self.top(k),
+            "bootstrapped": self.bootstrapped,
+            "snapshot_taken": self.snapshot_taken,
+            "reward_eth": self.reward_eth,
+            "reward_ogn": self.reward_ogn,
+            "claimed_eth": self.claimed_eth,
+            "claimed_ogn": self.claimed_ogn,
+        }
+
+
+class LiveStaking:
+    def __init__(
+        self,
+        contracts,
+        uri=None,
+        seasons=None,
+        indexer=None,
+        blocks=None,
+        pager=None,
+        multicall=None,
+    ):
+        """
+        `seasons` defaults to every season whose claim period hasn't ended.
+        """
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.uri = ws_uri(self.web3, uri)
+        self.indexer = indexer
+        self.blocks = blocks or BlockTimeIndex.for_contracts(contracts)
+        self.pager = pager or LogPager(self.web3)
+        self.multicall = multicall or Multicall(self.web3)
+        self.series = contracts.contract("series")
+        self.vault = contracts.contract("vault")
+        self.ogn = to_checksum_address(contracts.address("ogn"))
+
+        if seasons is None:
+            now = self.web3.eth.get_block("latest")["timestamp"]
+            seasons = [
+                name
+                for name in contracts.seasons()
+                if season_model(contracts, name).claim_end_time > now
+            ]
+        self.seasons = {}
+        self.topics = {}
+        for name in seasons:
+            season = contracts.contract(name)
+            aggregate = SeasonAggregate(
+                name, season.address, season_model(contracts, name)
+            )
+            self.seasons[season.address] = aggregate
+            self.topics[season.address] = event_topics(season, SEASON_EVENTS)
+        self.topics[self.vault.address] = event_topics(self.vault, ("RewardsSent",))
+
+        # Series state: user -> (staked OGN, latest stake time), and the sum
+        self.balances = {}
+        self.supply = 0
+        # Stake amount counted per (transaction, user); a pre-stake emits
+        # Stake on two seasons for one Series stake
+        self.stakes = {}
+
+        self.block = None
+        self.timestamps = {}
+        # (block hash, log index) -> (block number, undo record)
+        self.journal = {}
+        self.removed = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.loop = None
+        self.task = None
+        self.stopping = False
+
+    def by_name(self, name):
+        return next(a for a in self.seasons.values() if a.name == name)
+
+    def claim_season(self, timestamp):
+        for aggregate in self.seasons.values():
+            model = aggregate.model
+            if model.end_time <= timestamp < model.claim_end_time:
+                return aggregate
+        return None
+
+    def timestamp(self, block):
+        if block in self.timestamps:
+            return self.timestamps[block]
+        return self.blocks.timestamp(block)
+
+    def add_head(self, head):
+        self.timestamps[int(head["number"])] = int(head["timestamp"])
+        while len(self.timestamps) > REORG_WINDOW:
+            del self.timestamps[min(self.timestamps)]
+
+    def _read_state(self, aggregate, block):
+        season = self.contracts.contract(aggregate.name)
+        bootstrapped, snapshot_taken, total_points = season.functions.season().call(
+            block_identifier=block
+        )
+        reward_eth, reward_ogn = season.functions.snapshot().call(
+            block_identifier=block
+        )
+        aggregate.bootstrapped = bootstrapped
+        aggregate.snapshot_taken = snapshot_taken
+        aggregate.total_points = total_points
+        aggregate.reward_eth = reward_eth
+        aggregate.reward_ogn = reward_ogn
+
+    def _read_balances(self, addresses, block):
+        calls = [call(self.series, "totalSupply")]
+        for address in addresses:
+            calls.append(call(self.series, "balanceOf", address))
+            calls.append(call(self.series, "latestStakeTime", address))
+        results = self.multicall(calls, block=block)
+        self.supply = results[0]
+        self.balances = {
+            address: (balance, latest)
+            for address, balance, latest in zip(addresses, results[1::2], results[2::2])
+            if balance
+        }
+
+    def seed(self, block="latest"):
+        """Rebuild all aggregates as of `block`"""
+        block = self.web3.eth.get_block(block)["number"]
+        indexer = self.indexer or EventIndexer(self.contracts)
+        try:
+            # The index is shared; never sync it back to an older block
+            if indexer.indexed_block() < block:
+                indexer.sync()
+            with self.lock:
+                self._read_balances(stakers(indexer, block), block)
+                for aggregate in self.seasons.values():
+                    aggregate.board = Leaderboard()
+                    aggregate.rollover = Leaderboard()
+                    aggregate.claimed_eth = aggregate.claimed_ogn = 0
+                    for event in indexer.events(aggregate.name, to_block=block):
+                        aggregate.board.apply(event)
+                    self._read_state(aggregate, block)
+                    for user in self.balances:
+                        self._update_rollover(aggregate, user)
+
+                for event in indexer.events("vault", "RewardsSent", to_block=block):
+                    self._claimed(
+                        self.blocks.timestamp(event["block_number"]),
+                        to_checksum_address(event["args"]["asset"]),
+                        int(event["args"]["amount"]),
+                    )
+        finally:
+            if self.indexer is None:
+                indexer.close()
+
+        self.block = block
+        self.stakes = {}
+        self.journal = {}
+        self.removed = []
+        return block
+
+    def _update_rollover(self, aggregate, user):
+        """Recompute a user's rollover points in a season they have no record in"""
+        if user in aggregate.board:
+            aggregate.rollover.remove(user)
+            return
+        balance, latest = self.balances.get(user, (0, 0))
+        points = int(aggregate.model.rollover_points([balance], [latest])[0])
+        if points:
+            aggregate.rollover.update(user, points)
+        else:
+            aggregate.rollover.remove(user)
+
+    def _balance_changed(self, user):
+        # Bootstrapped seasons see every balance change of their users as
+        # their own Stake/Unstake, so only the others follow the Series
+        for aggregate in self.seasons.values():
+            if not aggregate.bootstrapped:
+                self._update_rollover(aggregate, user)
+
+    def _set_balance(self, user, balance, latest):
+        old_balance, old_latest = self.balances.get(user, (0, 0))
+        if balance:
+            self.balances[user] = (balance, latest)
+        else:
+            self.balances.pop(user, None)
+        self.supply += balance - old_balance
+        self._balance_changed(user)
+        return old_balance, old_latest
+
+    def total_points(self, aggregate, timestamp=None):
+        """`getTotalPoints()`, derived from the Series supply if not bootstrapped"""
+        if aggregate.bootstrapped:
+            return aggregate.total_points
+        if timestamp is None:
+            timestamp = self.timestamp(self.block)
+        if timestamp < aggregate.model.start_time:
+            return 0
+        return int(
+            aggregate.model.points_in_time([self.supply], aggregate.model.start_time)[0]
+        )
+
+    def _claimed(self, timestamp, asset, amount):
+        aggregate = self.claim_season(timestamp)
+        if aggregate is None:
+            return None
+        if asset == ETH_ADDRESS:
+            aggregate.claimed_eth += amount
+        elif asset == self.ogn:
+            aggregate.claimed_ogn += amount
+        return aggregate
+
+    def log_filters(self):
+        """Season and vault events, and OGN the Series sends back on unstake"""
+        return [
+            {
+                "address": list(self.topics),
+                "topics": [
+                    sorted({t for topics in self.topics.values() for t in topics})
+                ],
+            },
+            {
+                "address": self.ogn,
+                "topics": [TRANSFER_TOPIC, address_topic(self.series.address)],
+            },
+        ]
+
+    def _decode(self, log):
+        address = to_checksum_address(log["address"])
+        topic = hex_str(log["topics"][0]) if log["topics"] else None
+        if address == self.ogn:
+            if topic != TRANSFER_TOPIC or len(log["topics"]) != 3:
+                return address, None
+            # Transfer(from, to, value) out of the Series
+            return address, {
+                "event": "Transfer",
+                "args": {
+                    "to": to_checksum_address(hex_str(log["topics"][2])[-40:]),
+                    "value": int(hex_str(log["data"]), 16),
+                },
+            }
+        topics = self.topics.get(address)
+        if topics is None or topic not in topics:
+            return address, None
+        return address, topics[topic]().process_log(log)
+
+    def apply(self, log):
+        """Apply one log.  Returns the event name, or None if skipped."""
+        address, decoded = self._decode(log)
+        if decoded is None:
+            return None
+
+        key = (hex_str(log["blockHash"]), log["logIndex"])
+        with self.lock:
+            if log.get("removed"):
+                self.removed.append(log)
+                return "removed"
+            self._undo_removed()
+            if key in self.journal:
+                return None
+
+            name = decoded["event"]
+            args = decoded["args"]
+            block = log["blockNumber"]
+            tx = hex_str(log["transactionHash"])
+
+            if address == self.ogn:
+                undo = self._series_unstake(args)
+            elif address == self.vault.address:
+                asset = to_checksum_address(args["asset"])
+                amount = int(args["amount"])
+                aggregate = self._claimed(self.timestamp(block), asset, amount)
+                undo = ("claimed", aggregate, asset, amount)
+            else:
+                undo = self._season_event(self.seasons[address], name, args, block, tx)
+
+            self.journal[key] = (block, undo)
+            self.block = max(self.block or 0, block)
+            return name
+
+    def _series_unstake(self, args):
+        user = args["to"]
+        if user not in self.balances:
+            return None
+        balance, latest = self.balances[user]
+        # `unstake` returns the user's whole stake
+        remaining = max(balance - int(args["value"]), 0)
+        return ("series", user) + self._set_balance(user, remaining, latest)
+
+    def _season_event(self, aggregate, name, args, block, tx):
+        if name == "Finale":
+            undo = (
+                "finale",
+                aggregate,
+                aggregate.snapshot_taken,
+                aggregate.reward_eth,
+                aggregate.reward_ogn,
+            )
+            aggregate.snapshot_taken = True
+            aggregate.reward_eth = int(args["totalRewardETH"])
+            aggregate.reward_ogn = int(args["totalRewardOGN"])
+            return undo
+
+        user = args["userAddress"]
+        timestamp = self.timestamp(block)
+        had_record = user in aggregate.board
+        rolled = aggregate.rollover.points.get(user, 0)
+        bootstrapped = aggregate.bootstrapped
+        before = aggregate.total_points
+        series = None
+
+        if name == "Stake":
+            amount = int(args["amount"])
+            counted = self.stakes.get((tx, user))
+            if counted is None:
+                self.stakes[(tx, user)] = (block, amount)
+                balance, _ = self.balances.get(user, (0, 0))
+                series = self._set_balance(user, balance + amount, timestamp)
+            if not bootstrapped:
+                # Bootstrapped with the supply from before this transaction
+                supply = self.supply - self.stakes[(tx, user)][1]
+                aggregate.total_points = int(
+                    aggregate.model.points_in_time(
+                        [supply], aggregate.model.start_time
+                    )[0]
+                )
+                aggregate.bootstrapped = True
+            aggregate.total_points += int(
+                aggregate.model.points_in_time([amount], timestamp)[0]
+            )
+            old = aggregate.set_points(user, int(args["points"]))
+        else:
+            old = aggregate.set_points(user, 0)
+            if timestamp < aggregate.model.end_time and bootstrapped:
+                aggregate.total_points -= old if had_record else rolled
+        aggregate.rollover.remove(user)
+
+        return (
+            "season",
+            aggregate,
+            user,
+            old if had_record else None,
+            rolled,
+            bootstrapped,
+            aggregate.total_points - before,
+            (tx, user, series) if series is not None else None,
+        )
+
+    def _undo(self, undo):
+        kind = undo[0] if undo else None
+        if kind == "claimed":
+            _, aggregate, asset, amount = undo
+            if aggregate is not None:
+                if asset == ETH_ADDRESS:
+                    aggregate.claimed_eth -= amount
+                elif asset == self.ogn:
+                    aggregate.claimed_ogn -= amount
+        elif kind == "series":
+            _, user, balance, latest = undo
+            self._set_balance(user, balance, latest)
+        elif kind == "finale":
+            _, aggregate, taken, eth, ogn = undo
+            aggregate.snapshot_taken = taken
+            aggregate.reward_eth = eth
+            aggregate.reward_ogn = ogn
+        elif kind == "season":
+            _, aggregate, user, old, rolled, bootstrapped, delta, series = undo
+            aggregate.total_points -= delta
+            aggregate.bootstrapped = bootstrapped
+            if old is None:
+                aggregate.board.remove(user)
+            else:
+                aggregate.board.update(user, old)
+            if rolled:
+                aggregate.rollover.update(user, rolled)
+            if series is not None:
+                tx, user, (balance, latest) = series
+                self.stakes.pop((tx, user), None)
+                self._set_balance(user, balance, latest)
+
+    def _undo_removed(self):
+        """Undo logs removed by a reorg, newest first"""
+        if not self.removed:
+            return
+        removed = sorted(
+            self.removed, key=lambda log: (log["blockNumber"], log["logIndex"])
+        )
+        self.removed = []
+        for log in reversed(removed):
+            entry = self.journal.pop((hex_str(log["blockHash"]), log["logIndex"]), None)
+            if entry is not None:
+                self._undo(entry[1])
+        self.block = min(self.block, removed[0]["blockNumber"] - 1)
+
+    def _prune(self):
+        oldest = self.block - REORG_WINDOW
+        self.journal = {k: v for k, v in self.journal.items() if v[0] > oldest}
+        self.stakes = {k: v for k, v in self.stakes.items() if v[0] > oldest}
+
+    def on_head(self, head):
+        with self.lock:
+            self._undo_removed()
+            self.add_head(head)
+            self.block = max(self.block, int(head["number"]))
+            if len(self.journal) > REORG_WINDOW:
+                self._prune()
+
+    def backfill(self, to_block="latest"):
+        """Apply logs between the last applied block and `to_block`"""
+        head = self.web3.eth.get_block(to_block)["number"]
+        logs = []
+        for params in self.log_filters():
+            logs += self.pager.iter_logs(params, self.block + 1, head)
+        logs.sort(key=lambda log: (log["blockNumber"], log["logIndex"]))
+        applied = sum(self.apply(log) is not None for log in logs)
+        with self.lock:
+            self.block = max(self.block, head)
+        return applied
+
+    async def _follow(self, w3, loop):
+        heads = await w3.eth.subscribe("newHeads")
+        for params in self.log_filters():
+            await w3.eth.subscribe("logs", params)
+        # Anything mined while (re)connecting; RPCs run off the loop so the
+        # websocket keeps being read
+        await loop.run_in_executor(None, self.backfill)
+        async for message in w3.ws.process_subscriptions():
+            result = message["result"]
+            if message["subscription"] == heads:
+                self.on_head(result)
+            else:
+                await loop.run_in_executor(None, self.apply, result)
+
+    async def run(self):
+        """Subscribe and apply events until stopped, reconnecting as needed"""
+        loop = asyncio.get_running_loop()
+        if self.block is None:
+            await loop.run_in_executor(None, self.seed)
+        while not self.stopping:
+            provider = WebsocketProviderV2(self.uri)
+            try:
+                await self._follow(await AsyncWeb3.persistent_websocket(provider), loop)
+            except RECONNECT_ERRORS as exc:
+                if self.stopping:
+                    return
+                logger.warning("Live subscription lost (%r), reconnecting", exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await provider.disconnect()
+
+    def _run_thread(self):
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Live subscription stopped")
+            raise
+        finally:
+            self.loop.close()
+
+    def start(self):
+        """Run the subscription on a background thread"""
+        if self.thread is not None and self.thread.is_alive():
+            return self.thread
+        self.seed()
+        self.stopping = False
+        self.loop = asyncio.new_event_loop()
+        self.task = self.loop.create_task(self.run())
+        self.thread = threading.Thread(target=self._run_thread, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self, timeout=None):
+        """Cancel the subscription, disconnect and wait for the thread"""
+        self.stopping = True
+        if self.thread is None or not self.thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.task.cancel)
+        self.thread.join(timeout)
+
+    def summary(self, k=DEFAULT_TOP):
+        """Current aggregates per season name"""
+        with self.lock:
+            self._undo_removed()
+            timestamp = self.timestamp(self.block)
+            result = {}
+            for aggregate in self.seasons.values():
+                result[aggregate.name] = aggregate.summary(k)
+                result[aggregate.name]["total_points"] = self.total_points(
+                    aggregate, timestamp
+                )
+            result["block"] = self.block
+            result["series_total_supply"] = self.supply
+            return result
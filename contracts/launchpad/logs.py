@@ -0,0 +1,161 @@
+"""
+Adaptive, concurrent `eth_getLogs` paging.
+
+Block ranges are sized from the log density seen so far: they grow across
+sparse stretches and shrink around dense ones.  A range the provider rejects
+for returning too much (or timing out) is split in half and retried.
+Several ranges are kept in flight at once, but logs are always yielded in
+chain order.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from eth_utils import encode_hex, event_abi_to_log_topic
+from requests.exceptions import Timeout
+
+# Provider messages meaning "ask for a smaller range"
+RANGE_ERRORS = (
+    "query returned more than",  # geth, Infura
+    "log response size exceeded",  # Alchemy
+    "response size should not greater than",  # Ankr
+    "block range is too wide",
+    "block range is too large",
+    "block range too large",
+    "exceed maximum block range",  # BSC
+    "blocks range",  # QuickNode
+    "query timeout exceeded",  # geth
+)
+
+# EIP-1474 "Limit exceeded"
+LIMIT_EXCEEDED = -32005
+
+DEFAULT_INITIAL_RANGE = 2000
+DEFAULT_MAX_RANGE = 500000
+DEFAULT_TARGET_LOGS = 2000
+
+# Weight of the newest observation in the density average
+DENSITY_SMOOTHING = 0.5
+
+
+def is_range_error(exc):
+    if isinstance(exc, Timeout):
+        return True
+    error = exc.args[0] if exc.args else None
+    if isinstance(error, dict):
+        if error.get("code") == LIMIT_EXCEEDED:
+            return True
+        message = str(error.get("message", ""))
+    else:
+        message = str(exc)
+    message = message.lower()
+    return any(fragment in message for fragment in RANGE_ERRORS)
+
+
+def event_topics(contract, event_names):
+    """topic0 -> event class for the named events of `contract`"""
+    topics = {}
+    for abi in contract.abi:
+        if abi["type"] == "event" and abi["name"] in event_names:
+            topic = encode_hex(event_abi_to_log_topic(abi))
+            topics[topic] = contract.events[abi["name"]]
+    return topics
+
+
+class LogPager:
+    def __init__(
+        self,
+        web3,
+        initial_range=DEFAULT_INITIAL_RANGE,
+        max_range=DEFAULT_MAX_RANGE,
+        target_logs=DEFAULT_TARGET_LOGS,
+        max_workers=4,
+    ):
+        self.web3 = web3
+        self.range_size = initial_range
+        self.max_range = max_range
+        self.target_logs = target_logs
+        self.max_workers = max_workers
+        self.density = None
+        self.requests = 0
+        self.splits = 0
+
+    def _fetch(self, params, start, end):
+        return self.web3.eth.get_logs(dict(params, fromBlock=start, toBlock=end))
+
+    def _observe(self, blocks, count):
+        """Resize the next range from the logs-per-block just seen"""
+        self.requests += 1
+        density = count / blocks
+        if self.density is None:
+            self.density = density
+        else:
+            self.density = (
+                DENSITY_SMOOTHING * density + (1 - DENSITY_SMOOTHING) * self.density
+            )
+
+        if self.density > 0:
+            wanted = int(self.target_logs / self.density)
+        else:
+            wanted = self.max_range
+
+        # Grow at most 2x per step so a sparse patch doesn't overshoot
+        self.range_size = max(1, min(wanted, self.range_size * 2, self.max_range))
+
+    def iter_logs(self, params, from_block, to_block):
+        """Yield logs matching `params` between the given blocks, in order"""
+        pending = {}
+        ready = {}
+        next_start = from_block
+        emit_from = from_block
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+
+            def submit(start, end):
+                pending[start] = (end, pool.submit(self._fetch, params, start, end))
+
+            while emit_from <= to_block:
+                while len(pending) < self.max_workers and next_start <= to_block:
+                    end = min(next_start + self.range_size - 1, to_block)
+                    submit(next_start, end)
+                    next_start = end + 1
+
+                wait([f for _, f in pending.values()], return_when=FIRST_COMPLETED)
+
+                for start, (end, future) in list(pending.items()):
+                    if not future.done():
+                        continue
+                    del pending[start]
+
+                    try:
+                        logs = future.result()
+                    except Exception as exc:
+                        if start == end or not is_range_error(exc):
+                            raise
+
+                        mid = (start + end) // 2
+                        self.splits += 1
+                        self.range_size = max(1, min(self.range_size, mid - start + 1))
+                        submit(start, mid)
+                        submit(mid + 1, end)
+                        continue
+
+                    self._observe(end - start + 1, len(logs))
+                    ready[start] = (end, logs)
+
+                while emit_from in ready:
+                    end, logs = ready.pop(emit_from)
+                    yield from logs
+                    emit_from = end + 1
+
+    def get_logs(self, params, from_block, to_block):
+        return list(self.iter_logs(params, from_block, to_block))
+
+
+def iter_events(contract, event_names, from_block, to_block, pager=None):
+    """Yield decoded `event_names` events of a (console) contract, in order"""
+    pager = pager or LogPager(contract.w3)
+    topics = event_topics(contract, event_names)
+    params = {"address": contract.address, "topics": [list(topics)]}
+
+    for log in pager.iter_logs(params, from_block, to_block):
+        yield topics[encode_hex(log["topics"][0])]().process_log(log)
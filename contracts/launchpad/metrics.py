@@ -0,0 +1,210 @@
+"""
+Daily staking metrics.
+
+For every completed UTC day since the Series was deployed, the state at the
+day's last block is read in a single Multicall: `Series.totalSupply`, each
+season's `getTotalPoints`, and the vault's ETH and OGN balances.  Days are
+mapped to blocks through the BlockTimeIndex and read concurrently.  Results
+are stored in SQLite, so a re-run only reads the days added since.  A read
+that fails is not stored, so the next run retries it; a season's points
+before the season was deployed are stored as NULL, since there is nothing
+to read.  A season without a deployment record (mainnet's season one)
+gets its deploy block from a binary search on its code.
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .blocktime import BlockTimeIndex
+from .multicall import Multicall, call, eth_balance_call
+from .points import ONE_DAY
+from .positions import SEASON_CALL_GAS
+from .registry import CACHE_DIR
+
+DEFAULT_WORKERS = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    day INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    value TEXT,
+    PRIMARY KEY (day, metric)
+);
+"""
+
+
+def metric_calls(contracts, multicall, seasons):
+    """(metric name, Call) pairs read for every day"""
+    vault = contracts.address("vault")
+    ogn = contracts.contract("ogn")
+    calls = [
+        ("series_total_supply", call(contracts.contract("series"), "totalSupply")),
+        ("vault_eth", eth_balance_call(multicall.address, vault)),
+        ("vault_ogn", call(ogn, "balanceOf", vault)),
+    ]
+    for name in seasons:
+        season = contracts.contract(name)
+        calls.append(
+            (
+                f"{name}_total_points",
+                call(season, "getTotalPoints", gas=SEASON_CALL_GAS),
+            )
+        )
+    return calls
+
+
+def first_code_block(web3, address, block="latest"):
+    """First block at which `address` has code, searching up to `block`"""
+    low, high = 0, web3.eth.get_block(block)["number"]
+    if not web3.eth.get_code(address, high):
+        return None
+    while low < high:
+        mid = (low + high) // 2
+        if web3.eth.get_code(address, mid):
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def day_label(day):
+    return datetime.fromtimestamp(day, tz=timezone.utc).date().isoformat()
+
+
+class DailyMetrics:
+    def __init__(
+        self,
+        contracts,
+        path=None,
+        blocks=None,
+        multicall=None,
+        max_workers=DEFAULT_WORKERS,
+    ):
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.blocks = blocks or BlockTimeIndex.for_contracts(contracts)
+        self.multicall = multicall or Multicall(self.web3)
+        self.max_workers = max_workers
+        self.seasons = contracts.seasons()
+        self._since = None
+
+        if path is None:
+            path = Path(CACHE_DIR) / f"{contracts.network}-metrics.sqlite"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    @property
+    def since(self):
+        """Metric -> the block it exists from, for those that start later"""
+        if self._since is None:
+            since = {}
+            for name in self.seasons:
+                block = self.contracts.deploy_block(name)
+                if block is None:
+                    address = self.contracts.address(name)
+                    block = first_code_block(self.web3, address) or 0
+                since[f"{name}_total_points"] = block
+            self._since = since
+        return self._since
+
+    def first_day(self):
+        block = self.contracts.deploy_block("series") or 0
+        timestamp = self.blocks.timestamp(block)
+        return timestamp - timestamp % ONE_DAY
+
+    def completed_days(self):
+        """Start timestamps of every finished UTC day since deployment"""
+        head = self.blocks.refresh_head()
+        today = self.blocks.timestamp(head)
+        today -= today % ONE_DAY
+        return list(range(self.first_day(), today, ONE_DAY))
+
+    def known(self, metrics):
+        """Days for which all `metrics` are stored"""
+        rows = self.db.execute(
+            "SELECT day, COUNT(*) FROM metrics WHERE metric IN (%s) GROUP BY day"
+            % ",".join("?" * len(metrics)),
+            metrics,
+        ).fetchall()
+        return {day for day, count in rows if count == len(metrics)}
+
+    def _compute(self, day, calls):
+        block = self.blocks.block_before(day + ONE_DAY - 1)
+        results = self.multicall([c for _, c in calls], block=block)
+        rows = []
+        for (metric, _), value in zip(calls, results):
+            if value is not None:
+                rows.append((day, metric, block, str(value)))
+            elif block < self.since.get(metric, 0):
+                rows.append((day, metric, block, None))
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?)", rows
+            )
+        return day
+
+    def update(self, progress=None):
+        """Compute and store any missing days.  Returns how many were added."""
+        calls = metric_calls(self.contracts, self.multicall, self.seasons)
+        # Resolved once, before the workers read it
+        self.since
+        known = self.known([metric for metric, _ in calls])
+        missing = [day for day in self.completed_days() if day not in known]
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for _ in pool.map(lambda day: self._compute(day, calls), missing):
+                done += 1
+                if progress:
+                    progress(done, len(missing))
+        return done
+
+    def series(self, from_day=None, to_day=None):
+        """
+        Stored metrics as columns: `day` (ISO date), `block` and one column
+        per metric, in day order.  Missing values are None.
+        """
+        query = "SELECT day, metric, block, value FROM metrics WHERE 1 = 1"
+        params = []
+        if from_day is not None:
+            query += " AND day >= ?"
+            params.append(from_day)
+        if to_day is not None:
+            query += " AND day <= ?"
+            params.append(to_day)
+        query += " ORDER BY day"
+
+        by_day = {}
+        names = []
+        for day, metric, block, value in self.db.execute(query, params):
+            row = by_day.setdefault(day, {"block": block})
+            row[metric] = None if value is None else int(value)
+            if metric not in names:
+                names.append(metric)
+
+        columns = {"day": [day_label(d) for d in by_day], "block": []}
+        columns.update({name: [] for name in names})
+        for row in by_day.values():
+            columns["block"].append(row["block"])
+            for name in names:
+                columns[name].append(row.get(name))
+        return columns
+
+    def close(self):
+        self.db.close()
+
+
+def daily_metrics(contracts, **kwargs):
+    """Bring the stored daily metrics up to date and return them"""
+    metrics = DailyMetrics(contracts, **kwargs)
+    try:
+        metrics.update()
+        return metrics.series()
+    finally:
+        metrics.close()
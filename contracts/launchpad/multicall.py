@@ -0,0 +1,195 @@
+"""
+Batched contract reads through Multicall3's `aggregate3`.
+
+Calls are packed into chunks that fit an `eth_call` gas budget derived from
+the block gas limit, and chunks are sent concurrently.  Every chunk is pinned
+to the same block so results are consistent with each other.  On a node
+without Multicall3 (a local hardhat node) the calls are made one by one
+instead, still pinned to one block.
+
+Reads Multicall3 can't make, like `eth_getCode`, go through `batch_rpc`:
+many JSON-RPC requests in one HTTP round trip.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from eth_abi import decode, encode
+from eth_utils import decode_hex, function_signature_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3.exceptions import ContractLogicError
+
+# Same address on mainnet, goerli and most other chains
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3 = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+GET_ETH_BALANCE = function_signature_to_4byte_selector("getEthBalance(address)")
+
+# Rough gas cost of a simple view call, including Multicall3's own overhead
+DEFAULT_CALL_GAS = 30000
+
+# Portion of the block gas limit to use for a single eth_call
+GAS_LIMIT_SHARE = 0.8
+
+# Requests per JSON-RPC batch; providers cap batches at 100 to 1000
+DEFAULT_BATCH_SIZE = 100
+
+Call = namedtuple("Call", ["target", "data", "output_types", "gas"])
+
+
+def call(contract, fn_name, *args, gas=DEFAULT_CALL_GAS):
+    """Build a Call for `contract.fn_name(*args)`"""
+    fn = contract.functions[fn_name](*args)
+    output_types = [collapse_if_tuple(o) for o in fn.abi["outputs"]]
+    data = decode_hex(contract.encodeABI(fn_name=fn_name, args=args))
+    return Call(contract.address, data, output_types, gas)
+
+
+def eth_balance_call(multicall_address, address, gas=DEFAULT_CALL_GAS):
+    """Build a Call reading an account's ETH balance via Multicall3"""
+    data = GET_ETH_BALANCE + encode(["address"], [address])
+    return Call(multicall_address, data, ["uint256"], gas)
+
+
+def batch_rpc(web3, method, params, size=DEFAULT_BATCH_SIZE, max_workers=8):
+    """
+    Results of `method` called with each entry of `params`, in order.  Over
+    HTTP the requests are sent as JSON-RPC batches of `size`, concurrently;
+    other providers get one request per entry.
+    """
+    params = list(params)
+    uri = str(getattr(web3.provider, "endpoint_uri", None) or "")
+    if not uri.startswith("http"):
+        return [web3.manager.request_blocking(method, p) for p in params]
+
+    # web3's own default timeout, unless the provider sets one
+    kwargs = {"timeout": 10, **web3.provider.get_request_kwargs()}
+
+    def send(chunk):
+        body = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": p}
+            for i, p in enumerate(chunk)
+        ]
+        response = requests.post(uri, json=body, **kwargs)
+        response.raise_for_status()
+        replies = {reply["id"]: reply for reply in response.json()}
+        results = []
+        for i in range(len(chunk)):
+            reply = replies[i]
+            if "error" in reply:
+                raise ValueError(reply["error"])
+            results.append(reply["result"])
+        return results
+
+    chunks = [params[i : i + size] for i in range(0, len(params), size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return [result for results in pool.map(send, chunks) for result in results]
+
+
+def _unwrap(values):
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+class Multicall:
+    def __init__(self, web3, address=MULTICALL3, gas_limit=None, max_workers=8):
+        self.web3 = web3
+        self.address = web3.to_checksum_address(address)
+        self.max_workers = max_workers
+        self._gas_limit = gas_limit
+        self._deployed = None
+
+    @property
+    def gas_limit(self):
+        if self._gas_limit is None:
+            block_limit = self.web3.eth.get_block("latest")["gasLimit"]
+            self._gas_limit = int(block_limit * GAS_LIMIT_SHARE)
+        return self._gas_limit
+
+    def chunk(self, calls):
+        """Split calls into groups whose estimated gas fits the budget"""
+        chunks = []
+        current = []
+        used = 0
+
+        for c in calls:
+            if current and used + c.gas > self.gas_limit:
+                chunks.append(current)
+                current = []
+                used = 0
+            current.append(c)
+            used += c.gas
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    @property
+    def deployed(self):
+        if self._deployed is None:
+            self._deployed = bool(self.web3.eth.get_code(self.address))
+        return self._deployed
+
+    def resolve_block(self, block):
+        if block is None or isinstance(block, str):
+            return self.web3.eth.get_block(block or "latest")["number"]
+        return block
+
+    def _direct(self, c, block):
+        if c.target == self.address and c.data[:4] == GET_ETH_BALANCE:
+            (address,) = decode(["address"], c.data[4:])
+            return self.web3.eth.get_balance(address, block)
+        try:
+            ret = self.web3.eth.call(
+                {"to": c.target, "data": c.data}, block_identifier=block
+            )
+        except ContractLogicError:
+            # Reverted, as a failed aggregate3 call; RPC errors still raise
+            return None
+        if c.output_types and not ret:
+            return None
+        return _unwrap(decode(c.output_types, ret))
+
+    def _aggregate(self, calls, block):
+        if not self.deployed:
+            return [self._direct(c, block) for c in calls]
+
+        data = AGGREGATE3 + encode(
+            ["(address,bool,bytes)[]"],
+            [[(c.target, True, c.data) for c in calls]],
+        )
+        raw = self.web3.eth.call(
+            {"to": self.address, "data": data, "gas": self.gas_limit},
+            block_identifier=block,
+        )
+        (results,) = decode(["(bool,bytes)[]"], raw)
+
+        decoded = []
+        for c, (success, ret) in zip(calls, results):
+            if not success or (c.output_types and not ret):
+                decoded.append(None)
+            else:
+                decoded.append(_unwrap(decode(c.output_types, ret)))
+        return decoded
+
+    def __call__(self, calls, block="latest"):
+        """
+        Execute calls at `block` and return their decoded results in order.
+        Failed calls come back as None.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+
+        block = self.resolve_block(block)
+        chunks = self.chunk(calls)
+
+        if len(chunks) == 1:
+            return self._aggregate(chunks[0], block)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for chunk_results in pool.map(lambda c: self._aggregate(c, block), chunks):
+                results.extend(chunk_results)
+        return results
@@ -0,0 +1,258 @@
+"""
+Range-compressed token ownership for OriginERC721a_v3 collections.
+
+ERC721A mints tokens in consecutive runs starting at `_startTokenId()` (1
+for OriginERC721a_v3), so ownership is stored as runs: `starts[i]` is the
+first token of run i, which lasts until the next run starts, and
+`owners[i]` is an interned owner id.  A transfer only splits the run it
+lands in, and neighbouring runs with the same owner are merged again, so a
+collection that has seen little trading stays a handful of runs no matter
+its supply.  Runs are kept in compact `array`s and bisected; holder counts
+are a single `np.bincount` over run lengths.
+
+Owners are interned as checksummed addresses, or with `raw=True` as their
+20 raw bytes, checksummed only on output.
+"""
+
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+from eth_utils import decode_hex, to_checksum_address
+
+from .indexer import DEFAULT_CONFIRMATIONS
+from .logs import LogPager
+from .vouchers import TRANSFER_TOPIC
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+ZERO_RAW = bytes(20)
+
+# OriginERC721a_v3._startTokenId()
+START_TOKEN_ID = 1
+
+
+class RangeOwnership:
+    def __init__(self, start_token_id=START_TOKEN_ID, raw=False):
+        self.start_token_id = start_token_id
+        self.raw = raw
+        # One past the highest token seen
+        self.end = start_token_id
+        self.starts = array("Q")
+        self.owners = array("I")
+        # Owner id 0 is the zero address: unminted or burned
+        zero = ZERO_RAW if raw else ZERO_ADDRESS
+        self.addresses = [zero]
+        self.ids = {zero: 0}
+
+    def __len__(self):
+        """Number of runs"""
+        return len(self.starts)
+
+    def _key(self, address):
+        if not self.raw:
+            return to_checksum_address(address)
+        return decode_hex(address) if isinstance(address, str) else bytes(address)
+
+    def address(self, owner):
+        """Checksummed address of an owner id"""
+        address = self.addresses[owner]
+        return to_checksum_address(address) if self.raw else address
+
+    def intern(self, address):
+        address = self._key(address)
+        owner = self.ids.get(address)
+        if owner is None:
+            owner = self.ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return owner
+
+    def _run(self, token_id):
+        return bisect_right(self.starts, token_id) - 1
+
+    def _run_end(self, i):
+        return self.starts[i + 1] if i + 1 < len(self.starts) else self.end
+
+    def set_owner(self, token_id, address):
+        """Record that `token_id` now belongs to `address`"""
+        owner = self.intern(address)
+
+        if token_id >= self.end:
+            if token_id > self.end:
+                self._append(self.end, 0)
+            self._append(token_id, owner)
+            self.end = token_id + 1
+            return
+
+        i = self._run(token_id)
+        if i < 0:
+            raise ValueError(f"Token {token_id} is before the first token")
+        old = self.owners[i]
+        if old == owner:
+            return
+
+        run_start = self.starts[i]
+        run_end = self._run_end(i)
+        starts = array("Q")
+        owners = array("I")
+        if run_start < token_id:
+            starts.append(run_start)
+            owners.append(old)
+        j = i + len(starts)
+        starts.append(token_id)
+        owners.append(owner)
+        if token_id + 1 < run_end:
+            starts.append(token_id + 1)
+            owners.append(old)
+        self.starts[i : i + 1] = starts
+        self.owners[i : i + 1] = owners
+
+        # Merge with equal neighbours
+        if j + 1 < len(self.owners) and self.owners[j + 1] == owner:
+            del self.starts[j + 1]
+            del self.owners[j + 1]
+        if j > 0 and self.owners[j - 1] == owner:
+            del self.starts[j]
+            del self.owners[j]
+
+    def _append(self, start, owner):
+        if self.owners and self.owners[-1] == owner:
+            return
+        self.starts.append(start)
+        self.owners.append(owner)
+
+    def owner_of(self, token_id):
+        """Owner of `token_id`, or the zero address if it was never minted"""
+        if token_id >= self.end or token_id < self.start_token_id:
+            return ZERO_ADDRESS
+        return self.address(self.owners[self._run(token_id)])
+
+    def _lengths(self):
+        starts = np.frombuffer(self.starts, dtype=np.uint64).astype(np.int64)
+        ends = np.append(starts[1:], self.end)
+        return ends - starts
+
+    def counts(self):
+        """Tokens held per owner id (index 0 is unminted/burned)"""
+        if not self.starts:
+            return np.zeros(len(self.addresses), dtype=np.int64)
+        return np.bincount(
+            np.frombuffer(self.owners, dtype=np.uint32),
+            weights=self._lengths(),
+            minlength=len(self.addresses),
+        ).astype(np.int64)
+
+    def held(self):
+        """(token ids, owner ids) of every held token, in token order"""
+        if not self.starts:
+            return np.zeros(0, np.uint64), np.zeros(0, np.uint32)
+        owners = np.frombuffer(self.owners, dtype=np.uint32)
+        keep = owners != 0
+        starts = np.frombuffer(self.starts, dtype=np.uint64)[keep]
+        lengths = self._lengths()[keep]
+        # Position of each token within its run
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return (
+            np.repeat(starts, lengths) + offsets.astype(np.uint64),
+            np.repeat(owners[keep], lengths),
+        )
+
+    def holders(self):
+        """{address: token count} for every current holder"""
+        counts = self.counts()
+        return {self.address(i): int(counts[i]) for i in np.flatnonzero(counts) if i}
+
+    def balance_of(self, address):
+        owner = self.ids.get(self._key(address))
+        return 0 if owner is None else int(self.counts()[owner])
+
+    def tokens_of(self, address):
+        """Token ids held by `address`, as (first, last) inclusive runs"""
+        owner = self.ids.get(self._key(address))
+        return [
+            (self.starts[i], self._run_end(i) - 1)
+            for i in range(len(self.owners))
+            if self.owners[i] == owner
+        ]
+
+    def save(self, path, **extra):
+        np.savez(
+            path,
+            starts=np.frombuffer(self.starts, dtype=np.uint64),
+            owners=np.frombuffer(self.owners, dtype=np.uint32),
+            addresses=np.array([self.address(i) for i in range(len(self.addresses))]),
+            meta=np.array([self.start_token_id, self.end], dtype=np.int64),
+            **extra,
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        ownership = cls(int(data["meta"][0]))
+        ownership.end = int(data["meta"][1])
+        ownership.starts = array("Q", data["starts"].tobytes())
+        ownership.owners = array("I", data["owners"].tobytes())
+        ownership.addresses = [str(a) for a in data["addresses"]]
+        ownership.ids = {a: i for i, a in enumerate(ownership.addresses)}
+        return ownership, data
+
+
+class OwnershipIndexer:
+    """
+    Keep a RangeOwnership up to date from a collection's `Transfer` logs.
+    """
+
+    def __init__(
+        self,
+        web3,
+        collection,
+        ownership=None,
+        checkpoint=None,
+        confirmations=DEFAULT_CONFIRMATIONS,
+        pager=None,
+    ):
+        self.web3 = web3
+        self.collection = to_checksum_address(collection)
+        self.ownership = ownership or RangeOwnership()
+        self.checkpoint = checkpoint
+        self.confirmations = confirmations
+        self.pager = pager or LogPager(web3)
+
+    def apply(self, log):
+        to = to_checksum_address(log["topics"][2][-20:])
+        token_id = int.from_bytes(bytes(log["topics"][3]), "big")
+        self.ownership.set_owner(token_id, to)
+
+    def sync(self, from_block=0, to_block="latest"):
+        """Apply transfers since the last sync.  Returns how many."""
+        head = self.web3.eth.get_block(to_block)["number"] - self.confirmations
+        start = from_block if self.checkpoint is None else self.checkpoint + 1
+        if start > head:
+            return 0
+
+        params = {"address": self.collection, "topics": [TRANSFER_TOPIC]}
+        count = 0
+        for log in self.pager.iter_logs(params, start, head):
+            self.apply(log)
+            count += 1
+        self.checkpoint = head
+        return count
+
+    def save(self, path):
+        self.ownership.save(
+            path,
+            collection=np.array(self.collection),
+            checkpoint=np.array(self.checkpoint, dtype=np.int64),
+        )
+
+    @classmethod
+    def load(cls, web3, path, **kwargs):
+        ownership, data = RangeOwnership.load(path)
+        return cls(
+            web3,
+            str(data["collection"]),
+            ownership=ownership,
+            checkpoint=int(data["checkpoint"]),
+            **kwargs,
+        )
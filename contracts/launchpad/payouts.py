@@ -0,0 +1,283 @@
+"""
+Pending PaymentSplitter payouts across every launched collection.
+
+OriginERC721V6 collections are PaymentSplitters with payees and shares fixed
+in `initialize`, so those come from the CollectionIndex.  What changes is
+read in one Multicall at a single block: each collection's balance and
+`totalReleased` per asset, and `released` per payee and asset.  The pending
+payment is then computed offline exactly as `_pendingPayment` does:
+
+    (balance + totalReleased) * shares / totalShares - released
+
+OriginERC721V6 inherits OpenZeppelin's PaymentSplitterUpgradeable, which
+has no `releaseAll`, so its payees are paid with one `release` each, and only
+those with something due (`release` reverts otherwise).  `releaseAll` only
+exists on collections built on contracts/utils/PaymentSplitter.sol
+(OriginERC721a_v3, deployed directly rather than from a factory); pass those
+as `release_all`.  Since `releaseAll` calls `release` for every payee, it is
+only planned when every payee has something pending.  Payouts worth less
+than their gas (see `gas`) are left out, and the rest are ranked by value
+net of gas.
+"""
+
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+
+from .factories import CollectionIndex
+from .gas import BASE_GAS, ETH_TRANSFER_GAS, TOKEN_TRANSFER_GAS
+from .multicall import Multicall, call, eth_balance_call
+from .registry import ERC20_ABI
+from .sweep import ETH_ADDRESS, asset_address
+
+
+def _view(name, inputs, output="uint256"):
+    return {
+        "inputs": [{"name": n, "type": t} for n, t in inputs],
+        "name": name,
+        "outputs": [{"name": "", "type": output}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+
+
+def _release(name, inputs):
+    return {
+        "inputs": [{"name": n, "type": t} for n, t in inputs],
+        "name": name,
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    }
+
+
+# `totalReleased`, `released`, `release` and `releaseAll` are overloaded for
+# ERC20s; splitting the ABI keeps every name unambiguous.  `releaseAll` is
+# only on contracts/utils/PaymentSplitter.sol.
+SPLITTER_ABI = [
+    _view("totalShares", []),
+    _view("totalReleased", []),
+    _view("released", [("account", "address")]),
+    _release("release", [("account", "address")]),
+    _release("releaseAll", []),
+]
+
+TOKEN_SPLITTER_ABI = [
+    _view("totalReleased", [("token", "address")]),
+    _view("released", [("token", "address"), ("account", "address")]),
+    _release("release", [("token", "address"), ("account", "address")]),
+    _release("releaseAll", [("token", "address")]),
+]
+
+Pending = namedtuple(
+    "Pending", ["collection", "asset", "payee", "shares", "released", "amount"]
+)
+
+Payout = namedtuple(
+    "Payout",
+    ["collection", "asset", "payees", "amount", "value", "gas", "release_all"],
+)
+
+
+def release_gas(asset, payees, release_all):
+    """Gas to pay `payees`, in one releaseAll or one release each"""
+    gas = ETH_TRANSFER_GAS if asset == ETH_ADDRESS else TOKEN_TRANSFER_GAS
+    if release_all:
+        return BASE_GAS + gas * payees
+    return (BASE_GAS + gas) * payees
+
+
+def indexed_splitters(index):
+    """{collection: [(payee, shares)]} for every indexed collection with payees"""
+    return {
+        record["address"]: record["payees"]
+        for record in index.collections()
+        if record["payees"]
+    }
+
+
+def pending_payments(
+    contracts, splitters, assets=("eth",), block="latest", multicall=None
+):
+    """
+    Pending payment of every payee of every splitter in each of `assets`,
+    read at one block.  `splitters` maps collection -> [(payee, shares)].
+    """
+    web3 = contracts.web3
+    multicall = multicall or Multicall(web3)
+    block = multicall.resolve_block(block)
+    assets = [asset_address(contracts, a) for a in assets]
+    tokens = {
+        a: web3.eth.contract(address=a, abi=ERC20_ABI)
+        for a in assets
+        if a != ETH_ADDRESS
+    }
+
+    calls = []
+    for collection, payees in splitters.items():
+        collection = to_checksum_address(collection)
+        eth = web3.eth.contract(address=collection, abi=SPLITTER_ABI)
+        token = web3.eth.contract(address=collection, abi=TOKEN_SPLITTER_ABI)
+        for asset in assets:
+            if asset == ETH_ADDRESS:
+                calls.append(eth_balance_call(multicall.address, collection))
+                calls.append(call(eth, "totalReleased"))
+                calls += [call(eth, "released", payee) for payee, _ in payees]
+            else:
+                calls.append(call(tokens[asset], "balanceOf", collection))
+                calls.append(call(token, "totalReleased", asset))
+                calls += [call(token, "released", asset, p) for p, _ in payees]
+
+    results = iter(multicall(calls, block=block))
+    pending = []
+    for collection, payees in splitters.items():
+        collection = to_checksum_address(collection)
+        total_shares = sum(shares for _, shares in payees)
+        for asset in assets:
+            balance = next(results)
+            total_released = next(results)
+            released = [next(results) for _ in payees]
+            if balance is None or total_released is None or not total_shares:
+                continue
+            total_received = balance + total_released
+            for (payee, shares), already in zip(payees, released):
+                if already is None:
+                    continue
+                amount = total_received * shares // total_shares - already
+                pending.append(
+                    Pending(collection, asset, payee, shares, already, amount)
+                )
+
+    return pending
+
+
+def payout_items(pending, gas_price, prices=None, gas_multiple=1, release_all=()):
+    """
+    Group pending payments into payouts and price them.
+
+    `prices` maps token address -> wei per token base unit; ETH is always
+    1.  `release_all` lists the collections that have `releaseAll`.  A
+    payout is kept when its value is more than `gas_multiple` times its gas
+    cost.  Returns (payouts, dust, unpriced), payouts ranked by value net of
+    gas.
+    """
+    prices = {to_checksum_address(k): v for k, v in (prices or {}).items()}
+    prices[ETH_ADDRESS] = 1
+    has_release_all = {to_checksum_address(a) for a in release_all}
+
+    groups = {}
+    for p in pending:
+        if p.shares:
+            groups.setdefault((p.collection, p.asset), []).append(p)
+
+    payouts = []
+    dust = []
+    unpriced = []
+    for (collection, asset), group in groups.items():
+        due = [p for p in group if p.amount > 0]
+        if not due:
+            continue
+        price = prices.get(asset)
+        if price is None:
+            unpriced += due
+            continue
+
+        batched = collection in has_release_all and len(due) == len(group)
+        amount = sum(p.amount for p in due)
+        value = int(amount * price)
+        gas = release_gas(asset, len(due), batched)
+        if value <= gas * gas_price * gas_multiple:
+            dust += due
+            continue
+        payouts.append(
+            Payout(
+                collection,
+                asset,
+                [p.payee for p in due],
+                amount,
+                value,
+                gas,
+                batched,
+            )
+        )
+
+    payouts.sort(key=lambda p: -(p.value - p.gas * gas_price))
+    return payouts, dust, unpriced
+
+
+def plan_payouts(
+    contracts,
+    splitters=None,
+    assets=("eth",),
+    prices=None,
+    gas_price=None,
+    gas_multiple=1,
+    release_all=(),
+    block="latest",
+    index=None,
+    multicall=None,
+):
+    """
+    Plan the release transactions for every collection's pending payments.
+
+    `splitters` defaults to every collection with payees in the
+    CollectionIndex, brought up to date first.  `release_all` lists the
+    collections among them built on contracts/utils/PaymentSplitter.sol.
+    `gas_price` defaults to the node's current price.  Returns a dict with the ranked `payouts`, the
+    pending payments left as `dust` or `unpriced`, and totals.
+    """
+    web3 = contracts.web3
+    multicall = multicall or Multicall(web3)
+    block = multicall.resolve_block(block)
+    if gas_price is None:
+        gas_price = web3.eth.gas_price
+
+    if splitters is None:
+        if index is None:
+            index = CollectionIndex(contracts, multicall=multicall)
+            try:
+                index.sync()
+                splitters = indexed_splitters(index)
+            finally:
+                index.close()
+        else:
+            splitters = indexed_splitters(index)
+
+    pending = pending_payments(contracts, splitters, assets, block, multicall)
+    payouts, dust, unpriced = payout_items(
+        pending, gas_price, prices, gas_multiple, release_all
+    )
+
+    return {
+        "block": block,
+        "gas_price": gas_price,
+        "payouts": payouts,
+        "dust": dust,
+        "unpriced": unpriced,
+        "gas": sum(p.gas for p in payouts),
+        "value": sum(p.value for p in payouts),
+        "transactions": sum(1 if p.release_all else len(p.payees) for p in payouts),
+    }
+
+
+def payout_transactions(contracts, plan, sender):
+    """Unsigned release transactions for a plan, in ranked order"""
+    web3 = contracts.web3
+    params = {"from": sender, "gasPrice": plan["gas_price"]}
+    transactions = []
+    for payout in plan["payouts"]:
+        if payout.asset == ETH_ADDRESS:
+            splitter = web3.eth.contract(address=payout.collection, abi=SPLITTER_ABI)
+            args = ()
+        else:
+            splitter = web3.eth.contract(
+                address=payout.collection, abi=TOKEN_SPLITTER_ABI
+            )
+            args = (payout.asset,)
+
+        if payout.release_all:
+            fns = [splitter.functions.releaseAll(*args)]
+        else:
+            fns = [splitter.functions.release(*args, p) for p in payout.payees]
+        transactions += [fn.build_transaction(params) for fn in fns]
+    return transactions
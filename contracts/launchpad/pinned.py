@@ -0,0 +1,147 @@
+"""
+Block-pinned reads for the console.
+
+Inside `with at_block(n):` every `eth_call`, balance, code and storage read
+that would have gone to "latest" is sent for block `n` instead, through a
+web3 middleware, so figures from different contracts always come from the
+same state:
+
+    with at_block(16_000_000) as pin:
+        supply = series.functions.totalSupply().call()
+        points = season_two.functions.getTotalPoints().call()
+        eth = web3.eth.get_balance(vault.address)
+        ogn_balance, = pin.batch([call(ogn, "balanceOf", vault.address)])
+
+State at a fixed block never changes, so pinned responses are memoized and
+re-running a snapshot for the same block costs no RPCs.  The pin follows the
+current context; reads made from other threads are not pinned, except those
+sent with `pin.batch()`, which always pins its Multicall.
+"""
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .cache import LRU
+from .multicall import Multicall
+
+# RPC method -> position of its block parameter
+BLOCK_PARAMS = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getCode": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getStorageAt": 2,
+    "eth_getBlockByNumber": 0,
+}
+
+# Block tags that are replaced by the pinned block
+MOVING_TAGS = (None, "latest", "pending", "safe", "finalized")
+
+DEFAULT_MEMO_SIZE = 65536
+
+MIDDLEWARE_NAME = "pinned_block"
+
+_pinned = ContextVar("pinned_block", default=None)
+
+
+class PinnedBlock:
+    def __init__(self, pins, number):
+        self.pins = pins
+        self.number = number
+        self.hex_number = hex(number)
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"<PinnedBlock {self.number} hits={self.hits} misses={self.misses}>"
+
+    def batch(self, calls):
+        """Run `multicall.Call`s at the pinned block, memoizing each result"""
+        calls = list(calls)
+        memo = self.pins.memo
+        keys = [(self.number, "call", c.target, bytes(c.data)) for c in calls]
+        missing = object()
+
+        results = [memo.get(key, missing) for key in keys]
+        todo = [i for i, result in enumerate(results) if result is missing]
+        self.hits += len(calls) - len(todo)
+        self.misses += len(todo)
+
+        if todo:
+            fetched = self.pins.multicall([calls[i] for i in todo], block=self.number)
+            for i, result in zip(todo, fetched):
+                results[i] = result
+                if result is not None:
+                    memo.put(keys[i], result)
+
+        return results
+
+
+class BlockPins:
+    """
+    `at_block` for a web3 instance.  Installs the pinning middleware on
+    first use; it does nothing outside an `at_block` context.
+    """
+
+    def __init__(self, web3, memo_size=DEFAULT_MEMO_SIZE, multicall=None):
+        self.web3 = web3
+        self.memo = LRU(memo_size)
+        self.multicall = multicall or Multicall(web3)
+        self._installed = False
+
+    def _install(self):
+        if self._installed:
+            return
+        if MIDDLEWARE_NAME not in self.web3.middleware_onion:
+            self.web3.middleware_onion.add(self._middleware, MIDDLEWARE_NAME)
+        self._installed = True
+
+    def _middleware(self, make_request, w3):
+        def middleware(method, params):
+            pin = _pinned.get()
+            position = BLOCK_PARAMS.get(method)
+            if pin is None or position is None:
+                return make_request(method, params)
+
+            params = list(params)
+            if len(params) <= position:
+                params.extend([None] * (position + 1 - len(params)))
+            if params[position] not in MOVING_TAGS:
+                return make_request(method, params)
+            params[position] = pin.hex_number
+
+            key = (pin.number, method, json.dumps(params, sort_keys=True))
+            response = self.memo.get(key)
+            if response is not None:
+                pin.hits += 1
+                return response
+
+            pin.misses += 1
+            response = make_request(method, params)
+            if "error" not in response:
+                self.memo.put(key, response)
+            return response
+
+        return middleware
+
+    def resolve(self, block):
+        if isinstance(block, int):
+            return block
+        return self.web3.eth.get_block(block)["number"]
+
+    @contextmanager
+    def __call__(self, block="latest"):
+        """Pin every read in the block to `block` (a number or tag)"""
+        self._install()
+        pin = PinnedBlock(self, self.resolve(block))
+        token = _pinned.set(pin)
+        try:
+            yield pin
+        finally:
+            _pinned.reset(token)
+
+
+def current_pin():
+    """The active PinnedBlock, or None"""
+    return _pinned.get()
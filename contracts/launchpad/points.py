@@ -0,0 +1,243 @@
+"""
+Off-chain SeasonV2 points and rewards.
+
+Mirrors `_pointsInTime`, `_initMemUser`, `_calculateShare` and
+`_calcRewards`/`expectedRewards` from contracts/staking/SeasonV2.sol over
+NumPy arrays.  OGN amounts and points do not fit in 64 bits, so they are held
+in object arrays of Python ints; all division is floor division and stake
+time is counted in whole days, exactly as the contract does.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .multicall import Multicall, call
+
+ONE_DAY = 60 * 60 * 24
+UINT128_MAX = 2**128 - 1
+
+# Mutable season storage (`season` and `snapshot` in SeasonV2)
+SeasonState = namedtuple(
+    "SeasonState",
+    ["bootstrapped", "snapshot_taken", "total_points", "reward_eth", "reward_ogn"],
+)
+
+
+def uints(values):
+    """Array of arbitrary-size unsigned ints"""
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = [int(v) for v in values]
+    return arr
+
+
+def timestamps(values):
+    return np.asarray(values, dtype=np.int64)
+
+
+class SeasonModel:
+    """
+    The immutable schedule of a season, and the contract's math over it.
+    """
+
+    def __init__(self, start_time, lock_start_time, end_time, claim_end_time):
+        self.start_time = int(start_time)
+        self.lock_start_time = int(lock_start_time)
+        self.end_time = int(end_time)
+        self.claim_end_time = int(claim_end_time)
+
+    @classmethod
+    def from_contract(cls, season):
+        return cls(
+            season.functions.startTime().call(),
+            season.functions.lockStartTime().call(),
+            season.functions.endTime().call(),
+            season.functions.claimEndTime().call(),
+        )
+
+    def __repr__(self):
+        return (
+            f"SeasonModel(start={self.start_time}, lock={self.lock_start_time}, "
+            f"end={self.end_time}, claim_end={self.claim_end_time})"
+        )
+
+    def points_in_time(self, amounts, stamps):
+        """`_pointsInTime(amount, blockStamp)` for every pair"""
+        amounts = uints(amounts)
+        stamps = timestamps(stamps)
+        if stamps.ndim == 0:
+            stamps = np.full(len(amounts), stamps, dtype=np.int64)
+
+        # Pre-season stake points start at startTime
+        effective = np.maximum(stamps, self.start_time)
+
+        # Remainder ignored intentionally, only full days are counted
+        stake_days = (self.end_time - effective) // ONE_DAY
+        stake_days[(stamps >= self.lock_start_time) | (amounts == 0)] = 0
+
+        points = amounts * stake_days.astype(object)
+
+        if len(points) and max(points) >= UINT128_MAX:
+            raise OverflowError("Season: Points overflow")
+
+        return points
+
+    def rollover_points(self, balances, latest_stake_times):
+        """
+        Points `_initMemUser` assigns a user with no record in this season:
+        their full Series balance at startTime, if they last staked at or
+        before the season start.
+        """
+        balances = uints(balances)
+        latest = timestamps(latest_stake_times)
+        points = self.points_in_time(balances, self.start_time)
+        points[(latest == 0) | (latest > self.start_time)] = 0
+        return points
+
+    def user_points(self, balances, latest_stake_times, exists=None, stored=None):
+        """
+        `getPoints()` for every user.  `exists`/`stored` are the season's
+        `users(address)` records; users without a record are rolled over.
+        """
+        points = self.rollover_points(balances, latest_stake_times)
+        if exists is not None:
+            exists = np.asarray(exists, dtype=bool)
+            points[exists] = uints(stored)[exists]
+        return points
+
+    def total_points(self, state, series_total_supply, timestamp):
+        """`getTotalPoints()` at `timestamp`"""
+        if state.bootstrapped:
+            return int(state.total_points)
+        if timestamp >= self.start_time:
+            return int(self.points_in_time([series_total_supply], self.start_time)[0])
+        return 0
+
+    @staticmethod
+    def calculate_share(points, total_rewards, total_points):
+        """`_calculateShare(userPoints, totalRewards)`"""
+        return (uints(points) * int(total_rewards)) // int(total_points)
+
+    def rewards(self, points, state):
+        """`_calcRewards()` against a taken snapshot"""
+        points = uints(points)
+        if state.total_points == 0:
+            zeros = np.zeros(len(points), dtype=object)
+            return zeros, zeros.copy()
+
+        eth = self.calculate_share(points, state.reward_eth, state.total_points)
+        ogn = self.calculate_share(points, state.reward_ogn, state.total_points)
+        return eth, ogn
+
+    def expected_rewards(self, points, state, timestamp, vault_eth=0, vault_ogn=0):
+        """
+        `expectedRewards()` for every user at `timestamp`.  Uses the Finale
+        snapshot if taken, otherwise the live vault balances given.
+        """
+        points = uints(points)
+
+        if (
+            timestamp < self.end_time
+            or timestamp >= self.claim_end_time
+            or state.total_points == 0
+        ):
+            zeros = np.zeros(len(points), dtype=object)
+            return zeros, zeros.copy()
+
+        if not state.snapshot_taken:
+            state = state._replace(reward_eth=vault_eth, reward_ogn=vault_ogn)
+
+        return self.rewards(points, state)
+
+
+def season_state(season, block="latest"):
+    """Read a season's mutable storage"""
+    bootstrapped, snapshot_taken, total_points = season.functions.season().call(
+        block_identifier=block
+    )
+    reward_eth, reward_ogn = season.functions.snapshot().call(block_identifier=block)
+    return SeasonState(
+        bootstrapped, snapshot_taken, total_points, reward_eth, reward_ogn
+    )
+
+
+def season_points(contracts, name, addresses, block="latest", multicall=None):
+    """
+    Points and expected rewards for `addresses` in season `name`, reading
+    only user records and balances in bulk and doing the math locally.
+
+    Returns a dict of columns: `address`, `points`, `eth`, `ogn`.  Users
+    whose reads failed get None in every column but `address`.
+    """
+    web3 = contracts.web3
+    multicall = multicall or Multicall(web3)
+    block = multicall.resolve_block(block)
+    addresses = [web3.to_checksum_address(a) for a in addresses]
+
+    season = contracts.contract(name)
+    series = contracts.contract("series")
+    vault = contracts.contract("vault")
+    ogn = contracts.contract("ogn")
+
+    model = SeasonModel.from_contract(season)
+    state = season_state(season, block)
+    timestamp = web3.eth.get_block(block)["timestamp"]
+
+    calls = []
+    for address in addresses:
+        calls.append(call(series, "balanceOf", address))
+        calls.append(call(series, "latestStakeTime", address))
+        calls.append(call(season, "users", address))
+    results = multicall(calls, block=block)
+
+    rows = list(zip(results[0::3], results[1::3], results[2::3]))
+    failed = [i for i, row in enumerate(rows) if None in row]
+    # Failed rows are computed as empty and reported as None below
+    rows = [(0, 0, (False, 0)) if None in row else row for row in rows]
+
+    points = model.user_points(
+        [balance for balance, _, _ in rows],
+        [latest for _, latest, _ in rows],
+        [user[0] for _, _, user in rows],
+        [user[1] for _, _, user in rows],
+    )
+
+    vault_eth = vault_ogn = 0
+    if not state.snapshot_taken:
+        vault_eth = web3.eth.get_balance(vault.address, block)
+        vault_ogn = ogn.functions.balanceOf(vault.address).call(block_identifier=block)
+
+    eth, ogn_rewards = model.expected_rewards(
+        points, state, timestamp, vault_eth, vault_ogn
+    )
+
+    for i in failed:
+        points[i] = eth[i] = ogn_rewards[i] = None
+
+    return {"address": addresses, "points": points, "eth": eth, "ogn": ogn_rewards}
+
+
+def verify(contracts, name, addresses, block="latest", multicall=None):
+    """
+    Compare `season_points` with the contract's own `getPoints` and
+    `expectedRewards` at `block`.  Returns a list of mismatching rows.
+    """
+    multicall = multicall or Multicall(contracts.web3)
+    block = multicall.resolve_block(block)
+    local = season_points(contracts, name, addresses, block, multicall)
+
+    season = contracts.contract(name)
+    calls = []
+    for address in local["address"]:
+        calls.append(call(season, "getPoints", address))
+        calls.append(call(season, "expectedRewards", address))
+    results = multicall(calls, block=block)
+
+    mismatches = []
+    for i, address in enumerate(local["address"]):
+        points, rewards = results[2 * i], results[2 * i + 1]
+        onchain = None if points is None or rewards is None else (points, *rewards)
+        offchain = (local["points"][i], local["eth"][i], local["ogn"][i])
+        if onchain is None or onchain != offchain:
+            mismatches.append((address, onchain, offchain))
+    return mismatches
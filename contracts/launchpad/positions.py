@@ -0,0 +1,61 @@
+"""
+Staking positions for many users at once.
+"""
+
+from .multicall import Multicall, call
+
+# Extra headroom for season reads that call back into Series
+SEASON_CALL_GAS = 60000
+
+
+def position_calls(contracts, addresses, seasons):
+    series = contracts.contract("series")
+    calls = []
+
+    for address in addresses:
+        calls.append(call(series, "balanceOf", address))
+        calls.append(call(series, "latestStakeTime", address))
+
+        for name in seasons:
+            season = contracts.contract(name)
+            calls.append(call(season, "getPoints", address, gas=SEASON_CALL_GAS))
+            calls.append(call(season, "expectedRewards", address, gas=SEASON_CALL_GAS))
+
+    return calls
+
+
+def bulk_positions(contracts, addresses, block="latest", seasons=None, multicall=None):
+    """
+    Fetch staking positions for `addresses` at `block`.
+
+    Returns a dict of equal-length columns: `address`, `balance`,
+    `latest_stake_time` and, for every season, `<season>_points`,
+    `<season>_eth` and `<season>_ogn`.  Values for reads that failed are None.
+    """
+    web3 = contracts.web3
+    addresses = [web3.to_checksum_address(a) for a in addresses]
+    seasons = contracts.seasons() if seasons is None else list(seasons)
+    multicall = multicall or Multicall(web3)
+
+    results = multicall(position_calls(contracts, addresses, seasons), block=block)
+
+    columns = {"address": addresses, "balance": [], "latest_stake_time": []}
+    for name in seasons:
+        columns[f"{name}_points"] = []
+        columns[f"{name}_eth"] = []
+        columns[f"{name}_ogn"] = []
+
+    width = 2 + 2 * len(seasons)
+    for i in range(len(addresses)):
+        row = results[i * width : (i + 1) * width]
+        columns["balance"].append(row[0])
+        columns["latest_stake_time"].append(row[1])
+
+        for j, name in enumerate(seasons):
+            points, rewards = row[2 + 2 * j : 4 + 2 * j]
+            eth, ogn = rewards if rewards is not None else (None, None)
+            columns[f"{name}_points"].append(points)
+            columns[f"{name}_eth"].append(eth)
+            columns[f"{name}_ogn"].append(ogn)
+
+    return columns
@@ -0,0 +1,541 @@
+"""
+Lazy contract registry backed by the hardhat-deploy artifacts in this repo.
+
+Addresses and ABIs are read on demand from `deployments/<network>/*.json`
+(falling back to `network.<network>.json` and compiled `artifacts/`).  Only
+the leading keys we need are decoded, so the bytecode, metadata and
+storageLayout blobs are never parsed.  Results are kept in a small on-disk
+cache validated against each source file's size and modification time, so a
+cache hit doesn't read the file at all.
+"""
+
+import functools
+import hashlib
+import json
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / "cache" / "console"
+CACHE_VERSION = 3
+
+NETWORKS = {1: "mainnet", 4: "rinkeby", 5: "goerli"}
+
+# Console name -> (deployment holding the address, deployments providing the
+# ABI).  ABIs are merged in order, so implementation ABIs come before proxies.
+CONTRACTS = {
+    "ogn": ("MockOGN", ("MockOGN",)),
+    "vault": ("FeeVaultProxy", ("FeeVault", "FeeVaultProxy")),
+    "series": ("SeriesProxy", ("SeriesV2", "Series", "SeriesProxy")),
+    "ingest_master": ("IngestMasterProxy", ("IngestMaster", "IngestMasterProxy")),
+    "ingest_registry": ("IngestRegistry", ("IngestRegistry",)),
+    "ingest_mid_proxy": ("IngestMidProxy", ("IngestMidProxy",)),
+    "nft_factory": ("OriginERC721_v3Factory", ("OriginERC721_v3Factory",)),
+}
+
+# Seasons are discovered by deployment name, e.g. SeasonTwo -> season_two
+SEASON_PATTERN = re.compile(r"^Season([A-Z][a-z]+)$")
+ORDINALS = (
+    "one",
+    "two",
+    "three",
+    "four",
+    "five",
+    "six",
+    "seven",
+    "eight",
+    "nine",
+    "ten",
+    "eleven",
+    "twelve",
+)
+
+# Tokens that are not deployed by us and so have no deployment record
+TOKENS = {
+    "mainnet": {"ogn": "0x8207c1FfC5B6804F6024322CcF34F29c3541Ae26"},
+}
+
+# Addresses the console has historically used that differ from deployments/
+ADDRESS_OVERRIDES = {
+    "mainnet": {"season_one": "0xf198fB4efd100B9be9654C79158704BFC0BABa90"},
+}
+
+ERC20_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"},
+        ],
+        "name": "Transfer",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "owner", "type": "address"},
+            {"indexed": True, "name": "spender", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"},
+        ],
+        "name": "Approval",
+        "type": "event",
+    },
+    {
+        "inputs": [
+            {"name": "owner", "type": "address"},
+            {"name": "spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "spender", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "name",
+        "outputs": [{"name": "", "type": "string"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "symbol",
+        "outputs": [{"name": "", "type": "string"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "totalSupply",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "to", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "from", "type": "address"},
+            {"name": "to", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "name": "transferFrom",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+]
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def _skip(text, pos, char):
+    pos = _whitespace.match(text, pos).end()
+    if text[pos] != char:
+        raise ValueError(f"Expected {char!r} at {pos}, found {text[pos]!r}")
+    return pos + 1
+
+
+def read_keys(text, keys, pos=0):
+    """
+    Decode only `keys` from the top level of the JSON object in `text`.
+
+    Keys are decoded as they are encountered and scanning stops as soon as
+    all of them have been seen.  hardhat-deploy writes address/abi/receipt
+    first, so the large trailing blobs are never touched.
+    """
+    wanted = set(keys)
+    found = {}
+    pos = _skip(text, pos, "{")
+
+    while wanted:
+        pos = _whitespace.match(text, pos).end()
+        if text[pos] == "}":
+            break
+        if text[pos] == ",":
+            pos += 1
+            continue
+
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _whitespace.match(text, _skip(text, pos, ":")).end()
+        value, pos = _decoder.raw_decode(text, pos)
+
+        if key in wanted:
+            found[key] = value
+            wanted.discard(key)
+
+    return found
+
+
+def merge_abis(*abis):
+    """Merge ABIs, keeping the first definition of each member"""
+    seen = set()
+    merged = []
+
+    for i, abi in enumerate(abis):
+        for member in abi:
+            if i > 0 and member["type"] == "constructor":
+                continue
+
+            key = (
+                member["type"],
+                member.get("name"),
+                tuple(inp["type"] for inp in member.get("inputs", [])),
+            )
+            if key in seen:
+                continue
+
+            seen.add(key)
+            merged.append(member)
+
+    return merged
+
+
+def _abi_key(abi):
+    encoded = json.dumps(abi, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=8).hexdigest()
+
+
+def file_stamp(path):
+    """(mtime, size) of a file, which changes whenever its content does"""
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class AbiCache:
+    """
+    Compact on-disk cache of what was decoded from each source file.
+
+    Entries are keyed by file path and validated against the file's
+    `file_stamp`.  ABIs are stored once by content, so identical ABIs (e.g.
+    every season) share a single copy.  Writes are deferred to the end of
+    the outermost `batch`.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.dirty = False
+        self.depth = 0
+
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            data = {}
+
+        if data.get("version") != CACHE_VERSION:
+            data = {"version": CACHE_VERSION, "files": {}, "abis": {}}
+
+        self.data = data
+
+    def _pack(self, record):
+        record = dict(record)
+        if "abi" in record:
+            key = _abi_key(record["abi"])
+            self.data["abis"][key] = record["abi"]
+            record["abi"] = key
+        if "contracts" in record:
+            record["contracts"] = {
+                k: self._pack(v) for k, v in record["contracts"].items()
+            }
+        return record
+
+    def _unpack(self, record):
+        record = dict(record)
+        if "abi" in record:
+            record["abi"] = self.data["abis"][record["abi"]]
+        if "contracts" in record:
+            record["contracts"] = {
+                k: self._unpack(v) for k, v in record["contracts"].items()
+            }
+        return record
+
+    def get(self, source, stamp):
+        entry = self.data["files"].get(source)
+        if entry is None or entry["stamp"] != stamp:
+            return None
+        return self._unpack(entry["record"])
+
+    def put(self, source, stamp, record):
+        self.data["files"][source] = {"stamp": stamp, "record": self._pack(record)}
+        self.dirty = True
+        if not self.depth:
+            self.save()
+
+    @contextmanager
+    def batch(self):
+        """Save once, when the outermost batch ends"""
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.save()
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        # Drop ABIs no longer referenced by any file
+        used = set()
+        for entry in self.data["files"].values():
+            record = entry["record"]
+            for rec in [record] + list(record.get("contracts", {}).values()):
+                if "abi" in rec:
+                    used.add(rec["abi"])
+        self.data["abis"] = {k: v for k, v in self.data["abis"].items() if k in used}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, separators=(",", ":")))
+        tmp.replace(self.path)
+        self.dirty = False
+
+
+def _batched(method):
+    """Run a registry method in one cache batch"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.cache.batch():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class LazyContract:
+    """Stand-in for a web3 contract that is only built when first used"""
+
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.contract(self._name), attr)
+
+    def __repr__(self):
+        return f"<LazyContract {self._name} ({self._registry.network})>"
+
+
+class ContractRegistry:
+    """
+    Resolve console contract names (`vault`, `series`, `season_two`, ...) for
+    a network.  Nothing is decoded until a name is first accessed.
+    """
+
+    def __init__(self, web3, network, root=ROOT, cache_dir=CACHE_DIR):
+        self.web3 = web3
+        self.network = network
+        self.root = Path(root)
+        self.deployments = self.root / "deployments" / network
+        self.cache = AbiCache(Path(cache_dir) / f"{network}.json")
+        self._records = {}
+        self._contracts = {}
+        self._network_file = None
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self.names():
+            raise AttributeError(name)
+        return self.contract(name)
+
+    def __dir__(self):
+        return list(super().__dir__()) + self.names()
+
+    def _load(self, path, keys):
+        """Read `keys` from a JSON file through the cache"""
+        stamp = file_stamp(path)
+        source = str(path.relative_to(self.root))
+
+        record = self.cache.get(source, stamp)
+        if record is None:
+            found = read_keys(path.read_text(), keys)
+            record = {
+                k: found[k]
+                for k in ("address", "abi", "args", "contracts")
+                if k in found
+            }
+            if "receipt" in found:
+                record["block"] = found["receipt"].get("blockNumber")
+
+            self.cache.put(source, stamp, record)
+
+        return record
+
+    def _network_contracts(self):
+        """Contracts exported to network.<network>.json"""
+        if self._network_file is None:
+            path = self.root / f"network.{self.network}.json"
+            self._network_file = {}
+            if path.exists():
+                self._network_file = self._load(path, ("contracts",))["contracts"]
+        return self._network_file
+
+    def _specs(self):
+        specs = dict(CONTRACTS)
+        for path in sorted(self.deployments.glob("*.json")):
+            match = SEASON_PATTERN.match(path.stem)
+            if match:
+                specs[f"season_{match.group(1).lower()}"] = (path.stem, (path.stem,))
+        return specs
+
+    def _spec(self, name):
+        specs = self._specs()
+        if name not in specs:
+            raise KeyError(f"Unknown contract {name} on {self.network}")
+        return specs[name]
+
+    def _token(self, name):
+        """Address of a third-party token standing in for a missing deployment"""
+        token = TOKENS.get(self.network, {}).get(name)
+        if token and not self.has_deployment(CONTRACTS.get(name, ("",))[0]):
+            return token
+        return None
+
+    def has_deployment(self, deployment):
+        if (self.deployments / f"{deployment}.json").exists():
+            return True
+        return deployment in self._network_contracts()
+
+    def names(self):
+        """Console names available on this network"""
+        names = [
+            name
+            for name, (deployment, _) in self._specs().items()
+            if self.has_deployment(deployment)
+        ]
+        names += [name for name in TOKENS.get(self.network, {}) if name not in names]
+        return names
+
+    def seasons(self):
+        """Season names on this network, in season order"""
+
+        def order(name):
+            word = name[len("season_") :]
+            return ORDINALS.index(word) if word in ORDINALS else len(ORDINALS)
+
+        return sorted(
+            (name for name in self.names() if name.startswith("season_")), key=order
+        )
+
+    @_batched
+    def deployment(self, deployment):
+        """
+        Return `{"address", "abi", "block", "args"}` for a named deployment,
+        or None if it does not exist on this network.
+        """
+        if deployment not in self._records:
+            path = self.deployments / f"{deployment}.json"
+
+            if path.exists():
+                record = self._load(path, ("address", "abi", "receipt", "args"))
+            else:
+                record = self._network_contracts().get(deployment)
+
+            self._records[deployment] = record
+
+        return self._records[deployment]
+
+    @_batched
+    def artifact_abi(self, contract_name):
+        """ABI from the compiled hardhat artifacts (`npx hardhat compile`)"""
+        matches = list(
+            (self.root / "artifacts" / "contracts").glob(
+                f"**/{contract_name}.sol/{contract_name}.json"
+            )
+        )
+        if not matches:
+            raise KeyError(f"No compiled artifact for {contract_name}")
+        return self._load(matches[0], ("abi",))["abi"]
+
+    @_batched
+    def address(self, name):
+        override = ADDRESS_OVERRIDES.get(self.network, {}).get(name)
+        if override:
+            return override
+
+        token = self._token(name)
+        if token:
+            return token
+
+        deployment, _ = self._spec(name)
+        return self.deployment(deployment)["address"]
+
+    @_batched
+    def abi(self, name):
+        if self._token(name):
+            return ERC20_ABI
+
+        _, sources = self._spec(name)
+        return merge_abis(
+            *[self.deployment(s)["abi"] for s in sources if self.has_deployment(s)]
+        )
+
+    @_batched
+    def deploy_block(self, name):
+        """Block the deployment behind `name` was mined in, if known"""
+        if self._token(name) or name in ADDRESS_OVERRIDES.get(self.network, {}):
+            return None
+
+        deployment, _ = self._spec(name)
+        record = self.deployment(deployment)
+        return record.get("block") if record else None
+
+    @_batched
+    def deploy_args(self, name):
+        """Constructor arguments of the deployment behind `name`, if known"""
+        if self._token(name) or name in ADDRESS_OVERRIDES.get(self.network, {}):
+            return None
+
+        deployment, _ = self._spec(name)
+        record = self.deployment(deployment)
+        return record.get("args") if record else None
+
+    @_batched
+    def contract(self, name):
+        """Build (once) and return the web3 contract for a console name"""
+        if name not in self._contracts:
+            self._contracts[name] = self.web3.eth.contract(
+                address=self.web3.to_checksum_address(self.address(name)),
+                abi=self.abi(name),
+            )
+        return self._contracts[name]
+
+    @_batched
+    def namespace(self):
+        """Lazy stand-ins for every available contract, for the console"""
+        return {name: LazyContract(self, name) for name in self.names()}
@@ -0,0 +1,168 @@
+"""
+Staker snapshots written straight to disk.
+
+Stakers are every address with a `Stake` event in the event index up to the
+snapshot block.  Their positions are read in chunks with `bulk_positions`
+at that block, and each chunk is written out before the next is read, so
+memory use doesn't grow with the number of stakers.  Parquet output needs
+`pyarrow`; CSV works without it.
+"""
+
+import csv
+from decimal import Decimal
+from pathlib import Path
+
+from .indexer import EventIndexer
+from .multicall import Multicall
+from .positions import bulk_positions
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Parquet's widest widely readable decimal.  OGN and ETH amounts in wei
+# stay far below it, but points are uint128s, which can reach 3.4e38: a
+# value that doesn't fit is rejected rather than written wrong.
+AMOUNT_PRECISION = 38
+MAX_AMOUNT = 10**AMOUNT_PRECISION - 1
+
+
+def stakers(indexer, block):
+    """Addresses that staked in any season up to `block`, in first-stake order"""
+    seen = {}
+    for event in indexer.events(event="Stake", to_block=block):
+        seen.setdefault(event["args"]["userAddress"], None)
+    return list(seen)
+
+
+def snapshot_columns(seasons):
+    columns = ["address", "staked_ogn", "latest_stake_time"]
+    for name in seasons:
+        columns += [f"{name}_points", f"{name}_eth", f"{name}_ogn"]
+    return columns
+
+
+def snapshot_chunks(
+    contracts,
+    addresses,
+    block,
+    seasons=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    multicall=None,
+):
+    """
+    Yield snapshot rows in chunks, as dicts of columns.  Addresses with no
+    stake left at `block` are dropped.
+    """
+    seasons = contracts.seasons() if seasons is None else list(seasons)
+    multicall = multicall or Multicall(contracts.web3)
+
+    for start in range(0, len(addresses), chunk_size):
+        positions = bulk_positions(
+            contracts,
+            addresses[start : start + chunk_size],
+            block=block,
+            seasons=seasons,
+            multicall=multicall,
+        )
+        positions["staked_ogn"] = positions.pop("balance")
+        keep = [i for i, balance in enumerate(positions["staked_ogn"]) if balance]
+        if keep:
+            yield {
+                column: [positions[column][i] for i in keep]
+                for column in snapshot_columns(seasons)
+            }
+
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self.columns = columns
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, chunk):
+        self.writer.writerows(zip(*(chunk[c] for c in self.columns)))
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    def __init__(self, path, columns, compression="zstd"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.columns = columns
+        types = {"address": pa.string(), "latest_stake_time": pa.int64()}
+        amount = pa.decimal128(AMOUNT_PRECISION, 0)
+        self.schema = pa.schema([(c, types.get(c, amount)) for c in columns])
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression=compression)
+
+    def write(self, chunk):
+        arrays = []
+        for c in self.columns:
+            values = chunk[c]
+            kind = self.schema.field(c).type
+            if self.pa.types.is_decimal(kind):
+                too_large = [v for v in values if v is not None and v > MAX_AMOUNT]
+                if too_large:
+                    raise OverflowError(
+                        f"{c} value {too_large[0]} exceeds {AMOUNT_PRECISION} "
+                        "digits; export to CSV instead"
+                    )
+                values = [None if v is None else Decimal(v) for v in values]
+            arrays.append(self.pa.array(values, type=kind))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def export_snapshot(
+    contracts,
+    path,
+    block="latest",
+    seasons=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    indexer=None,
+    multicall=None,
+):
+    """
+    Write one row per staker at `block` to `path` (`.parquet` or `.csv`).
+    Returns the block and the number of rows written.
+    """
+    path = Path(path)
+    seasons = contracts.seasons() if seasons is None else list(seasons)
+    multicall = multicall or Multicall(contracts.web3)
+    block = multicall.resolve_block(block)
+
+    own_indexer = indexer is None
+    indexer = indexer or EventIndexer(contracts)
+    try:
+        # Never sync the shared index back to an older block; read it at one
+        if indexer.indexed_block() < block:
+            indexer.sync()
+        addresses = stakers(indexer, block)
+    finally:
+        if own_indexer:
+            indexer.close()
+
+    columns = snapshot_columns(seasons)
+    if path.suffix == ".parquet":
+        sink = ParquetSink(path, columns)
+    elif path.suffix == ".csv":
+        sink = CsvSink(path, columns)
+    else:
+        raise ValueError(f"Unsupported snapshot format {path.suffix}")
+
+    rows = 0
+    try:
+        for chunk in snapshot_chunks(
+            contracts, addresses, block, seasons, chunk_size, multicall
+        ):
+            sink.write(chunk)
+            rows += len(chunk["address"])
+    finally:
+        sink.close()
+
+    return {"block": block, "rows": rows}
@@ -0,0 +1,264 @@
+"""
+Pipelined transaction submission.
+
+Nonces are assigned locally from the account's pending count, so up to
+`max_in_flight` transactions can be sent without waiting for each receipt.
+Receipts for everything in flight are polled concurrently, and a submission
+only blocks when the pipeline is full.  A transaction that stays unmined for
+`replace_after` seconds is re-sent with the same nonce and fees bumped past
+the node's replacement minimum; a receipt for any of its versions confirms
+the nonce.
+
+Works with a local `eth_account` account or an ape account, which sign
+here, or with an account the node holds unlocked (hardhat/anvil), which is
+sent with `eth_sendTransaction`.
+
+    deployer = accounts.load("deployer")
+    with pipeline(deployer) as p:
+        for batch in plan:
+            p.submit(master.functions.collectBatch(*batch_args(batch)))
+    receipts = p.receipts
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_utils import to_checksum_address
+from web3.exceptions import TransactionNotFound
+
+DEFAULT_IN_FLIGHT = 8
+DEFAULT_POLL_INTERVAL = 1
+DEFAULT_REPLACE_AFTER = 60
+
+# Nodes reject replacements that don't raise fees by at least 10%
+FEE_BUMP = 1.125
+
+# maxFeePerGas headroom over the latest base fee
+BASE_FEE_MULTIPLE = 2
+
+
+def _percentile(values, share):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+class InFlight:
+    """One nonce's transaction and every version of it sent so far"""
+
+    def __init__(self, index, tx):
+        self.index = index
+        self.tx = tx
+        self.hashes = []
+        self.submitted = None
+        self.sent = None
+        self.receipt = None
+
+
+class TransactionPipeline:
+    def __init__(
+        self,
+        web3,
+        account,
+        max_in_flight=DEFAULT_IN_FLIGHT,
+        poll_interval=DEFAULT_POLL_INTERVAL,
+        replace_after=DEFAULT_REPLACE_AFTER,
+        max_fee=None,
+        max_workers=8,
+    ):
+        """
+        `account` is an `eth_account` LocalAccount, an ape account or the
+        address of an account unlocked on the node.  `max_fee` caps maxFeePerGas (or
+        gasPrice) for new transactions and replacements alike.
+        """
+        self.web3 = web3
+        self.signer = None if isinstance(account, str) else account
+        self.address = to_checksum_address(
+            account if isinstance(account, str) else account.address
+        )
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.replace_after = replace_after
+        self.max_fee = max_fee
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        self.nonce = web3.eth.get_transaction_count(self.address, "pending")
+        self.in_flight = {}
+        self.receipts = []
+        self.started = None
+        self.latencies = []
+        self.replaced = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if exc[0] is None:
+                self.wait()
+        finally:
+            self.close()
+
+    def _fees(self):
+        block = self.web3.eth.get_block("pending")
+        base_fee = block.get("baseFeePerGas")
+        if base_fee is None:
+            price = self.web3.eth.gas_price
+            return {"gasPrice": min(price, self.max_fee or price)}
+
+        tip = self.web3.eth.max_priority_fee
+        max_fee = base_fee * BASE_FEE_MULTIPLE + tip
+        if self.max_fee is not None:
+            max_fee = min(max_fee, self.max_fee)
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": min(tip, max_fee)}
+
+    def _prepare(self, tx):
+        if hasattr(tx, "build_transaction"):
+            tx = tx.build_transaction({"from": self.address, "nonce": self.nonce})
+        tx = dict(tx)
+        tx["from"] = self.address
+        tx["nonce"] = self.nonce
+        if "gasPrice" not in tx and "maxFeePerGas" not in tx:
+            tx.update(self._fees())
+        if "gas" not in tx:
+            tx["gas"] = self.web3.eth.estimate_gas(tx)
+        if self.signer is not None and "chainId" not in tx:
+            tx["chainId"] = self.web3.eth.chain_id
+        return tx
+
+    def _send(self, tx):
+        if self.signer is None:
+            return self.web3.eth.send_transaction(tx)
+        if hasattr(self.signer, "key"):
+            signed = self.signer.sign_transaction(tx)
+            return self.web3.eth.send_raw_transaction(signed.rawTransaction)
+
+        # Ape accounts sign the ecosystem's transaction objects, not dicts
+        ecosystem = self.signer.provider.network.ecosystem
+        signed = self.signer.sign_transaction(ecosystem.create_transaction(**tx))
+        if signed is None:
+            raise ValueError(f"{self.address} did not sign the transaction")
+        return self.web3.eth.send_raw_transaction(signed.serialize_transaction())
+
+    def submit(self, tx):
+        """
+        Send `tx` (a transaction dict or a bound contract function) with the
+        next nonce, first waiting for room in the pipeline.  Returns the
+        transaction's position in `receipts`.
+        """
+        while len(self.in_flight) >= self.max_in_flight:
+            self.poll()
+            if len(self.in_flight) >= self.max_in_flight:
+                time.sleep(self.poll_interval)
+
+        if self.started is None:
+            self.started = time.monotonic()
+
+        entry = InFlight(len(self.receipts), self._prepare(tx))
+        # A failed send leaves the nonce unused, so it is not consumed
+        entry.hashes.append(self._send(entry.tx))
+        entry.submitted = entry.sent = time.monotonic()
+
+        self.receipts.append(None)
+        self.in_flight[entry.tx["nonce"]] = entry
+        self.nonce += 1
+        return entry.index
+
+    def _receipt(self, tx_hash):
+        try:
+            return self.web3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    def poll(self):
+        """Collect receipts for everything in flight.  Returns how many."""
+        entries = list(self.in_flight.values())
+        hashes = [(entry, h) for entry in entries for h in entry.hashes]
+        found = self.pool.map(lambda pair: self._receipt(pair[1]), hashes)
+
+        done = 0
+        now = time.monotonic()
+        for (entry, _), receipt in zip(hashes, found):
+            if receipt is None or entry.receipt is not None:
+                continue
+            entry.receipt = receipt
+            self.receipts[entry.index] = receipt
+            self.latencies.append(now - entry.submitted)
+            if not receipt["status"]:
+                self.failed += 1
+            del self.in_flight[entry.tx["nonce"]]
+            done += 1
+
+        for entry in self.in_flight.values():
+            if now - entry.sent >= self.replace_after:
+                self.replace(entry)
+        return done
+
+    def replace(self, entry):
+        """Re-send a stuck transaction with the same nonce and higher fees"""
+        tx = dict(entry.tx)
+        current = self._fees()
+        for key in ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"):
+            if key in tx:
+                tx[key] = max(int(tx[key] * FEE_BUMP), current.get(key, 0))
+        if "maxPriorityFeePerGas" in tx:
+            # The tip can't exceed the fee cap, however they were bumped
+            tx["maxPriorityFeePerGas"] = min(
+                tx["maxPriorityFeePerGas"], tx["maxFeePerGas"]
+            )
+        fee = tx.get("maxFeePerGas", tx.get("gasPrice"))
+        if self.max_fee is not None and fee > self.max_fee:
+            # Can't outbid the stuck version without passing the cap
+            entry.sent = time.monotonic()
+            return False
+
+        try:
+            tx_hash = self._send(tx)
+        except ValueError:
+            # Most likely mined or replaced meanwhile; the next poll decides
+            entry.sent = time.monotonic()
+            return False
+        entry.tx = tx
+        entry.hashes.append(tx_hash)
+        entry.sent = time.monotonic()
+        self.replaced += 1
+        return True
+
+    def wait(self, timeout=None):
+        """Poll until nothing is in flight.  Returns the receipts in order."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.in_flight:
+            self.poll()
+            if not self.in_flight:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"{len(self.in_flight)} transactions still pending")
+            time.sleep(self.poll_interval)
+        return self.receipts
+
+    def run(self, transactions, timeout=None):
+        """Submit every transaction and wait for all of them"""
+        for tx in transactions:
+            self.submit(tx)
+        return self.wait(timeout)
+
+    def stats(self):
+        confirmed = len(self.latencies)
+        elapsed = 0 if self.started is None else time.monotonic() - self.started
+        return {
+            "submitted": len(self.receipts),
+            "confirmed": confirmed,
+            "failed": self.failed,
+            "in_flight": len(self.in_flight),
+            "replaced": self.replaced,
+            "elapsed": elapsed,
+            "tx_per_second": confirmed / elapsed if elapsed else None,
+            "latency_p50": _percentile(self.latencies, 0.5),
+            "latency_p95": _percentile(self.latencies, 0.95),
+            "latency_max": max(self.latencies, default=None),
+        }
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,236 @@
+"""
+Sweep plans for ingest endpoints.
+
+Endpoint balances are read in bulk through Multicall3, anything worth less
+than the gas it would take to collect is left behind, and the rest is packed
+into `IngestMaster.collectBatch(salts, assets, amounts)` transactions that fit
+a gas budget.  `collect` clones an endpoint with `cloneDeterministic` the
+first time it is swept, so endpoints without code yet are charged for the
+clone once, on their first item.  Which endpoints already have code is read
+with batched `eth_getCode` requests.  Gas figures come from `gas`.
+"""
+
+from collections import namedtuple
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from .gas import BASE_GAS, CLONE_GAS, ETH_TRANSFER_GAS, TOKEN_TRANSFER_GAS
+from .encoding import fixed_bytes
+from .multicall import (
+    GAS_LIMIT_SHARE,
+    Multicall,
+    batch_rpc,
+    call,
+    eth_balance_call,
+)
+from .registry import ERC20_ABI
+
+# IngestImpl's special case address for ETH
+ETH_ADDRESS = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+DEFAULT_SCAN_SIZE = 10000
+
+Balance = namedtuple("Balance", ["salt", "endpoint", "asset", "amount"])
+
+SweepItem = namedtuple(
+    "SweepItem", ["salt", "endpoint", "asset", "amount", "value", "gas", "clone"]
+)
+
+SweepBatch = namedtuple("SweepBatch", ["items", "gas", "value"])
+
+
+def asset_address(contracts, asset):
+    """Address for "eth", a console token name or a token address"""
+    if asset == "eth":
+        return ETH_ADDRESS
+    if asset.startswith("0x"):
+        return to_checksum_address(asset)
+    return to_checksum_address(contracts.address(asset))
+
+
+def collect_gas(asset, clone):
+    gas = ETH_TRANSFER_GAS if asset == ETH_ADDRESS else TOKEN_TRANSFER_GAS
+    return gas + CLONE_GAS if clone else gas
+
+
+def scan_balances(
+    contracts,
+    index,
+    assets=("eth", "ogn"),
+    block="latest",
+    multicall=None,
+    scan_size=DEFAULT_SCAN_SIZE,
+):
+    """
+    Non-zero balances of `assets` held by every endpoint in `index`, read
+    at one block.  Endpoints are scanned `scan_size` at a time so the call
+    list stays small for very large indexes.
+    """
+    web3 = contracts.web3
+    multicall = multicall or Multicall(web3)
+    block = multicall.resolve_block(block)
+    assets = [asset_address(contracts, a) for a in assets]
+    tokens = {
+        a: web3.eth.contract(address=a, abi=ERC20_ABI)
+        for a in assets
+        if a != ETH_ADDRESS
+    }
+
+    balances = []
+    for start in range(0, len(index), scan_size):
+        salts = index.salts[start : start + scan_size]
+        endpoints = [
+            to_checksum_address(fixed_bytes(a, 20))
+            for a in index.addresses[start : start + scan_size]
+        ]
+
+        calls = []
+        for endpoint in endpoints:
+            for asset in assets:
+                if asset == ETH_ADDRESS:
+                    calls.append(eth_balance_call(multicall.address, endpoint))
+                else:
+                    calls.append(call(tokens[asset], "balanceOf", endpoint))
+
+        results = iter(multicall(calls, block=block))
+        for salt, endpoint in zip(salts, endpoints):
+            for asset in assets:
+                amount = next(results)
+                if amount:
+                    balances.append(
+                        Balance(fixed_bytes(salt, 32), endpoint, asset, amount)
+                    )
+
+    return balances
+
+
+def deployed(web3, addresses, block="latest"):
+    """The subset of `addresses` that already have code at `block`"""
+    addresses = list(addresses)
+    if not isinstance(block, str):
+        block = hex(block)
+    codes = batch_rpc(web3, "eth_getCode", [[a, block] for a in addresses])
+    return {a for a, code in zip(addresses, codes) if len(HexBytes(code))}
+
+
+def sweep_items(balances, cloned, gas_price, prices=None):
+    """
+    Price each balance and drop dust.
+
+    `prices` maps token address -> wei per token base unit; ETH is always
+    1.  Returns (items, dust, unpriced).  Items are grouped by endpoint,
+    richest endpoint first, so an endpoint's clone is paid for by the first
+    of its items and the rest ride on it.
+    """
+    prices = {to_checksum_address(k): v for k, v in (prices or {}).items()}
+    prices[ETH_ADDRESS] = 1
+
+    by_endpoint = {}
+    unpriced = []
+    for balance in balances:
+        price = prices.get(balance.asset)
+        if price is None:
+            unpriced.append(balance)
+            continue
+        by_endpoint.setdefault(balance.endpoint, []).append(
+            (int(balance.amount * price), balance)
+        )
+
+    items = []
+    dust = []
+    for endpoint, priced in sorted(
+        by_endpoint.items(), key=lambda kv: -sum(value for value, _ in kv[1])
+    ):
+        clone = endpoint not in cloned
+        for value, balance in sorted(priced, key=lambda p: -p[0]):
+            gas = collect_gas(balance.asset, clone)
+            if value <= gas * gas_price:
+                dust.append(balance)
+                continue
+            items.append(SweepItem(*balance, value, gas, clone))
+            clone = False
+
+    return items, dust, unpriced
+
+
+def pack_batches(items, gas_budget):
+    """Greedily pack items, in order, into batches under `gas_budget`"""
+    batches = []
+    current = []
+    used = BASE_GAS
+
+    for item in items:
+        if current and used + item.gas > gas_budget:
+            batches.append(SweepBatch(current, used, sum(i.value for i in current)))
+            current = []
+            used = BASE_GAS
+        current.append(item)
+        used += item.gas
+
+    if current:
+        batches.append(SweepBatch(current, used, sum(i.value for i in current)))
+
+    return batches
+
+
+def batch_args(batch):
+    """`collectBatch` arguments for a batch"""
+    return (
+        [item.salt for item in batch.items],
+        [item.asset for item in batch.items],
+        [item.amount for item in batch.items],
+    )
+
+
+def plan_sweep(
+    contracts,
+    index,
+    assets=("eth", "ogn"),
+    prices=None,
+    gas_price=None,
+    gas_budget=None,
+    block="latest",
+    multicall=None,
+):
+    """
+    Plan the collectBatch transactions that sweep `index`.
+
+    `gas_budget` defaults to a share of the block gas limit and `gas_price`
+    to the node's current price.  Returns a dict with the `batches`, the
+    balances left as `dust` or `unpriced`, and totals.
+    """
+    web3 = contracts.web3
+    multicall = multicall or Multicall(web3)
+    block = multicall.resolve_block(block)
+    if gas_price is None:
+        gas_price = web3.eth.gas_price
+    if gas_budget is None:
+        gas_budget = int(web3.eth.get_block(block)["gasLimit"] * GAS_LIMIT_SHARE)
+
+    balances = scan_balances(contracts, index, assets, block, multicall)
+    cloned = deployed(web3, {b.endpoint for b in balances}, block)
+    items, dust, unpriced = sweep_items(balances, cloned, gas_price, prices)
+    batches = pack_batches(items, gas_budget)
+
+    return {
+        "block": block,
+        "gas_price": gas_price,
+        "batches": batches,
+        "dust": dust,
+        "unpriced": unpriced,
+        "gas": sum(b.gas for b in batches),
+        "value": sum(b.value for b in batches),
+        "clones": sum(1 for i in items if i.clone),
+    }
+
+
+def batch_transactions(contracts, plan, sender):
+    """Unsigned collectBatch transactions for a plan, one per batch"""
+    master = contracts.contract("ingest_master")
+    return [
+        master.functions.collectBatch(*batch_args(batch)).build_transaction(
+            {"from": sender, "gasPrice": plan["gas_price"]}
+        )
+        for batch in plan["batches"]
+    ]
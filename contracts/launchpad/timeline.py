@@ -0,0 +1,200 @@
+"""
+Offline model of the SeriesV2 season indexes.
+
+SeriesV2 only moves `currentStakingIndex` and `currentClaimingIndex` when
+someone stakes, unstakes or claims, so `expectedStakingSeason()`,
+`expectedClaimingSeason()` and `liveSeason()` all depend on season times
+read over RPC.  Season times are immutable, so this keeps them in sorted
+arrays and answers the same questions with a bisect.  Only the two stored
+indexes are state; they are read once (or tracked with `advance()`).  The
+season order is the Series' own `seasons` array, so the indexes always
+refer to the seasons they were read for.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+
+from web3.exceptions import ContractLogicError
+
+from .points import SeasonModel
+
+PRE_STAKE = "pre-stake"
+ACTIVE = "active"
+LOCKED = "locked"
+CLAIM = "claim"
+ENDED = "ended"
+
+TimelineState = namedtuple(
+    "TimelineState",
+    [
+        "timestamp",
+        "staking_index",
+        "claiming_index",
+        "live_index",
+        "bootstrap",
+        "staking_phase",
+        "claiming_phase",
+    ],
+)
+
+
+def season_phase(model, timestamp):
+    """Where `timestamp` falls in one season's schedule"""
+    if timestamp < model.start_time:
+        return PRE_STAKE
+    if timestamp < model.lock_start_time:
+        return ACTIVE
+    if timestamp < model.end_time:
+        return LOCKED
+    if timestamp < model.claim_end_time:
+        return CLAIM
+    return ENDED
+
+
+def season_model(contracts, name):
+    """SeasonModel from deployment args, or from the contract if unknown"""
+    args = contracts.deploy_args(name)
+    if args and len(args) == 5:
+        return SeasonModel(*args[1:])
+    return SeasonModel.from_contract(contracts.contract(name))
+
+
+def series_seasons(contracts, block="latest"):
+    """Addresses in the Series' `seasons` array, in order"""
+    series = contracts.contract("series").functions
+    seasons = []
+    while True:
+        try:
+            seasons.append(series.seasons(len(seasons)).call(block_identifier=block))
+        except ContractLogicError:
+            # Reading past the end reverts
+            return seasons
+
+
+class SeriesTimeline:
+    """
+    Seasons in Series order, with the stored staking and claiming indexes.
+    `seasons` is a list of (name, SeasonModel).
+    """
+
+    def __init__(self, seasons, staking_index=0, claiming_index=0):
+        if not seasons:
+            raise ValueError("A timeline needs at least one season")
+        self.names = [name for name, _ in seasons]
+        self.models = [model for _, model in seasons]
+        self.starts = [m.start_time for m in self.models]
+        self.locks = [m.lock_start_time for m in self.models]
+        self.claim_ends = [m.claim_end_time for m in self.models]
+        self.staking_index = staking_index
+        self.claiming_index = claiming_index
+
+    @classmethod
+    def from_registry(cls, contracts, staking_index=None, claiming_index=None):
+        """
+        Build from the Series' seasons, named after the network's season
+        deployments (seasons without one are named by address).  Indexes
+        not given are read from the Series at the same block.
+        """
+        web3 = contracts.web3
+        block = web3.eth.block_number
+        names = {
+            web3.to_checksum_address(contracts.address(name)): name
+            for name in contracts.seasons()
+        }
+        seasons = []
+        for address in series_seasons(contracts, block):
+            name = names.get(web3.to_checksum_address(address))
+            if name is not None:
+                seasons.append((name, season_model(contracts, name)))
+            else:
+                season = web3.eth.contract(
+                    address=address, abi=contracts.abi(contracts.seasons()[-1])
+                )
+                seasons.append((address, SeasonModel.from_contract(season)))
+        if not seasons:
+            raise ValueError("The Series has no seasons")
+
+        timeline = cls(seasons)
+        if staking_index is None or claiming_index is None:
+            timeline.sync(contracts, block)
+        if staking_index is not None:
+            timeline.staking_index = staking_index
+        if claiming_index is not None:
+            timeline.claiming_index = claiming_index
+        return timeline
+
+    def __len__(self):
+        return len(self.models)
+
+    def sync(self, contracts, block="latest"):
+        """Refresh the stored indexes from the Series"""
+        series = contracts.contract("series").functions
+        self.staking_index = series.currentStakingIndex().call(block_identifier=block)
+        self.claiming_index = series.currentClaimingIndex().call(block_identifier=block)
+
+    def expected_staking(self, timestamp):
+        """Index `stake()` would use: `expectedStakingSeason()`"""
+        i = self.staking_index
+        if timestamp >= self.locks[i] and len(self) > i + 1:
+            return i + 1
+        return i
+
+    def expected_claiming(self, timestamp):
+        """Index `claim()`/`unstake()` would use: `expectedClaimingSeason()`"""
+        i = self.claiming_index
+        if timestamp >= self.claim_ends[i] and len(self) > i + 1:
+            return i + 1
+        return i
+
+    def would_bootstrap(self, timestamp):
+        """Whether a stake at `timestamp` advances, bootstrapping a season"""
+        return self.expected_staking(timestamp) != self.staking_index
+
+    def live(self, timestamp):
+        """`liveSeason()`: the latest season that has started"""
+        if len(self) <= 1:
+            return 0
+        i = bisect_right(self.starts, timestamp)
+        return i - 1 if i else self.staking_index
+
+    def settled_staking(self, timestamp):
+        """
+        Staking index once every boundary up to `timestamp` has been
+        crossed by some stake, i.e. ignoring how lazily Series advanced.
+        """
+        return min(bisect_right(self.locks, timestamp), len(self) - 1)
+
+    def settled_claiming(self, timestamp):
+        """Claiming index counterpart of `settled_staking`"""
+        return min(bisect_right(self.claim_ends, timestamp), len(self) - 1)
+
+    def phase(self, index, timestamp):
+        return season_phase(self.models[index], timestamp)
+
+    def at(self, timestamp):
+        """Everything a stake or claim at `timestamp` would see"""
+        staking = self.expected_staking(timestamp)
+        claiming = self.expected_claiming(timestamp)
+        return TimelineState(
+            timestamp,
+            staking,
+            claiming,
+            self.live(timestamp),
+            staking != self.staking_index,
+            self.phase(staking, timestamp),
+            self.phase(claiming, timestamp),
+        )
+
+    def advance(self, timestamp, staking=True, claiming=False):
+        """
+        Apply the index moves of a transaction mined at `timestamp`:
+        `stake()` acquires the staking season, `claim()` the claiming
+        season and `unstake()` the claiming season.
+        """
+        if staking:
+            self.staking_index = self.expected_staking(timestamp)
+        if claiming:
+            self.claiming_index = self.expected_claiming(timestamp)
+
+    def season(self, index):
+        return self.names[index]
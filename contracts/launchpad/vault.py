@@ -0,0 +1,353 @@
+"""
+FeeVault cash-flow ledger.
+
+Outflows are the vault's `RewardsSent` events, each attributed to the season
+whose claim period it was paid in (claim periods never overlap).  OGN
+inflows and any OGN sent out without `RewardsSent` (`recoverERC20`) come
+from OGN `Transfer` logs.  The vault's `receive()` emits nothing, so ETH
+inflows are derived from balance changes: between two ledger blocks,
+`inflow = balance change + ETH rewards sent`.  The balance is also read just
+before every `Finale`, so each season's snapshot can be reconciled against
+the ledger.
+
+Only blocks `confirmations` deep are added, and each sync only reads what
+happened since the last one.
+"""
+
+import sqlite3
+from collections import namedtuple
+from pathlib import Path
+
+from eth_utils import to_checksum_address
+
+from .blocktime import BlockTimeIndex
+from .encoding import address_topic, hex_str
+from .indexer import DEFAULT_CONFIRMATIONS, EventIndexer
+from .logs import LogPager
+from .registry import CACHE_DIR
+from .sweep import ETH_ADDRESS
+from .timeline import season_model
+from .vouchers import TRANSFER_TOPIC
+
+INFLOW = "inflow"
+REWARD = "reward"
+OTHER_OUT = "other_out"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    block INTEGER NOT NULL,
+    eth_balance TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flows (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    asset TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    season TEXT,
+    counterparty TEXT,
+    transaction_hash TEXT,
+    PRIMARY KEY (block, log_index, asset, kind)
+);
+CREATE TABLE IF NOT EXISTS finales (
+    season TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    reward_eth TEXT NOT NULL,
+    reward_ogn TEXT NOT NULL,
+    ledger_eth TEXT NOT NULL,
+    ledger_ogn TEXT NOT NULL
+);
+"""
+
+# log_index for derived ETH inflow rows, after any real log in the block
+DERIVED_LOG_INDEX = 1 << 30
+
+SeasonCashflow = namedtuple(
+    "SeasonCashflow",
+    [
+        "season",
+        "snapshot_eth",
+        "snapshot_ogn",
+        "claimed_eth",
+        "claimed_ogn",
+        "remaining_eth",
+        "remaining_ogn",
+        "ledger_eth",
+        "ledger_ogn",
+    ],
+)
+
+
+class VaultLedger:
+    def __init__(
+        self,
+        contracts,
+        path=None,
+        indexer=None,
+        blocks=None,
+        pager=None,
+        confirmations=DEFAULT_CONFIRMATIONS,
+    ):
+        self.contracts = contracts
+        self.web3 = contracts.web3
+        self.vault = to_checksum_address(contracts.address("vault"))
+        self.ogn = to_checksum_address(contracts.address("ogn"))
+        self.indexer = indexer or EventIndexer(contracts, confirmations=confirmations)
+        self.blocks = blocks or BlockTimeIndex.for_contracts(contracts)
+        self.pager = pager or LogPager(self.web3)
+        self.confirmations = confirmations
+        self.models = {
+            name: season_model(contracts, name) for name in contracts.seasons()
+        }
+
+        if path is None:
+            path = Path(CACHE_DIR) / f"{contracts.network}-vault.sqlite"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def checkpoint(self):
+        """(block, ETH balance) the ledger is complete up to"""
+        row = self.db.execute(
+            "SELECT block, eth_balance FROM checkpoint WHERE id = 0"
+        ).fetchone()
+        if row:
+            return row[0], int(row[1])
+
+        start = (self.contracts.deploy_block("vault") or 1) - 1
+        return start, self.web3.eth.get_balance(self.vault, block_identifier=start)
+
+    def claim_season(self, block):
+        """Season whose claim period includes `block`, if any"""
+        timestamp = self.blocks.timestamp(block)
+        for name, model in self.models.items():
+            if model.end_time <= timestamp < model.claim_end_time:
+                return name
+        return None
+
+    def _rewards(self, from_block, to_block):
+        rows = []
+        for event in self.indexer.events(
+            "vault", "RewardsSent", from_block=from_block, to_block=to_block
+        ):
+            args = event["args"]
+            rows.append(
+                (
+                    event["block_number"],
+                    event["log_index"],
+                    to_checksum_address(args["asset"]),
+                    REWARD,
+                    int(args["amount"]),
+                    self.claim_season(event["block_number"]),
+                    args["toAddress"],
+                    event["transaction_hash"],
+                )
+            )
+        return rows
+
+    def _ogn_transfers(self, from_block, to_block, rewards):
+        paid = {
+            (tx, counterparty, amount)
+            for _, _, asset, _, amount, _, counterparty, tx in rewards
+            if asset == self.ogn
+        }
+        vault_topic = address_topic(self.vault)
+        rows = []
+        for topics, kind in (
+            ([TRANSFER_TOPIC, None, vault_topic], INFLOW),
+            ([TRANSFER_TOPIC, vault_topic], OTHER_OUT),
+        ):
+            params = {"address": self.ogn, "topics": topics}
+            for log in self.pager.iter_logs(params, from_block, to_block):
+                side = 1 if kind == INFLOW else 2
+                counterparty = to_checksum_address(log["topics"][side][-20:])
+                amount = int(hex_str(log["data"]), 16)
+                tx = hex_str(log["transactionHash"])
+                if kind == OTHER_OUT and (tx, counterparty, amount) in paid:
+                    continue
+                rows.append(
+                    (
+                        log["blockNumber"],
+                        log["logIndex"],
+                        self.ogn,
+                        kind,
+                        amount,
+                        None,
+                        counterparty,
+                        tx,
+                    )
+                )
+        return rows
+
+    def _finales(self, from_block, to_block):
+        finales = []
+        for name in self.models:
+            for event in self.indexer.events(
+                name, "Finale", from_block=from_block, to_block=to_block
+            ):
+                finales.append((event["block_number"], name, event["args"]))
+        return sorted(finales)
+
+    def _ledger_balance(self, asset, block):
+        total = 0
+        for kind, amount in self.db.execute(
+            "SELECT kind, amount FROM flows WHERE asset = ? AND block <= ?",
+            (asset, block),
+        ):
+            total += int(amount) if kind == INFLOW else -int(amount)
+        return total
+
+    def sync(self, to_block="latest"):
+        """Add everything up to `to_block` less the confirmation depth"""
+        head = self.web3.eth.get_block(to_block)["number"] - self.confirmations
+        start, eth_balance = self.checkpoint()
+        if head <= start:
+            return 0
+
+        # The index is shared; sync it to the chain head rather than back to
+        # the confirmed head, and only read it up to `head`
+        if self.indexer.indexed_block() < head:
+            self.indexer.sync()
+        rewards = self._rewards(start + 1, head)
+        rows = rewards + self._ogn_transfers(start + 1, head, rewards)
+
+        if not self.db.execute("SELECT 1 FROM checkpoint").fetchone():
+            # Anything the vault held before the ledger starts
+            ogn = self.contracts.contract("ogn").functions.balanceOf(self.vault)
+            for asset, amount in (
+                (ETH_ADDRESS, eth_balance),
+                (self.ogn, ogn.call(block_identifier=start)),
+            ):
+                if amount:
+                    rows.append(
+                        (start, DERIVED_LOG_INDEX, asset, INFLOW, amount)
+                        + (None, None, None)
+                    )
+
+        # ETH inflows per segment, cut just before each Finale
+        finales = self._finales(start + 1, head)
+        cuts = sorted({block - 1 for block, _, _ in finales if block - 1 > start})
+        segment_start = start
+        for cut in cuts + [head]:
+            balance = self.web3.eth.get_balance(self.vault, block_identifier=cut)
+            sent = sum(
+                r[4]
+                for r in rewards
+                if r[2] == ETH_ADDRESS and segment_start < r[0] <= cut
+            )
+            inflow = balance - eth_balance + sent
+            if inflow:
+                rows.append(
+                    (
+                        cut,
+                        DERIVED_LOG_INDEX,
+                        ETH_ADDRESS,
+                        INFLOW if inflow > 0 else OTHER_OUT,
+                        abs(inflow),
+                        None,
+                        None,
+                        None,
+                    )
+                )
+            segment_start, eth_balance = cut, balance
+
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO flows VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [r[:4] + (str(r[4]),) + r[5:] for r in rows],
+            )
+            for block, name, args in finales:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO finales VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        name,
+                        block,
+                        str(args["totalRewardETH"]),
+                        str(args["totalRewardOGN"]),
+                        str(self._ledger_balance(ETH_ADDRESS, block - 1)),
+                        str(self._ledger_balance(self.ogn, block - 1)),
+                    ),
+                )
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoint VALUES (0, ?, ?)",
+                (head, str(eth_balance)),
+            )
+
+        return len(rows)
+
+    def flows(self, asset=None, from_block=0, to_block=None):
+        """Ledger rows as dicts, in chain order"""
+        query = "SELECT * FROM flows WHERE block >= ?"
+        params = [from_block]
+        if to_block is not None:
+            query += " AND block <= ?"
+            params.append(to_block)
+        if asset is not None:
+            query += " AND asset = ?"
+            params.append(ETH_ADDRESS if asset == "eth" else to_checksum_address(asset))
+        query += " ORDER BY block, log_index"
+
+        keys = (
+            "block",
+            "log_index",
+            "asset",
+            "kind",
+            "amount",
+            "season",
+            "counterparty",
+            "transaction_hash",
+        )
+        for row in self.db.execute(query, params):
+            record = dict(zip(keys, row))
+            record["amount"] = int(record["amount"])
+            yield record
+
+    def balances(self, block=None):
+        """Vault balance per asset according to the ledger"""
+        block = self.checkpoint()[0] if block is None else block
+        return {
+            "eth": self._ledger_balance(ETH_ADDRESS, block),
+            "ogn": self._ledger_balance(self.ogn, block),
+        }
+
+    def seasons(self):
+        """
+        Per season: the Finale snapshot, how much of it has been claimed and
+        what is left, and the ledger's vault balance just before the Finale
+        (which should equal the snapshot).
+        """
+        claimed = {}
+        for season, asset, amount in self.db.execute(
+            "SELECT season, asset, amount FROM flows "
+            "WHERE kind = ? AND season IS NOT NULL",
+            (REWARD,),
+        ):
+            key = (season, "eth" if asset == ETH_ADDRESS else "ogn")
+            claimed[key] = claimed.get(key, 0) + int(amount)
+
+        report = []
+        for name, _, eth, ogn, ledger_eth, ledger_ogn in self.db.execute(
+            "SELECT * FROM finales ORDER BY block"
+        ):
+            eth, ogn = int(eth), int(ogn)
+            claimed_eth = claimed.get((name, "eth"), 0)
+            claimed_ogn = claimed.get((name, "ogn"), 0)
+            report.append(
+                SeasonCashflow(
+                    name,
+                    eth,
+                    ogn,
+                    claimed_eth,
+                    claimed_ogn,
+                    eth - claimed_eth,
+                    ogn - claimed_ogn,
+                    int(ledger_eth),
+                    int(ledger_ogn),
+                )
+            )
+        return report
+
+    def close(self):
+        self.db.close()
+        self.indexer.close()
@@ -0,0 +1,486 @@
+"""
+Mint vouchers for OriginERC721a_v3 and OriginERC721V6.
+
+Both contracts' `mint()` recover a MINTER_ROLE signature over
+
+    keccak256(abi.encode(chainid, contract, msgSender, to, count, price,
+                         mintLimit, expires))
+
+wrapped in `ECDSA.toEthSignedMessageHash`.  Every field is a static type, so
+`abi.encode` is just 32-byte words and the (chainid, contract) prefix is
+encoded once per drop.  Signing is spread across a process pool and written
+to disk as JSON lines while it runs, and audited the same way before a drop
+goes live: the audit streams the raw lines to the workers and only builds
+records for the vouchers that fail.  Install `coincurve` so eth-keys uses
+libsecp256k1 rather than its pure-Python backend.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_hash.auto import keccak
+from eth_keys import keys
+from eth_utils import decode_hex, encode_hex, to_checksum_address
+
+from .logs import LogPager
+
+Voucher = namedtuple(
+    "Voucher", ["sender", "to", "count", "price", "mint_limit", "expires"]
+)
+
+ETH_SIGNED_PREFIX = b"\x19Ethereum Signed Message:\n32"
+
+TRANSFER_TOPIC = encode_hex(keccak(b"Transfer(address,address,uint256)"))
+ZERO_TOPIC = "0x" + "00" * 32
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Failing vouchers kept per category in an audit report
+AUDIT_SAMPLES = 20
+
+# ECDSA.recover rejects signatures with s in the upper half of the curve
+# order, so each signature has a single valid form
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+MAX_S = SECP256K1_N // 2
+
+MINTER_ABI = [
+    {
+        "inputs": [],
+        "name": "MINTER_ROLE",
+        "outputs": [{"name": "", "type": "bytes32"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "role", "type": "bytes32"},
+            {"name": "account", "type": "address"},
+        ],
+        "name": "hasRole",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "maxSupply",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+def _word(value):
+    return int(value).to_bytes(32, "big")
+
+
+def _address_word(address):
+    return b"\x00" * 12 + decode_hex(address)
+
+
+def domain_prefix(chain_id, contract):
+    """abi.encode(block.chainid, address(this))"""
+    return _word(chain_id) + _address_word(contract)
+
+
+def message_hash(prefix, voucher):
+    """The `msgHash` a contract computes for `voucher`"""
+    return keccak(
+        prefix
+        + _address_word(voucher.sender)
+        + _address_word(voucher.to)
+        + _word(voucher.count)
+        + _word(voucher.price)
+        + _word(voucher.mint_limit)
+        + _word(voucher.expires)
+    )
+
+
+def signed_message_hash(prefix, voucher):
+    """`ECDSA.toEthSignedMessageHash(msgHash)`"""
+    return keccak(ETH_SIGNED_PREFIX + message_hash(prefix, voucher))
+
+
+def signature_bytes(signature):
+    # ECDSA.recover expects v as 27/28
+    r, s, v = signature.r, signature.s, signature.v
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + 27])
+
+
+# Per-process signing state, set up by _init_signer
+_signer = {}
+
+
+def _init_signer(private_key, prefix):
+    _signer["key"] = keys.PrivateKey(decode_hex(private_key))
+    _signer["prefix"] = prefix
+
+
+def _sign_chunk(chunk):
+    key = _signer["key"]
+    prefix = _signer["prefix"]
+    return [
+        encode_hex(
+            signature_bytes(
+                key.sign_msg_hash(signed_message_hash(prefix, Voucher(*voucher)))
+            )
+        )
+        for voucher in chunk
+    ]
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def voucher_record(voucher, sig):
+    return {
+        "sender": voucher.sender,
+        "to": voucher.to,
+        "count": voucher.count,
+        "price": str(voucher.price),
+        "mintLimit": voucher.mint_limit,
+        "expires": voucher.expires,
+        "sig": sig,
+    }
+
+
+def read_vouchers(path, default_sender=None):
+    """
+    Read vouchers from a CSV with columns to, count, price, mint_limit,
+    expires and optionally sender (defaults to `default_sender` or `to`).
+    """
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            to = to_checksum_address(row["to"])
+            sender = row.get("sender") or default_sender or to
+            yield Voucher(
+                to_checksum_address(sender),
+                to,
+                int(row["count"]),
+                int(row["price"]),
+                int(row["mint_limit"]),
+                int(row["expires"]),
+            )
+
+
+def minted_counts(web3, contract, from_block=0, to_block="latest", pager=None):
+    """
+    Tokens minted to each address so far, from mint Transfer logs.
+
+    Neither contract exposes `numberMinted`, but both only mint through
+    `mint()`, which emits one Transfer from the zero address per token, so
+    this matches `_numberMinted`/`_mintCount`.
+    """
+    pager = pager or LogPager(web3)
+    if isinstance(to_block, str):
+        to_block = web3.eth.get_block(to_block)["number"]
+
+    params = {
+        "address": to_checksum_address(contract),
+        "topics": [TRANSFER_TOPIC, ZERO_TOPIC],
+    }
+    counts = Counter()
+    for log in pager.iter_logs(params, from_block, to_block):
+        counts[to_checksum_address(log["topics"][2][-20:])] += 1
+    return counts
+
+
+def check_limits(vouchers, minted):
+    """
+    Split vouchers into those that can still be minted and those that
+    would fail `Max mint limit`, given `minted` counts per address.
+    Vouchers are taken in order, and those kept count towards the limit of
+    later ones for the same address.
+    """
+    counts = Counter({to_checksum_address(a): n for a, n in minted.items()})
+    ok = []
+    rejected = []
+    for voucher in vouchers:
+        to = to_checksum_address(voucher.to)
+        if counts[to] + voucher.count > voucher.mint_limit:
+            rejected.append(voucher)
+        else:
+            counts[to] += voucher.count
+            ok.append(voucher)
+    return ok, rejected
+
+
+def sign_vouchers(
+    private_key,
+    chain_id,
+    contract,
+    vouchers,
+    out_path,
+    processes=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    progress=None,
+):
+    """
+    Sign `vouchers` for `contract` and stream them to `out_path` as JSON
+    lines, in input order.  `progress(signed, per_sec)` is called after every
+    chunk.  Returns the count signed and vouchers/sec.
+    """
+    prefix = domain_prefix(chain_id, to_checksum_address(contract))
+    start = time.perf_counter()
+    signed = 0
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_signer,
+        initargs=(private_key, prefix),
+    ) as pool, open(out_path, "w") as out:
+        # Bound the chunks in flight so memory stays flat for huge drops
+        window = []
+        max_window = 2 * (processes or os.cpu_count() or 1)
+
+        def drain():
+            nonlocal signed
+            chunk, future = window.pop(0)
+            for voucher, sig in zip(chunk, future.result()):
+                out.write(json.dumps(voucher_record(voucher, sig)) + "\n")
+            signed += len(chunk)
+            if progress:
+                progress(signed, signed / (time.perf_counter() - start))
+
+        for chunk in _chunks(vouchers, chunk_size):
+            window.append((chunk, pool.submit(_sign_chunk, [tuple(v) for v in chunk])))
+            if len(window) >= max_window:
+                drain()
+
+        while window:
+            drain()
+
+    elapsed = time.perf_counter() - start
+    return {"signed": signed, "per_sec": signed / elapsed if elapsed else 0.0}
+
+
+def read_signed(path):
+    """Stream (Voucher, sig) pairs from a sign_vouchers() output file"""
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            voucher = Voucher(
+                record["sender"],
+                record["to"],
+                int(record["count"]),
+                int(record["price"]),
+                int(record["mintLimit"]),
+                int(record["expires"]),
+            )
+            yield voucher, record["sig"]
+
+
+def _init_auditor(prefix, now, max_supply):
+    _signer["prefix"] = prefix
+    _signer["now"] = now
+    _signer["max_supply"] = max_supply
+
+
+def _check_fields(voucher, now, max_supply):
+    if voucher.count == 0:
+        return "zero_count"
+    if voucher.expires < now:
+        return "expired"
+    if voucher.count > voucher.mint_limit:
+        return "count_over_mint_limit"
+    if voucher.count > max_supply or voucher.mint_limit > max_supply:
+        return "over_max_supply"
+    return None
+
+
+def _parse_row(row):
+    """(Voucher, sig) from a JSON line or a (fields, sig) pair"""
+    if isinstance(row, str):
+        record = json.loads(row)
+        return (
+            Voucher(
+                record["sender"],
+                record["to"],
+                int(record["count"]),
+                int(record["price"]),
+                int(record["mintLimit"]),
+                int(record["expires"]),
+            ),
+            record["sig"],
+        )
+    fields, sig = row
+    return Voucher(*fields), sig
+
+
+def _row_record(row):
+    """The voucher_record of a row, for reports"""
+    if isinstance(row, str):
+        try:
+            return json.loads(row)
+        except ValueError:
+            return {"line": row}
+    fields, sig = row
+    return voucher_record(Voucher(*fields), sig)
+
+
+def _recover(prefix, voucher, sig):
+    raw = decode_hex(sig)
+    if len(raw) != 65 or raw[64] not in (27, 28):
+        raise ValueError(sig)
+    r = int.from_bytes(raw[:32], "big")
+    s = int.from_bytes(raw[32:64], "big")
+    if s > MAX_S:
+        return None
+    signature = keys.Signature(vrs=(raw[64] - 27, r, s))
+    return signature.recover_public_key_from_msg_hash(
+        signed_message_hash(prefix, voucher)
+    ).to_checksum_address()
+
+
+def _audit_chunk(chunk):
+    """
+    Audit raw rows.  Returns the signer counts, (position, category) of
+    every failure, and the positions of each signer's first few vouchers.
+    """
+    prefix = _signer["prefix"]
+    now = _signer["now"]
+    max_supply = _signer["max_supply"]
+    signers = Counter()
+    failures = []
+    firsts = {}
+
+    for i, row in enumerate(chunk):
+        try:
+            voucher, sig = _parse_row(row)
+        except (ValueError, KeyError, TypeError):
+            failures.append((i, "bad_record"))
+            continue
+
+        try:
+            signer = _recover(prefix, voucher, sig)
+        except Exception:
+            failures.append((i, "bad_signature"))
+            continue
+        if signer is None:
+            failures.append((i, "high_s"))
+            continue
+
+        signers[signer] += 1
+        positions = firsts.setdefault(signer, [])
+        if len(positions) < AUDIT_SAMPLES:
+            positions.append(i)
+
+        category = _check_fields(voucher, now, max_supply)
+        if category is not None:
+            failures.append((i, category))
+
+    return signers, failures, firsts
+
+
+def _signed_rows(signed):
+    """Raw JSON lines of a sign_vouchers() file, or (fields, sig) pairs"""
+    if isinstance(signed, (str, os.PathLike)):
+        with open(signed) as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    else:
+        for voucher, sig in signed:
+            yield tuple(voucher), sig
+
+
+def audit_vouchers(
+    web3,
+    contract,
+    signed,
+    now=None,
+    processes=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    Check `signed` against a deployed collection: every signature must be
+    in low-s form and recover to a MINTER_ROLE holder, and `expires`,
+    `count`, `mintLimit` and `maxSupply` must be consistent.  `signed` is
+    the path of a sign_vouchers() output file, whose lines go to the
+    workers unparsed, or an iterable of (Voucher, sig) pairs.
+
+    Returns a report with failure counts per category and a few sample
+    failures for each.
+    """
+    contract = to_checksum_address(contract)
+    nft = web3.eth.contract(address=contract, abi=MINTER_ABI)
+    chain_id = web3.eth.chain_id
+    role = nft.functions.MINTER_ROLE().call()
+    max_supply = nft.functions.maxSupply().call()
+    if now is None:
+        now = web3.eth.get_block("latest")["timestamp"]
+
+    prefix = domain_prefix(chain_id, contract)
+    failures = Counter()
+    samples = {}
+    signers = Counter()
+    signer_samples = {}
+    checked = 0
+    start = time.perf_counter()
+
+    def fail(category, row):
+        failures[category] += 1
+        bucket = samples.setdefault(category, [])
+        if len(bucket) < AUDIT_SAMPLES:
+            bucket.append(_row_record(row))
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_auditor,
+        initargs=(prefix, now, max_supply),
+    ) as pool:
+        window = []
+        max_window = 2 * (processes or os.cpu_count() or 1)
+
+        def drain():
+            nonlocal checked
+            chunk, future = window.pop(0)
+            chunk_signers, chunk_failures, firsts = future.result()
+            signers.update(chunk_signers)
+            for signer, positions in firsts.items():
+                bucket = signer_samples.setdefault(signer, [])
+                for i in positions[: AUDIT_SAMPLES - len(bucket)]:
+                    bucket.append(_row_record(chunk[i]))
+            for i, category in chunk_failures:
+                fail(category, chunk[i])
+            checked += len(chunk)
+
+        for chunk in _chunks(_signed_rows(signed), chunk_size):
+            window.append((chunk, pool.submit(_audit_chunk, chunk)))
+            if len(window) >= max_window:
+                drain()
+
+        while window:
+            drain()
+
+    # Only a handful of distinct signers, so check roles once each
+    for signer, count in signers.items():
+        if not nft.functions.hasRole(role, signer).call():
+            failures["not_minter"] += count
+            bucket = samples.setdefault("not_minter", [])
+            bucket.extend(signer_samples[signer][: AUDIT_SAMPLES - len(bucket)])
+
+    elapsed = time.perf_counter() - start
+    return {
+        "checked": checked,
+        "failed": sum(failures.values()),
+        "failures": dict(failures),
+        "samples": samples,
+        "signers": dict(signers),
+        "per_sec": checked / elapsed if elapsed else 0.0,
+    }
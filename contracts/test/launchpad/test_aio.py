@@ -0,0 +1,45 @@
+"""AsyncContracts sessions against a minimal local JSON-RPC server"""
+
+import asyncio
+import json
+
+from aiohttp import web
+
+from launchpad.aio import AsyncContracts
+
+
+async def _serve():
+    async def rpc(request):
+        body = json.loads(await request.read())
+        return web.json_response(
+            {"jsonrpc": "2.0", "id": body["id"], "result": "0x7a69"}
+        )
+
+    app = web.Application()
+    app.router.add_post("/", rpc)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_reopening_keeps_the_configured_session():
+    async def run():
+        runner, uri = await _serve()
+        actx = AsyncContracts(None, uri=uri, pool_size=7, timeout=5)
+        try:
+            for _ in range(2):
+                await actx.open()
+                session = actx.session
+                assert await actx.web3.eth.chain_id == 31337
+                assert actx.web3.provider.session is session
+                assert session.connector.limit == 7
+                assert session.timeout.total == 5
+                await actx.close()
+                assert session.closed
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
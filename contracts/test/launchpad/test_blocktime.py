@@ -0,0 +1,47 @@
+"""BlockTimeIndex lookups on a fixed chain of headers"""
+
+import pytest
+
+from launchpad.blocktime import BlockTimeIndex
+
+# Mostly 12s blocks, with a gap and two blocks sharing a timestamp
+TIMESTAMPS = [1000 + 12 * n for n in range(50)] + [1700, 1700, 1712, 1800]
+
+
+class Eth:
+    def get_block(self, number):
+        if number == "latest":
+            number = len(TIMESTAMPS) - 1
+        return {"number": number, "timestamp": TIMESTAMPS[number]}
+
+
+class Chain:
+    eth = Eth()
+
+
+def reference(timestamp):
+    blocks = [n for n, t in enumerate(TIMESTAMPS) if t <= timestamp]
+    return blocks[-1] if blocks else None
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BlockTimeIndex(Chain(), tmp_path / "blocks.sqlite", confirmations=0)
+    yield index
+    index.close()
+
+
+def test_block_before_matches_reference(index):
+    for timestamp in range(990, 1801, 7):
+        assert index.block_before(timestamp) == reference(timestamp)
+    assert index.block_before(1700) == 51
+
+
+def test_head_timestamp_is_the_head(index):
+    head = len(TIMESTAMPS) - 1
+    assert index.block_before(TIMESTAMPS[head]) == head
+    # Known from the index now; still the head, still not past it
+    assert index.block_before(TIMESTAMPS[head]) == head
+    assert index.block_after(TIMESTAMPS[head]) == head
+    with pytest.raises(ValueError):
+        index.block_before(TIMESTAMPS[head] + 1)
@@ -0,0 +1,65 @@
+"""Offline endpoint addresses against IngestMaster's own CREATE2 clones"""
+
+import os
+
+from conftest import transact
+from eth_hash.auto import keccak
+
+from launchpad.ingest import (
+    EndpointIndex,
+    clone_init_code_hash,
+    create2_prefix,
+    predict_address,
+    predict_addresses,
+    verify,
+)
+
+DEPLOYER = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+IMPLEMENTATION = "0xe7f1725E7734CE288F8367e1Bb143E90bb3F0512"
+ETHEREUM = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+
+def test_batched_keccak_matches_eth_hash():
+    salts = [os.urandom(32) for _ in range(5000)] + [bytes(32), b"\xff" * 32]
+    prefix = create2_prefix(DEPLOYER)
+    init_hash = clone_init_code_hash(IMPLEMENTATION)
+    expected = [keccak(prefix + salt + init_hash)[12:] for salt in salts]
+
+    addresses = predict_addresses(
+        DEPLOYER, IMPLEMENTATION, salts, processes=2, chunk_size=2000
+    )
+    assert [bytes(a).ljust(20, b"\x00") for a in addresses] == expected
+
+
+def test_extend_skips_known_salts():
+    index = EndpointIndex.build(DEPLOYER, IMPLEMENTATION, range(10))
+    index = index.extend(DEPLOYER, IMPLEMENTATION, [*range(5, 15), 12, 0])
+    assert len(index) == 15
+    for salt in range(15):
+        assert index.address_for(salt) == predict_address(
+            DEPLOYER, IMPLEMENTATION, salt
+        )
+        assert (
+            index.salt_for(index.address_for(salt))
+            == "0x" + salt.to_bytes(32, "big").hex()
+        )
+
+
+def test_predictions_match_deployed_clones(web3, contracts, tmp_path):
+    master = contracts.ingest_master
+    collector = master.functions.collector().call()
+    salts = [os.urandom(32) for _ in range(5)] + [0, 2**256 - 1]
+
+    path = tmp_path / "endpoints.npz"
+    EndpointIndex.from_registry(contracts, salts, processes=1).save(path)
+    index = EndpointIndex.load(path)
+    assert verify(contracts, index) == []
+
+    for salt in salts:
+        address = index.address_for(salt)
+        assert web3.eth.get_code(address) == b""
+        # collect clones the endpoint with CREATE2 before collecting from it
+        if isinstance(salt, int):
+            salt = salt.to_bytes(32, "big")
+        transact(web3, master.functions.collect(salt, ETHEREUM, 0), collector)
+        assert web3.eth.get_code(address) != b""
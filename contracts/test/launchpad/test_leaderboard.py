@@ -0,0 +1,102 @@
+"""Leaderboard and RolloverView against a sorted reference"""
+
+import random
+
+import pytest
+
+from launchpad.leaderboard import Leaderboard, OrderIndex, RolloverView
+
+
+def address(i):
+    return "0x%040x" % i
+
+
+def reference(points):
+    """(address, points) highest first, ties by address, zeros left out"""
+    return sorted(
+        ((a, p) for a, p in points.items() if p), key=lambda item: (-item[1], item[0])
+    )
+
+
+def check(board, points):
+    ranked = reference(points)
+    assert len(board) == len(ranked)
+    assert list(board) == ranked
+    assert board.top(5) == ranked[:5]
+    for i, item in enumerate(ranked):
+        assert board.at(i + 1) == item
+
+    for a, p in points.items():
+        if not p:
+            assert board.rank(a) is None
+            assert board.percentile(a) is None
+            continue
+        above = sum(1 for _, q in ranked if q > p)
+        below = sum(1 for _, q in ranked if q < p)
+        assert board.rank(a) == above + 1
+        assert board.percentile(a) == 100 * below / len(ranked)
+
+
+def test_order_index():
+    index = OrderIndex()
+    keys = random.Random(1).sample(range(1000), 200)
+    for key in keys:
+        index.insert(key)
+    for key in keys[::3]:
+        index.remove(key)
+    expected = sorted(set(keys) - set(keys[::3]))
+    assert list(index) == expected
+    assert [index.select(i) for i in range(len(expected))] == expected
+    assert index.count_before(500) == sum(1 for k in expected if k < 500)
+    with pytest.raises(IndexError):
+        index.select(len(expected))
+
+
+def test_leaderboard_matches_reference():
+    rng = random.Random(7)
+    board = Leaderboard()
+    points = {}
+    for step in range(2000):
+        user = address(rng.randrange(150))
+        # Few distinct values, so ties are common; some drop back to zero
+        value = rng.choice([0, 0, 10, 20, 20, 30, rng.randrange(1, 10**6)])
+        assert board.update(user, value) == points.get(user, 0)
+        points[user] = value
+        if step % 250 == 0:
+            check(board, points)
+    check(board, points)
+
+    removed = next(a for a, p in points.items() if p)
+    assert board.remove(removed) == points.pop(removed)
+    assert removed not in board
+    check(board, points)
+
+
+def test_rollover_view_merges_both_boards():
+    recorded, rollover = Leaderboard(), Leaderboard()
+    for i, p in enumerate([50, 30, 30, 10]):
+        recorded.update(address(i), p)
+    for i, p in enumerate([40, 30, 5], start=10):
+        rollover.update(address(i), p)
+    view = RolloverView(recorded, rollover)
+
+    merged = sorted(list(recorded) + list(rollover), key=lambda item: -item[1])
+    assert len(view) == 7
+    assert [p for _, p in view.top(7)] == [p for _, p in merged]
+    assert view.top(2) == [(address(0), 50), (address(10), 40)]
+    # Three users share 30 points, behind 50 and 40
+    assert view.rank(address(11)) == view.rank(address(1)) == 3
+    assert view.rank(address(3)) == 6
+    assert view.percentile(address(0)) == 100 * 6 / 7
+    assert view.points(address(12)) == 5
+    assert view.rank(address(99)) is None
+
+    # A rolled-over user who stakes moves to the recorded board
+    view.apply({"event": "Stake", "args": {"userAddress": address(12), "points": 45}})
+    assert address(12) not in rollover and recorded.points[address(12)] == 45
+    assert view.rank(address(12)) == 2
+    assert len(view) == 7
+
+    view.apply({"event": "Unstake", "args": {"userAddress": address(10)}})
+    assert view.rank(address(10)) is None
+    assert len(view) == 6
@@ -0,0 +1,163 @@
+"""LiveStaking reorg handling, on goerli's deployments and an in-memory chain"""
+
+from eth_abi import encode
+from eth_utils import encode_hex, keccak, to_checksum_address
+from web3 import Web3
+from web3.providers import BaseProvider
+
+from launchpad.encoding import address_topic
+from launchpad.live import LiveStaking
+from launchpad.registry import ContractRegistry
+
+STAKE_TOPIC = encode_hex(keccak(text="Stake(address,uint256,uint256)"))
+OGN = 10**18
+ONE_DAY = 60 * 60 * 24
+
+U = to_checksum_address("0x" + "11" * 20)
+V = to_checksum_address("0x" + "22" * 20)
+W = to_checksum_address("0x" + "33" * 20)
+
+
+class FakeChain(BaseProvider):
+    """Blocks and logs held in memory, served over eth_getBlockByNumber/getLogs"""
+
+    def __init__(self, genesis_time):
+        super().__init__()
+        self.genesis_time = genesis_time
+        self.hashes = {0: "0x" + "00" * 32}
+        self.logs = []
+
+    @property
+    def head(self):
+        return max(self.hashes)
+
+    def block(self, number):
+        return {
+            "number": hex(number),
+            "hash": self.hashes[number],
+            "parentHash": self.hashes.get(number - 1, "0x" + "00" * 32),
+            "timestamp": hex(self.genesis_time + ONE_DAY * number),
+            "gasLimit": hex(30_000_000),
+        }
+
+    def make_request(self, method, params):
+        if method == "eth_chainId":
+            return {"result": "0x5"}
+        if method == "eth_getBlockByNumber":
+            number = self.head if params[0] == "latest" else int(params[0], 16)
+            return {"result": self.block(number)}
+        if method == "eth_getLogs":
+            params = params[0]
+            addresses = params["address"]
+            if isinstance(addresses, str):
+                addresses = [addresses]
+            start, end = int(params["fromBlock"], 16), int(params["toBlock"], 16)
+            return {
+                "result": [
+                    log
+                    for log in self.logs
+                    if log["address"] in addresses
+                    and start <= int(log["blockNumber"], 16) <= end
+                ]
+            }
+        raise NotImplementedError(method)
+
+    def mine(self, number, fork=0):
+        """(Re)mine block `number`, dropping any blocks and logs after it"""
+        for later in [n for n in self.hashes if n >= number]:
+            del self.hashes[later]
+        self.logs = [log for log in self.logs if int(log["blockNumber"], 16) < number]
+        self.hashes[number] = "0x" + f"{fork:02x}" * 16 + f"{number:032x}"
+        return self.block(number)
+
+
+def stake_log(chain, season, user, amount, points, block, index=0):
+    return {
+        "address": season,
+        "topics": [STAKE_TOPIC, address_topic(user), "0x%064x" % amount],
+        "data": encode_hex(encode(["uint256"], [points])),
+        "blockNumber": hex(block),
+        "blockHash": chain.hashes[block],
+        "logIndex": hex(index),
+        "transactionIndex": hex(index),
+        "transactionHash": encode_hex(keccak(text=f"{block}:{index}:{user}")),
+        "removed": False,
+    }
+
+
+def received(log, removed=False):
+    """A log as the subscription delivers it"""
+    numbers = ("blockNumber", "logIndex", "transactionIndex")
+    return dict(log, removed=removed, **{key: int(log[key], 16) for key in numbers})
+
+
+def received_head(block):
+    return dict(
+        block, number=int(block["number"], 16), timestamp=int(block["timestamp"], 16)
+    )
+
+
+class Blocks:
+    def __init__(self, chain):
+        self.chain = chain
+
+    def timestamp(self, block):
+        return int(self.chain.block(block)["timestamp"], 16)
+
+
+def live_staking(tmp_path, chain):
+    web3 = Web3(chain)
+    contracts = ContractRegistry(web3, "goerli", cache_dir=tmp_path)
+    live = LiveStaking(
+        contracts, uri="ws://fake", seasons=["season_two"], blocks=Blocks(chain)
+    )
+    # A fresh season with nothing staked, instead of seeding from an index
+    live.block = 0
+    live.stakes = {}
+    return live
+
+
+def stake(live, chain, user, amount, block, index=0):
+    season = live.by_name("season_two")
+    timestamp = int(chain.block(block)["timestamp"], 16)
+    points = int(season.model.points_in_time([amount * OGN], timestamp)[0])
+    log = stake_log(chain, season.address, user, amount * OGN, points, block, index)
+    chain.logs.append(log)
+    return log
+
+
+def test_reorged_logs_are_undone(tmp_path):
+    start = 1667347200  # season two's startTime on goerli
+    chain = FakeChain(start + ONE_DAY)
+    live = live_staking(tmp_path / "live", chain)
+
+    chain.mine(1)
+    stake(live, chain, U, 100, 1)
+    chain.mine(2)
+    orphaned = stake(live, chain, V, 50, 2)
+    assert live.backfill() == 2
+    before = live.summary()
+    assert before["series_total_supply"] == 150 * OGN
+    assert before["season_two"]["stakers"] == 2
+
+    # Block 2 is replaced: V's stake is dropped and W stakes instead
+    live.apply(received(orphaned, removed=True))
+    live.on_head(received_head(chain.mine(2, fork=1)))
+    live.apply(received(stake(live, chain, W, 70, 2)))
+    after = live.summary()
+
+    # The same chain replayed from scratch
+    expected = live_staking(tmp_path / "expected", chain)
+    expected.backfill()
+    assert after == expected.summary()
+    assert after["series_total_supply"] == 170 * OGN
+    assert dict(after["season_two"]["top"]).keys() == {U, W}
+
+    # Reorging out every block undoes the bootstrap as well
+    for log in chain.logs:
+        live.apply(received(log, removed=True))
+    emptied = live.summary()
+    assert emptied["series_total_supply"] == 0
+    assert emptied["season_two"]["stakers"] == 0
+    assert not emptied["season_two"]["bootstrapped"]
+    assert emptied["season_two"]["total_points"] == 0
@@ -0,0 +1,72 @@
+"""LogPager splitting and ordering against the node's own eth_getLogs"""
+
+import pytest
+from conftest import transact
+from requests.exceptions import ReadTimeout
+
+from launchpad.logs import LogPager, is_range_error
+from launchpad.vouchers import TRANSFER_TOPIC
+
+OGN = 10**18
+
+
+class LimitedPager(LogPager):
+    """Rejects ranges wider than `limit` blocks, like a hosted provider"""
+
+    def __init__(self, web3, limit, **kwargs):
+        super().__init__(web3, **kwargs)
+        self.limit = limit
+
+    def _fetch(self, params, start, end):
+        if end - start + 1 > self.limit:
+            raise ValueError(
+                {"code": -32005, "message": "query returned more than 10000 results"}
+            )
+        return super()._fetch(params, start, end)
+
+
+def test_range_errors():
+    assert is_range_error(ValueError({"code": -32005, "message": "Limit exceeded"}))
+    assert is_range_error(
+        ValueError({"code": -32000, "message": "block range is too wide"})
+    )
+    assert is_range_error(ValueError("Log response size exceeded."))
+    assert is_range_error(ReadTimeout("Read timed out."))
+    assert not is_range_error(
+        ValueError({"code": -32000, "message": "execution reverted: out of range"})
+    )
+    assert not is_range_error(ValueError("index out of range"))
+
+
+def test_split_ranges_keep_chain_order(web3, contracts):
+    ogn = contracts.ogn
+    sender, receiver = web3.eth.accounts[1:3]
+    start = web3.eth.block_number + 1
+    # Automining puts every transfer in its own block
+    for amount in range(1, 41):
+        transact(web3, ogn.functions.transfer(receiver, amount * OGN), sender)
+    end = web3.eth.block_number
+
+    params = {"address": ogn.address, "topics": [TRANSFER_TOPIC]}
+    expected = web3.eth.get_logs(dict(params, fromBlock=start, toBlock=end))
+    assert len(expected) == 40
+
+    pager = LimitedPager(web3, limit=3, initial_range=16, max_workers=4)
+    logs = pager.get_logs(params, start, end)
+    assert pager.splits > 0
+    assert [(log["blockNumber"], log["logIndex"]) for log in logs] == [
+        (log["blockNumber"], log["logIndex"]) for log in expected
+    ]
+
+
+def test_unrelated_errors_are_raised(web3, contracts):
+    class Failing(LogPager):
+        def _fetch(self, params, start, end):
+            raise ValueError({"code": -32000, "message": "index out of range"})
+
+    pager = Failing(web3, initial_range=8)
+    head = web3.eth.block_number
+    params = {"address": contracts.ogn.address}
+    with pytest.raises(ValueError):
+        pager.get_logs(params, max(0, head - 7), head)
+    assert pager.splits == 0
@@ -0,0 +1,13 @@
+"""Deploy blocks found from contract code, as used for seasons without a record"""
+
+from launchpad.metrics import first_code_block
+
+
+def test_first_code_block_matches_deployments(web3, contracts):
+    for name in ("series", "vault", "season_one", "season_two"):
+        block = contracts.deploy_block(name)
+        assert first_code_block(web3, contracts.address(name)) == block
+
+
+def test_first_code_block_without_code(web3):
+    assert first_code_block(web3, "0x" + "12" * 20) is None
@@ -0,0 +1,111 @@
+"""Payout planning from fixed balances, against PaymentSplitter's arithmetic"""
+
+from web3 import Web3
+
+from launchpad.gas import BASE_GAS, ETH_TRANSFER_GAS
+from launchpad.multicall import MULTICALL3
+from launchpad.payouts import Pending, payout_items, pending_payments, release_gas
+from launchpad.sweep import ETH_ADDRESS
+
+COLLECTION = Web3.to_checksum_address("0x" + "c0" * 20)
+OTHER = Web3.to_checksum_address("0x" + "c1" * 20)
+A = Web3.to_checksum_address("0x" + "11" * 20)
+B = Web3.to_checksum_address("0x" + "22" * 20)
+C = Web3.to_checksum_address("0x" + "33" * 20)
+
+
+class Contracts:
+    web3 = Web3()
+
+
+class FixedMulticall:
+    """Answers a pending_payments read from fixed values, in call order"""
+
+    address = MULTICALL3
+
+    def __init__(self, results):
+        self.results = results
+
+    def resolve_block(self, block):
+        return 1
+
+    def __call__(self, calls, block):
+        assert len(calls) == len(self.results)
+        return self.results
+
+
+def pending_payment(total_received, shares, total_shares, released):
+    """PaymentSplitterUpgradeable._pendingPayment"""
+    return (total_received * shares) // total_shares - released
+
+
+def test_pending_payments_match_pending_payment():
+    payees = [(A, 1), (B, 2), (C, 4)]
+    balance, total_released, released = 1001, 299, [13, 70, 0]
+    multicall = FixedMulticall([balance, total_released] + released)
+
+    pending = pending_payments(
+        Contracts, {COLLECTION: payees}, multicall=multicall, block=1
+    )
+    assert [(p.payee, p.shares, p.released) for p in pending] == [
+        (payee, shares, already) for (payee, shares), already in zip(payees, released)
+    ]
+    assert [p.amount for p in pending] == [
+        pending_payment(balance + total_released, shares, 7, already)
+        for (_, shares), already in zip(payees, released)
+    ]
+    # Rounding leaves dust in the splitter, as on chain
+    assert sum(p.amount for p in pending) + sum(released) < balance + total_released
+
+
+def test_failed_reads_are_skipped():
+    multicall = FixedMulticall([None, 0, 5])
+    assert (
+        pending_payments(Contracts, {COLLECTION: [(A, 1)]}, multicall=multicall) == []
+    )
+
+
+def pending(collection, payee, amount, shares=1):
+    return Pending(collection, ETH_ADDRESS, payee, shares, 0, amount)
+
+
+def test_dust_threshold():
+    gas_price = 10
+    cost = release_gas(ETH_ADDRESS, 1, False) * gas_price
+    at_cost = pending(COLLECTION, A, cost)
+    above = pending(OTHER, A, cost + 1)
+
+    payouts, dust, unpriced = payout_items([at_cost, above], gas_price)
+    assert dust == [at_cost]
+    assert [p.collection for p in payouts] == [OTHER]
+    assert unpriced == []
+
+    # A higher multiple needs more value for the same gas
+    payouts, dust, _ = payout_items([above], gas_price, gas_multiple=2)
+    assert payouts == [] and dust == [above]
+
+
+def test_unpriced_tokens():
+    token = Pending(COLLECTION, "0x" + "70" * 20, A, 1, 0, 10**18)
+    payouts, dust, unpriced = payout_items([token], 1)
+    assert (payouts, dust, unpriced) == ([], [], [token])
+
+
+def test_release_all_only_when_every_payee_is_due():
+    everyone = [pending(COLLECTION, A, 10**18), pending(COLLECTION, B, 10**18)]
+    payouts, _, _ = payout_items(everyone, 1, release_all=[COLLECTION])
+    (payout,) = payouts
+    assert payout.release_all
+    assert payout.gas == BASE_GAS + 2 * ETH_TRANSFER_GAS
+
+    # Nothing due for B: releaseAll would revert on it, so release A alone
+    partial = [pending(COLLECTION, A, 10**18), pending(COLLECTION, B, 0)]
+    (payout,) = payout_items(partial, 1, release_all=[COLLECTION])[0]
+    assert not payout.release_all
+    assert payout.payees == [A]
+    assert payout.gas == BASE_GAS + ETH_TRANSFER_GAS
+
+    # Collections without releaseAll release every payee separately
+    (payout,) = payout_items(everyone, 1)[0]
+    assert not payout.release_all
+    assert payout.gas == 2 * (BASE_GAS + ETH_TRANSFER_GAS)
@@ -0,0 +1,76 @@
+"""SeasonModel against the contracts' own getPoints and getTotalPoints"""
+
+from conftest import mine_at, transact
+
+from launchpad.points import SeasonModel, season_state, verify
+
+ONE_DAY = 60 * 60 * 24
+OGN = 10**18
+
+
+def check(contracts, name, users):
+    web3 = contracts.web3
+    block = web3.eth.block_number
+    assert verify(contracts, name, users, block) == []
+
+    season = contracts.contract(name)
+    supply = contracts.series.functions.totalSupply().call(block_identifier=block)
+    timestamp = web3.eth.get_block(block)["timestamp"]
+    model = SeasonModel.from_contract(season)
+    assert model.total_points(
+        season_state(season, block), supply, timestamp
+    ) == season.functions.getTotalPoints().call(block_identifier=block)
+
+
+def test_points_across_season_boundaries(web3, contracts):
+    series = contracts.series
+    ogn = contracts.ogn
+    governor = web3.eth.accounts[0]
+    # Named accounts are minted OGN by the staking deploy
+    a, b, c = web3.eth.accounts[1:4]
+    for user in (a, b, c):
+        transact(web3, ogn.functions.approve(series.address, 10**6 * OGN), user)
+
+    one = SeasonModel.from_contract(contracts.season_one)
+    two = SeasonModel.from_contract(contracts.season_two)
+    for name in ("season_two", "season_three"):
+        transact(web3, series.functions.pushSeason(contracts.address(name)), governor)
+
+    def stake(user, amount):
+        transact(web3, series.functions.stake(amount * OGN), user)
+
+    def check_all():
+        for name in ("season_two", "season_three"):
+            check(contracts, name, [a, b, c])
+
+    # Before season one: later seasons only roll the stake over
+    stake(a, 1000)
+    check_all()
+
+    # Season one locked: staking bootstraps season two, pre-stakes land in both
+    mine_at(web3, one.lock_start_time + ONE_DAY)
+    stake(b, 500)
+    stake(a, 100)
+    check_all()
+
+    # Inside season two, stakes earn fewer days
+    mine_at(web3, two.start_time + 10 * ONE_DAY)
+    stake(c, 2000)
+    check_all()
+
+    # Season two locked: season three is bootstrapped
+    mine_at(web3, two.lock_start_time + ONE_DAY)
+    stake(c, 50)
+    check_all()
+
+    # Season two's claim period, before and after a claim takes the snapshot
+    mine_at(web3, two.end_time + ONE_DAY)
+    web3.eth.wait_for_transaction_receipt(
+        web3.eth.send_transaction(
+            {"from": governor, "to": contracts.vault.address, "value": 10 * OGN}
+        )
+    )
+    transact(web3, ogn.functions.mint(contracts.vault.address, 5000 * OGN), governor)
+    check_all()
+    transact(web3, series.functions.unstake(), b)
+    check_all()
@@ -0,0 +1,78 @@
+"""bulk_positions through Multicall3's aggregate3 against direct calls"""
+
+import pytest
+from conftest import transact
+from web3.exceptions import ContractLogicError
+
+from launchpad.multicall import Multicall, call
+from launchpad.positions import bulk_positions
+
+OGN = 10**18
+
+
+def direct(fn, block):
+    try:
+        return fn.call(block_identifier=block)
+    except ContractLogicError:
+        return None
+
+
+def stake_some(web3, contracts):
+    series = contracts.series
+    users = web3.eth.accounts[1:4]
+    for amount, user in zip((1000, 250, 40), users):
+        transact(
+            web3, contracts.ogn.functions.approve(series.address, amount * OGN), user
+        )
+        transact(web3, series.functions.stake(amount * OGN), user)
+    # One address that never staked
+    return list(users) + [web3.eth.accounts[5]]
+
+
+def test_bulk_positions_match_direct_calls(web3, contracts, multicall3):
+    users = stake_some(web3, contracts)
+    block = web3.eth.block_number
+    multicall = Multicall(web3)
+    assert multicall.deployed
+
+    columns = bulk_positions(contracts, users, block, multicall=multicall)
+
+    series = contracts.series.functions
+    assert columns["balance"] == [
+        series.balanceOf(u).call(block_identifier=block) for u in users
+    ]
+    assert columns["latest_stake_time"] == [
+        series.latestStakeTime(u).call(block_identifier=block) for u in users
+    ]
+    for name in contracts.seasons():
+        season = contracts.contract(name).functions
+        for i, user in enumerate(users):
+            assert columns[f"{name}_points"][i] == direct(season.getPoints(user), block)
+            rewards = direct(season.expectedRewards(user), block) or (None, None)
+            assert (columns[f"{name}_eth"][i], columns[f"{name}_ogn"][i]) == tuple(
+                rewards
+            )
+
+
+def test_aggregate3_matches_the_fallback(web3, contracts, multicall3):
+    users = stake_some(web3, contracts)
+    block = web3.eth.block_number
+    series = contracts.series
+    calls = [call(series, "balanceOf", u) for u in users]
+    # A revert comes back as None either way
+    calls.append(call(contracts.season_one, "claim", users[0]))
+
+    aggregated = Multicall(web3)
+    direct = Multicall(web3)
+    direct._deployed = False
+    assert aggregated(calls, block) == direct(calls, block)
+    assert aggregated(calls, block)[-1] is None
+
+
+def test_fallback_raises_rpc_errors(web3, contracts):
+    direct = Multicall(web3)
+    direct._deployed = False
+    balance = call(contracts.series, "balanceOf", web3.eth.accounts[1])
+    with pytest.raises(ValueError):
+        # Hardhat rejects blocks past its head
+        direct([balance], web3.eth.block_number + 1000)
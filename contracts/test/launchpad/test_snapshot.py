@@ -0,0 +1,42 @@
+"""Parquet snapshot sinks keep exact amounts or refuse them"""
+
+from decimal import Decimal
+
+import pytest
+
+from launchpad.snapshot import MAX_AMOUNT, ParquetSink, snapshot_columns
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def row(points):
+    return {
+        "address": ["0x" + "11" * 20],
+        "staked_ogn": [10**27],
+        "latest_stake_time": [1667347200],
+        "season_one_points": [points],
+        "season_one_eth": [None],
+        "season_one_ogn": [0],
+    }
+
+
+def test_parquet_amounts_round_trip(tmp_path):
+    path = tmp_path / "snapshot.parquet"
+    sink = ParquetSink(path, snapshot_columns(["season_one"]))
+    sink.write(row(MAX_AMOUNT))
+    sink.close()
+
+    (record,) = pq.read_table(path).to_pylist()
+    assert record["season_one_points"] == Decimal(MAX_AMOUNT)
+    assert record["staked_ogn"] == Decimal(10**27)
+    assert record["season_one_eth"] is None
+
+
+def test_parquet_rejects_points_past_the_decimal(tmp_path):
+    sink = ParquetSink(tmp_path / "snapshot.parquet", snapshot_columns(["season_one"]))
+    try:
+        with pytest.raises(OverflowError, match="season_one_points"):
+            # The largest uint128
+            sink.write(row(2**128 - 1))
+    finally:
+        sink.close()
@@ -0,0 +1,92 @@
+"""TransactionPipeline nonce order, stats and fee replacement on the local node"""
+
+import pytest
+from eth_account import Account
+
+from launchpad.submit import TransactionPipeline
+
+COUNT = 12
+IN_FLIGHT = 4
+
+
+def send_eth(to, value=1):
+    return {"to": to, "value": value, "gas": 21000}
+
+
+@pytest.fixture(params=["unlocked", "local"])
+def sender(request, web3):
+    if request.param == "unlocked":
+        return web3.eth.accounts[1]
+    account = Account.create()
+    web3.provider.make_request("hardhat_setBalance", [account.address, hex(10**18)])
+    return account
+
+
+@pytest.fixture
+def automine_off(web3):
+    web3.provider.make_request("evm_setAutomine", [False])
+    yield
+    web3.provider.make_request("evm_setAutomine", [True])
+
+
+def test_pipeline_keeps_nonce_order(web3, sender):
+    to = web3.eth.accounts[2]
+    with TransactionPipeline(
+        web3, sender, max_in_flight=IN_FLIGHT, poll_interval=0.01
+    ) as p:
+        start = p.nonce
+        for _ in range(COUNT):
+            p.submit(send_eth(to))
+        assert len(p.in_flight) > 1
+    receipts = p.receipts
+
+    assert len(receipts) == COUNT
+    assert all(r is not None and r["status"] == 1 for r in receipts)
+    nonces = [web3.eth.get_transaction(r["transactionHash"])["nonce"] for r in receipts]
+    assert nonces == list(range(start, start + COUNT))
+    blocks = [r["blockNumber"] for r in receipts]
+    assert blocks == sorted(blocks)
+
+    stats = p.stats()
+    assert stats["submitted"] == stats["confirmed"] == COUNT
+    assert stats["failed"] == stats["in_flight"] == stats["replaced"] == 0
+    assert stats["elapsed"] > 0 and stats["tx_per_second"] > 0
+    assert 0 <= stats["latency_p50"] <= stats["latency_p95"] <= stats["latency_max"]
+
+
+def test_replace_with_clamped_tip(web3, automine_off):
+    # The node's tip is far above the cap, so the tip is clamped to the cap
+    web3.provider.make_request("hardhat_setNextBlockBaseFeePerGas", [hex(1000)])
+    cap = 10000
+    assert web3.eth.max_priority_fee > cap
+
+    sender = web3.eth.accounts[1]
+    p = TransactionPipeline(
+        web3, sender, max_fee=cap, poll_interval=0.01, replace_after=3600
+    )
+    try:
+        p.submit(send_eth(web3.eth.accounts[2]))
+        (entry,) = p.in_flight.values()
+        assert entry.tx["maxFeePerGas"] == entry.tx["maxPriorityFeePerGas"] == cap
+
+        # No room under the cap to outbid the pending version
+        assert not p.replace(entry)
+        assert p.replaced == 0
+
+        p.max_fee = 2 * cap
+        assert p.replace(entry)
+        assert p.replaced == 1
+        assert len(entry.hashes) == 2
+        assert entry.tx["maxPriorityFeePerGas"] <= entry.tx["maxFeePerGas"]
+        assert entry.tx["maxFeePerGas"] == 2 * cap
+
+        web3.provider.make_request("evm_mine", [])
+        (receipt,) = p.wait(timeout=10)
+    finally:
+        p.close()
+
+    assert receipt["status"] == 1
+    assert receipt["transactionHash"] == entry.hashes[-1]
+    mined = web3.eth.get_transaction(receipt["transactionHash"])
+    assert mined["maxFeePerGas"] == 2 * cap
+    assert p.stats()["replaced"] == 1
@@ -0,0 +1,31 @@
+"""Voucher mint limits across a batch"""
+
+from launchpad.vouchers import Voucher, check_limits
+
+SENDER = "0x" + "aa" * 20
+A = "0x" + "11" * 20
+B = "0x" + "22" * 20
+
+
+def voucher(to, count, mint_limit=5):
+    return Voucher(SENDER, to, count, 0, mint_limit, 2**32)
+
+
+def test_check_limits_adds_up_vouchers_for_one_address():
+    vouchers = [
+        voucher(A, 2),
+        voucher(B, 5),
+        voucher(A, 2),
+        voucher(A, 2),  # 2 minted + 2 + 2 + 2 would pass the limit of 5
+        voucher(A.upper().replace("0X", "0x"), 1),
+        voucher(B, 1),
+    ]
+    ok, rejected = check_limits(vouchers, {A: 0, B: 0})
+    assert ok == [vouchers[0], vouchers[1], vouchers[2], vouchers[4]]
+    assert rejected == [vouchers[3], vouchers[5]]
+
+
+def test_check_limits_counts_minted_tokens():
+    ok, rejected = check_limits([voucher(A, 2), voucher(A, 1)], {A: 3})
+    assert ok == [voucher(A, 2)]
+    assert rejected == [voucher(A, 1)]